@@ -0,0 +1,23 @@
+if __name__ == "__main__":
+	import argparse
+	import os
+	import sys
+
+	sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Python", "NeonOcean.S4.Debug"))
+
+	from NeonOcean.S4.Debug import BinaryLog
+
+	argumentParser = argparse.ArgumentParser(description = "Convert a binary log file written by NeonOcean.S4.Debug to a readable log file.")
+	argumentParser.add_argument("binaryLogFilePath", help = "The path of the binary log file, normally named 'Log.bin'.")
+	argumentParser.add_argument("outputFilePath", nargs = "?", default = None, help = "The path of the converted log file. This defaults to the binary log's path with an 'xml' or 'txt' extension.")
+	argumentParser.add_argument("--format", dest = "outputFormat", choices = ("xml", "text"), default = "xml", help = "The layout of the converted log file.")
+
+	arguments = argumentParser.parse_args()
+
+	outputFilePath = arguments.outputFilePath
+
+	if outputFilePath is None:
+		outputFilePath = os.path.splitext(arguments.binaryLogFilePath)[0] + (".xml" if arguments.outputFormat == "xml" else ".txt")
+
+	convertedCount = BinaryLog.ConvertFile(arguments.binaryLogFilePath, outputFilePath, outputFormat = arguments.outputFormat)
+	print("Converted " + str(convertedCount) + " reports to '" + outputFilePath + "'.")
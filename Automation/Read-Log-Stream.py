@@ -0,0 +1,38 @@
+if __name__ == "__main__":
+	import argparse
+	import os
+	import socket
+	import sys
+
+	sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Python", "NeonOcean.S4.Debug"))
+
+	from NeonOcean.S4.Debug import BinaryLog
+
+	argumentParser = argparse.ArgumentParser(description = "Print reports streamed live by NeonOcean.S4.Debug while the game is running. Log streaming must be enabled in the mod's settings.")
+	argumentParser.add_argument("port", nargs = "?", type = int, default = 47310, help = "The port set in the mod's log stream port setting.")
+	argumentParser.add_argument("--host", dest = "host", default = "127.0.0.1", help = "The address the game is streaming on.")
+	argumentParser.add_argument("--format", dest = "outputFormat", choices = ("xml", "text"), default = "text", help = "The layout the reports are printed in.")
+
+	arguments = argumentParser.parse_args()
+
+	renderer = BinaryLog.RenderXMLReport if arguments.outputFormat == "xml" else BinaryLog.RenderTextReport
+
+	decoder = BinaryLog.BinaryLogDecoder()
+
+	with socket.create_connection((arguments.host, arguments.port)) as streamConnection:
+		print("Connected to the log stream at " + arguments.host + ":" + str(arguments.port) + ".", file = sys.stderr)
+
+		try:
+			while True:
+				receivedBytes = streamConnection.recv(65536)
+
+				if len(receivedBytes) == 0:
+					break
+
+				for entry in decoder.Feed(receivedBytes):
+					if isinstance(entry, BinaryLog.BinaryReport):
+						print(renderer(entry) + os.linesep, flush = True)
+		except KeyboardInterrupt:
+			pass
+
+	print("The log stream was closed.", file = sys.stderr)
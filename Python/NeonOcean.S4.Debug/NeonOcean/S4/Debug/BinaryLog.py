@@ -0,0 +1,535 @@
+"""
+Reading and writing of this mod's compact binary log format.
+
+A binary log file starts with a signature and a format version, followed by length prefixed records. Group, owner and level names are written
+once per file as string records and are referenced by number afterwards. Report numbers are written as varints and report times as the
+difference from the previous report's time in microseconds. Messages made from a template and simple arguments are written as a reference to the
+template, which is also a string record, followed by the arguments, and are only formatted when read. Version 2 added these templated messages.
+
+Crash journals use the same format, with additional checkpoint records marking the report number up to which every report has been written to the
+real log files. Readers that do not know about checkpoint records skip them. Live log streams are sent in the same format as well, with each viewer
+receiving its own header and string records.
+
+This module only depends on the standard library, so that binary logs can also be converted outside of the game.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import struct
+import typing
+from xml.sax import saxutils
+
+FileSignature = b"NOBL"  # type: bytes
+FormatVersion = 2  # type: int
+
+_startRecordType = 0  # type: int
+_stringRecordType = 1  # type: int
+_reportRecordType = 2  # type: int
+_checkpointRecordType = 3  # type: int
+
+_logStackFlag = 1  # type: int
+_exceptionFlag = 2  # type: int
+_stacktraceFlag = 4  # type: int
+_templateFlag = 8  # type: int
+
+_noneArgumentType = 0  # type: int
+_falseArgumentType = 1  # type: int
+_trueArgumentType = 2  # type: int
+_integerArgumentType = 3  # type: int
+_floatArgumentType = 4  # type: int
+_stringArgumentType = 5  # type: int
+
+TemplateArgumentTypes = (type(None), bool, int, float, str)  # type: typing.Tuple[type, ...]
+
+class BinaryReport:
+	def __init__ (self, number: int, time: float, level: int, levelName: str, group: typing.Optional[str], owner: typing.Optional[str],
+				  message: str, logStack: bool, exception: typing.Optional[str], stacktrace: typing.Optional[str],
+				  template: typing.Optional[str] = None, templateArgs: typing.Optional[tuple] = None):
+		self.Number = number  # type: int
+		self.Time = time  # type: float
+		self.Level = level  # type: int
+		self.LevelName = levelName  # type: str
+		self.Group = group  # type: typing.Optional[str]
+		self.Owner = owner  # type: typing.Optional[str]
+		self.Message = message  # type: str
+		self.LogStack = logStack  # type: bool
+		self.Exception = exception  # type: typing.Optional[str]
+		self.Stacktrace = stacktrace  # type: typing.Optional[str]
+
+		self.Template = template  # type: typing.Optional[str]  # The template the message was formatted from, if it was written as a template.
+		self.TemplateArgs = templateArgs  # type: typing.Optional[tuple]
+
+class BinaryLogEncoder:
+	"""
+	Encodes reports for a single binary log file. An encoder keeps track of the strings and the report time already written to its file, so the same
+	encoder must be used for every write to that file.
+	"""
+
+	def __init__ (self):
+		self._strings = dict()  # type: typing.Dict[str, int]
+		self._lastTime = 0  # type: int
+		self._started = False  # type: bool
+
+	@staticmethod
+	def GetFileHeader () -> bytes:
+		"""
+		Get the bytes that must be written at the very start of a new binary log file.
+		"""
+
+		return FileSignature + bytes((FormatVersion,))
+
+	def EncodeReport (self, number: int, time: float, level: int, levelName: str, group: typing.Optional[str], owner: typing.Optional[str],
+					  message: str, logStack: bool, exception: typing.Optional[str], stacktrace: typing.Optional[str],
+					  templateArgs: typing.Optional[tuple] = None) -> bytes:
+		"""
+		Encode a report, along with any string or start records that need to come before it.
+		:param time: The time the report was logged, as a POSIX timestamp.
+		:type time: float
+		:param templateArgs: If not None, the message is a template to be formatted with these arguments when read. Every argument must be one of the
+		template argument types.
+		:type templateArgs: tuple | None
+
+		If the report cannot be encoded, the encoder is left as it was before the call, so that the records it encodes afterwards do not refer to
+		strings that were never written.
+		"""
+
+		stringCount = len(self._strings)  # type: int
+		lastTime = self._lastTime  # type: int
+		started = self._started  # type: bool
+
+		try:
+			return self._EncodeReport(number, time, level, levelName, group, owner, message, logStack, exception, stacktrace, templateArgs)
+		except Exception:
+			for addedString in list(self._strings)[stringCount:]:  # type: str
+				del self._strings[addedString]
+
+			self._lastTime = lastTime
+			self._started = started
+			raise
+
+	@staticmethod
+	def EncodeCheckpoint (number: int) -> bytes:
+		"""
+		Encode a checkpoint record, marking that every report up to and including this report number has been written.
+		"""
+
+		encodedBytes = bytearray()  # type: bytearray
+
+		payload = bytearray((_checkpointRecordType,))  # type: bytearray
+		_WriteVarint(payload, number)
+
+		_WriteRecord(encodedBytes, payload)
+		return bytes(encodedBytes)
+
+	def _EncodeReport (self, number: int, time: float, level: int, levelName: str, group: typing.Optional[str], owner: typing.Optional[str],
+					   message: str, logStack: bool, exception: typing.Optional[str], stacktrace: typing.Optional[str],
+					   templateArgs: typing.Optional[tuple]) -> bytes:
+		encodedBytes = bytearray()  # type: bytearray
+
+		if not self._started:
+			_WriteRecord(encodedBytes, bytes((_startRecordType,)))
+			self._started = True
+
+		levelNameIdentifier = self._GetStringIdentifier(encodedBytes, levelName)  # type: int
+		groupIdentifier = self._GetStringIdentifier(encodedBytes, group)  # type: int
+		ownerIdentifier = self._GetStringIdentifier(encodedBytes, owner)  # type: int
+		templateIdentifier = self._GetStringIdentifier(encodedBytes, message) if templateArgs is not None else 0  # type: int
+
+		reportTime = int(time * 1000000)  # type: int
+		timeDelta = reportTime - self._lastTime  # type: int
+		self._lastTime = reportTime
+
+		flags = 0  # type: int
+
+		if logStack:
+			flags |= _logStackFlag
+
+		if exception is not None:
+			flags |= _exceptionFlag
+
+		if stacktrace is not None:
+			flags |= _stacktraceFlag
+
+		if templateArgs is not None:
+			flags |= _templateFlag
+
+		payload = bytearray((_reportRecordType,))  # type: bytearray
+		_WriteVarint(payload, number)
+		_WriteVarint(payload, _ZigZagEncode(timeDelta))
+		_WriteVarint(payload, level)
+		_WriteVarint(payload, levelNameIdentifier)
+		_WriteVarint(payload, groupIdentifier)
+		_WriteVarint(payload, ownerIdentifier)
+		_WriteVarint(payload, flags)
+
+		if templateArgs is not None:
+			_WriteVarint(payload, templateIdentifier)
+			_WriteVarint(payload, len(templateArgs))
+
+			for templateArg in templateArgs:  # type: typing.Any
+				_WriteTemplateArgument(payload, templateArg)
+		else:
+			_WriteString(payload, message)
+
+		if exception is not None:
+			_WriteString(payload, exception)
+
+		if stacktrace is not None:
+			_WriteString(payload, stacktrace)
+
+		_WriteRecord(encodedBytes, payload)
+		return bytes(encodedBytes)
+
+	def _GetStringIdentifier (self, encodedBytes: bytearray, value: typing.Optional[str]) -> int:
+		if value is None:
+			return 0
+
+		identifier = self._strings.get(value, None)  # type: typing.Optional[int]
+
+		if identifier is None:
+			identifier = len(self._strings) + 1
+			self._strings[value] = identifier
+
+			payload = bytearray((_stringRecordType,))  # type: bytearray
+			_WriteVarint(payload, identifier)
+			_WriteString(payload, value)
+			_WriteRecord(encodedBytes, payload)
+
+		return identifier
+
+def ReadReports (binaryLogFile: typing.BinaryIO) -> typing.Iterator[BinaryReport]:
+	"""
+	Read every report from a binary log file. A partially written record at the end of the file, such as one cut short by a crash, is ignored.
+	"""
+
+	for entry in _ReadEntries(binaryLogFile):  # type: typing.Union[BinaryReport, int]
+		if isinstance(entry, BinaryReport):
+			yield entry
+
+def ReadUnwrittenReports (journalFile: typing.BinaryIO) -> typing.List[BinaryReport]:
+	"""
+	Read the reports from a crash journal that come after its last checkpoint, these are the reports that never made it to the real log files.
+	"""
+
+	reports = list()  # type: typing.List[BinaryReport]
+	checkpointNumber = 0  # type: int
+
+	for entry in _ReadEntries(journalFile):  # type: typing.Union[BinaryReport, int]
+		if isinstance(entry, BinaryReport):
+			reports.append(entry)
+		else:
+			checkpointNumber = max(checkpointNumber, entry)
+
+	return [report for report in reports if report.Number > checkpointNumber]
+
+class BinaryLogDecoder:
+	"""
+	Decodes a binary log that arrives in pieces, such as from a live log stream. Bytes can be fed to the decoder in chunks of any size, records cut in
+	two between chunks are held back until the rest of the record arrives.
+	"""
+
+	def __init__ (self):
+		self._buffer = bytearray()  # type: bytearray
+		self._headerRead = False  # type: bool
+		self._ended = False  # type: bool
+
+		self._strings = { 0: None }  # type: typing.Dict[int, typing.Optional[str]]
+		self._lastTime = 0  # type: int
+
+	@property
+	def HeaderRead (self) -> bool:
+		return self._headerRead
+
+	def Feed (self, data: bytes) -> typing.List[typing.Union[BinaryReport, int]]:
+		"""
+		Decode as many complete records as possible, including those completed by this data.
+		:return: The reports decoded, along with any checkpoints, given as the report number they mark.
+		:rtype: typing.List[BinaryReport | int]
+		"""
+
+		entries = list()  # type: typing.List[typing.Union[BinaryReport, int]]
+
+		if self._ended:
+			return entries
+
+		self._buffer += data
+
+		if not self._headerRead:
+			headerLength = len(FileSignature) + 1  # type: int
+
+			if self._buffer[:len(FileSignature)] != FileSignature[:len(self._buffer)]:
+				raise ValueError("The data is not a binary log.")
+
+			if len(self._buffer) < headerLength:
+				return entries
+
+			fileVersion = self._buffer[len(FileSignature)]  # type: int
+
+			if fileVersion > FormatVersion:
+				raise ValueError("The binary log format version '" + str(fileVersion) + "' is not supported.")
+
+			self._headerRead = True
+			del self._buffer[:headerLength]
+
+		bufferBytes = bytes(self._buffer)  # type: bytes
+		position = 0  # type: int
+
+		while position < len(bufferBytes):
+			try:
+				recordLength, recordPosition = _ReadVarint(bufferBytes, position)
+			except IndexError:
+				break
+
+			if recordLength == 0:
+				# Nothing valid ever follows a zero length record, this is what is left behind when a file was cut short.
+				self._ended = True
+				break
+
+			recordEnd = recordPosition + recordLength  # type: int
+
+			if recordEnd > len(bufferBytes):
+				break
+
+			entry = self._DecodeRecord(bufferBytes, recordPosition)  # type: typing.Union[BinaryReport, int, None]
+
+			if entry is not None:
+				entries.append(entry)
+
+			position = recordEnd
+
+		del self._buffer[:position]
+		return entries
+
+	def _DecodeRecord (self, source: bytes, position: int) -> typing.Union[BinaryReport, int, None]:
+		recordType = source[position]  # type: int
+		position += 1
+
+		if recordType == _startRecordType:
+			self._strings = { 0: None }
+			self._lastTime = 0
+		elif recordType == _stringRecordType:
+			identifier, position = _ReadVarint(source, position)
+			self._strings[identifier], position = _ReadString(source, position)
+		elif recordType == _reportRecordType:
+			number, position = _ReadVarint(source, position)
+			timeDelta, position = _ReadVarint(source, position)
+			level, position = _ReadVarint(source, position)
+			levelNameIdentifier, position = _ReadVarint(source, position)
+			groupIdentifier, position = _ReadVarint(source, position)
+			ownerIdentifier, position = _ReadVarint(source, position)
+			flags, position = _ReadVarint(source, position)
+
+			template = None  # type: typing.Optional[str]
+			templateArgs = None  # type: typing.Optional[tuple]
+
+			if flags & _templateFlag:
+				templateIdentifier, position = _ReadVarint(source, position)
+				templateArgCount, position = _ReadVarint(source, position)
+
+				templateArgList = list()  # type: typing.List[typing.Any]
+
+				for _ in range(templateArgCount):
+					templateArg, position = _ReadTemplateArgument(source, position)
+					templateArgList.append(templateArg)
+
+				template = str(self._strings.get(templateIdentifier, ""))
+				templateArgs = tuple(templateArgList)
+				message = FormatTemplate(template, templateArgs)  # type: str
+			else:
+				message, position = _ReadString(source, position)
+
+			exception = None  # type: typing.Optional[str]
+			stacktrace = None  # type: typing.Optional[str]
+
+			if flags & _exceptionFlag:
+				exception, position = _ReadString(source, position)
+
+			if flags & _stacktraceFlag:
+				stacktrace, position = _ReadString(source, position)
+
+			self._lastTime += _ZigZagDecode(timeDelta)
+
+			return BinaryReport(number, self._lastTime / 1000000, level, self._strings.get(levelNameIdentifier, str(level)),
+								self._strings.get(groupIdentifier, None), self._strings.get(ownerIdentifier, None),
+								message, bool(flags & _logStackFlag), exception, stacktrace,
+								template = template, templateArgs = templateArgs)
+		elif recordType == _checkpointRecordType:
+			checkpointNumber, position = _ReadVarint(source, position)
+			return checkpointNumber
+
+		return None
+
+def _ReadEntries (binaryLogFile: typing.BinaryIO) -> typing.Iterator[typing.Union[BinaryReport, int]]:
+	"""
+	Read every report and checkpoint from a binary log file. Checkpoints are given as the report number they mark.
+	"""
+
+	decoder = BinaryLogDecoder()  # type: BinaryLogDecoder
+	entries = decoder.Feed(binaryLogFile.read())  # type: typing.List[typing.Union[BinaryReport, int]]
+
+	if not decoder.HeaderRead:
+		raise ValueError("The file is not a binary log file.")
+
+	yield from entries
+
+def FormatTemplate (template: str, templateArgs: tuple) -> str:
+	"""
+	Format a message template with its arguments through 'str.format'. A template that cannot be formatted is kept along with its arguments and
+	the error, rather than raising.
+	"""
+
+	try:
+		return template.format(*templateArgs)
+	except Exception as e:
+		return "Failed to format a log message.\nTemplate: " + template + "\nArguments: " + repr(templateArgs) + "\n" + type(e).__name__ + ": " + str(e)
+
+def ConvertFile (binaryLogFilePath: str, outputFilePath: str, outputFormat: str = "xml") -> int:
+	"""
+	Convert a binary log file to a readable log file.
+	:param binaryLogFilePath: The path of the binary log file to be converted.
+	:type binaryLogFilePath: str
+	:param outputFilePath: The path the converted log should be written to. Any existing file at this path will be replaced.
+	:type outputFilePath: str
+	:param outputFormat: Either 'xml', to produce a file laid out like a Log.xml file, or 'text' for plain text.
+	:type outputFormat: str
+	:return: The number of reports converted.
+	:rtype: int
+	"""
+
+	if outputFormat == "xml":
+		renderer = RenderXMLReport  # type: typing.Callable[[BinaryReport], str]
+		startText = '<?xml version="1.0" encoding="utf-8"?>' + os.linesep + "<LogFile>" + os.linesep  # type: str
+		endText = os.linesep + "</LogFile>"  # type: str
+	elif outputFormat == "text":
+		renderer = RenderTextReport  # type: typing.Callable[[BinaryReport], str]
+		startText = ""  # type: str
+		endText = os.linesep  # type: str
+	else:
+		raise ValueError("Unknown output format '" + outputFormat + "'.")
+
+	with open(binaryLogFilePath, mode = "rb") as binaryLogFile:
+		reports = list(ReadReports(binaryLogFile))  # type: typing.List[BinaryReport]
+
+	with open(outputFilePath, mode = "w", encoding = "utf-8", newline = "") as outputFile:
+		outputFile.write(startText)
+		outputFile.write((os.linesep + os.linesep).join(renderer(report) for report in reports))
+		outputFile.write(endText)
+
+	return len(reports)
+
+def RenderXMLReport (report: BinaryReport) -> str:
+	lines = [
+		"<Report>",
+		"\t<Number>" + str(report.Number) + "</Number>",
+		"\t<Time>" + datetime.datetime.fromtimestamp(report.Time).isoformat() + "</Time>",
+		"\t<Level>" + saxutils.escape(report.LevelName) + "</Level>",
+		"\t<Group>" + saxutils.escape(str(report.Group)) + "</Group>",
+		"\t<Owner>" + saxutils.escape(str(report.Owner)) + "</Owner>",
+		"\t<Message>" + saxutils.escape(report.Message) + "</Message>"
+	]  # type: typing.List[str]
+
+	if report.Exception is not None:
+		lines.append("\t<Exception>" + saxutils.escape(report.Exception) + "</Exception>")
+
+	if report.Stacktrace is not None:
+		lines.append("\t<Stacktrace>" + saxutils.escape(report.Stacktrace) + "</Stacktrace>")
+
+	lines.append("</Report>")
+
+	return os.linesep.join(lines)
+
+def RenderTextReport (report: BinaryReport) -> str:
+	lines = [
+		"#" + str(report.Number) + " " + datetime.datetime.fromtimestamp(report.Time).isoformat() + " " + report.LevelName + " " + str(report.Group) + " (" + str(report.Owner) + ")",
+		report.Message
+	]  # type: typing.List[str]
+
+	if report.Exception is not None:
+		lines.append(report.Exception.rstrip())
+
+	if report.Stacktrace is not None:
+		lines.append(report.Stacktrace.rstrip())
+
+	return os.linesep.join(lines)
+
+def _WriteRecord (target: bytearray, payload: typing.Union[bytes, bytearray]) -> None:
+	_WriteVarint(target, len(payload))
+	target += payload
+
+def _WriteVarint (target: bytearray, value: int) -> None:
+	while value > 0x7F:
+		target.append((value & 0x7F) | 0x80)
+		value >>= 7
+
+	target.append(value)
+
+def _WriteString (target: bytearray, value: str) -> None:
+	valueBytes = value.encode("utf-8", "backslashreplace")  # type: bytes
+	_WriteVarint(target, len(valueBytes))
+	target += valueBytes
+
+def _WriteTemplateArgument (target: bytearray, value: typing.Any) -> None:
+	valueType = type(value)  # type: type
+
+	if value is None:
+		target.append(_noneArgumentType)
+	elif valueType is bool:
+		target.append(_trueArgumentType if value else _falseArgumentType)
+	elif valueType is int:
+		target.append(_integerArgumentType)
+		_WriteVarint(target, _ZigZagEncode(value))
+	elif valueType is float:
+		target.append(_floatArgumentType)
+		target += struct.pack("<d", value)
+	elif valueType is str:
+		target.append(_stringArgumentType)
+		_WriteString(target, value)
+	else:
+		raise TypeError("Template arguments of the type '" + valueType.__name__ + "' cannot be written to a binary log.")
+
+def _ReadTemplateArgument (source: bytes, position: int) -> typing.Tuple[typing.Any, int]:
+	argumentType = source[position]  # type: int
+	position += 1
+
+	if argumentType == _noneArgumentType:
+		return None, position
+	elif argumentType == _falseArgumentType:
+		return False, position
+	elif argumentType == _trueArgumentType:
+		return True, position
+	elif argumentType == _integerArgumentType:
+		value, position = _ReadVarint(source, position)
+		return _ZigZagDecode(value), position
+	elif argumentType == _floatArgumentType:
+		return struct.unpack_from("<d", source, position)[0], position + 8
+	elif argumentType == _stringArgumentType:
+		return _ReadString(source, position)
+
+	raise ValueError("Unknown template argument type '" + str(argumentType) + "'.")
+
+def _ReadVarint (source: bytes, position: int) -> typing.Tuple[int, int]:
+	value = 0  # type: int
+	shift = 0  # type: int
+
+	while True:
+		byte = source[position]  # type: int
+		position += 1
+
+		value |= (byte & 0x7F) << shift
+
+		if not byte & 0x80:
+			return value, position
+
+		shift += 7
+
+def _ReadString (source: bytes, position: int) -> typing.Tuple[str, int]:
+	length, position = _ReadVarint(source, position)
+	return source[position:position + length].decode("utf-8", "replace"), position + length
+
+def _ZigZagEncode (value: int) -> int:
+	return value * 2 if value >= 0 else -value * 2 - 1
+
+def _ZigZagDecode (value: int) -> int:
+	return value // 2 if not value & 1 else -(value + 1) // 2
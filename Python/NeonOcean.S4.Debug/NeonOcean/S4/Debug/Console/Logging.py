@@ -0,0 +1,413 @@
+"""
+This module contains console commands for measuring and inspecting this mod's logger.
+"""
+
+import datetime
+import os
+import sys
+import time
+import tracemalloc
+import traceback
+import typing
+
+from NeonOcean.S4.Debug import LogIndex, Logging, Settings, This
+from NeonOcean.S4.Debug.Console import Command
+from NeonOcean.S4.Main import Debug, DebugShared, LoadingShared
+from NeonOcean.S4.Main.Tools import Parse
+from sims4 import commands, log
+
+BenchmarkMemoryCommand: Command.ConsoleCommand
+BenchmarkRejectionCommand: Command.ConsoleCommand
+BenchmarkSerializationCommand: Command.ConsoleCommand
+PrintReportsCommand: Command.ConsoleCommand
+PrintStatsCommand: Command.ConsoleCommand
+
+_serializationBenchmarkGroupCount = 10  # type: int
+_serializationBenchmarkConcatenationLimit = 10000  # type: int
+
+_printedTemplateCount = 10  # type: int
+_printedTemplateLength = 80  # type: int
+
+_unslottedPendingReportType = None  # type: typing.Optional[type]
+
+def _Setup () -> None:
+	global BenchmarkMemoryCommand, BenchmarkRejectionCommand, BenchmarkSerializationCommand, PrintReportsCommand, PrintStatsCommand, _unslottedPendingReportType
+
+	_unslottedPendingReportType = _CreateUnslottedPendingReportType()
+
+	commandPrefix = This.Mod.Namespace.lower() + ".logging"
+
+	BenchmarkMemoryCommand = Command.ConsoleCommand(_BenchmarkMemory, commandPrefix + ".benchmark_memory", showHelp = True, helpInput = "{ report count }")
+	BenchmarkRejectionCommand = Command.ConsoleCommand(_BenchmarkRejection, commandPrefix + ".benchmark_rejection", showHelp = True, helpInput = "{ iterations }")
+	BenchmarkSerializationCommand = Command.ConsoleCommand(_BenchmarkSerialization, commandPrefix + ".benchmark_serialization", showHelp = True, helpInput = "{ report count }")
+	PrintReportsCommand = Command.ConsoleCommand(_PrintReports, commandPrefix + ".print_reports", showHelp = True, helpInput = "{ level or * } { group or * } { report count }")
+	PrintStatsCommand = Command.ConsoleCommand(_PrintStats, commandPrefix + ".print_stats", showHelp = True)
+
+def _OnStart (cause: LoadingShared.LoadingCauses) -> None:
+	if cause:
+		pass
+
+	BenchmarkMemoryCommand.RegisterCommand()
+	BenchmarkRejectionCommand.RegisterCommand()
+	BenchmarkSerializationCommand.RegisterCommand()
+	PrintReportsCommand.RegisterCommand()
+	PrintStatsCommand.RegisterCommand()
+
+def _OnStop (cause: LoadingShared.UnloadingCauses) -> None:
+	if cause:
+		pass
+
+	BenchmarkMemoryCommand.UnregisterCommand()
+	BenchmarkRejectionCommand.UnregisterCommand()
+	BenchmarkSerializationCommand.UnregisterCommand()
+	PrintReportsCommand.UnregisterCommand()
+	PrintStatsCommand.UnregisterCommand()
+
+def _BenchmarkMemory (reportCount: int = 10000, _connection: int = None) -> None:
+	try:
+		reportCount = int(reportCount)
+
+		if reportCount <= 0:
+			commands.cheat_output("The report count must be greater than 0.\n", _connection)
+			return
+
+		startedTracing = not tracemalloc.is_tracing()  # type: bool
+
+		if startedTracing:
+			tracemalloc.start()
+
+		try:
+			fullReportLength = _MeasureReportMemory(_CreateFullReports, reportCount)  # type: float
+			unslottedReportLength = _MeasureReportMemory(_CreateUnslottedPendingReports, reportCount)  # type: float
+			pendingReportLength = _MeasureReportMemory(_CreatePendingReports, reportCount)  # type: float
+		finally:
+			if startedTracing:
+				tracemalloc.stop()
+
+		benchmarkText = "Reports: " + str(reportCount) + "\n"
+		benchmarkText += "Full report objects: " + "%.0f" % fullReportLength + " bytes per report\n"
+		benchmarkText += "Pending reports without slots: " + "%.0f" % unslottedReportLength + " bytes per report\n"
+		benchmarkText += "Pending reports: " + "%.0f" % pendingReportLength + " bytes per report\n"
+
+		if unslottedReportLength > 0:
+			benchmarkText += "Pending reports take " + "%.1f" % (pendingReportLength / unslottedReportLength * 100) + "% of the memory of pending reports without slots\n"
+
+		commands.cheat_output(benchmarkText, _connection)
+	except Exception:
+		commands.cheat_output("Failed to run the report memory benchmark.\n", _connection)
+		Debug.Log("Failed to run the report memory benchmark.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+		return
+
+def _BenchmarkRejection (iterations: int = 100000, _connection: int = None) -> None:
+	try:
+		iterations = int(iterations)
+
+		if iterations <= 0:
+			commands.cheat_output("The number of iterations must be greater than 0.\n", _connection)
+			return
+
+		logLevel = Parse.ParsePythonEnum(Settings.LogLevel.Get(), Debug.LogLevels)  # type: Debug.LogLevels
+
+		if Settings.LoggingEnabled.Get() and Debug.LogLevels.Debug <= logLevel:
+			commands.cheat_output("Debug level reports are not being rejected with the current settings, the log level must be above 'Debug' to run this benchmark.\n", _connection)
+			return
+
+		# noinspection PyUnusedLocal
+		def Baseline (group: str, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
+			pass
+
+		baselineStart = time.perf_counter()  # type: float
+
+		for iteration in range(iterations):  # type: int
+			Baseline("Benchmark", "Rejected report {}", iteration)
+
+		baselineTime = time.perf_counter() - baselineStart  # type: float
+
+		rejectionStart = time.perf_counter()  # type: float
+
+		for iteration in range(iterations):  # type: int
+			log.debug("Benchmark", "Rejected report {}", iteration)
+
+		rejectionTime = time.perf_counter() - rejectionStart  # type: float
+
+		benchmarkText = "Rejected calls: " + str(iterations) + "\n"
+		benchmarkText += "Cost per rejected call: " + "%.1f" % (rejectionTime / iterations * 1000000000) + " ns\n"
+		benchmarkText += "Cost per empty call: " + "%.1f" % (baselineTime / iterations * 1000000000) + " ns\n"
+
+		commands.cheat_output(benchmarkText, _connection)
+	except Exception:
+		commands.cheat_output("Failed to run the log rejection benchmark.\n", _connection)
+		Debug.Log("Failed to run the log rejection benchmark.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+		return
+
+def _PrintReports (level: str = "*", group: str = "*", reportCount: int = 5, _connection: int = None) -> None:
+	try:
+		reportCount = int(reportCount)
+
+		sessionDirectoryPath = Logging.GetSessionDirectoryPath()  # type: str
+		logFilePath = os.path.join(sessionDirectoryPath, "Log.xml")  # type: str
+		indexFilePath = os.path.join(sessionDirectoryPath, "Log Index.txt")  # type: str
+
+		if not os.path.exists(indexFilePath) or not os.path.exists(logFilePath):
+			commands.cheat_output("No reports have been written to this session's chronological log yet.\n", _connection)
+			return
+
+		matchingEntries = LogIndex.FindEntries(LogIndex.ReadIndex(indexFilePath),
+											   level = level if level != "*" else None,
+											   group = group if group != "*" else None)  # type: typing.List[LogIndex.IndexEntry]
+
+		printingEntries = matchingEntries[-reportCount:] if reportCount > 0 else list()  # type: typing.List[LogIndex.IndexEntry]
+
+		reportsText = "Matching reports: " + str(len(matchingEntries)) + "\n"
+
+		for reportBytes in LogIndex.ReadReports(logFilePath, printingEntries):  # type: bytes
+			reportsText += reportBytes.decode("utf-8", "replace") + "\n"
+
+		commands.cheat_output(reportsText, _connection)
+	except Exception:
+		commands.cheat_output("Failed to print reports.\n", _connection)
+		Debug.Log("Failed to print reports.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+		return
+
+def _PrintStats (_connection: int = None) -> None:
+	try:
+		metrics = Logging.GetMetrics()  # type: Logging.LoggerMetrics
+
+		keptLevels = dict(metrics.KeptLevels)  # type: typing.Dict[int, int]
+		rejectedLevels = dict(metrics.RejectedLevels)  # type: typing.Dict[int, int]
+
+		statsText = "Reports received by level (kept / rejected):\n"
+
+		for level in sorted(set(keptLevels) | set(rejectedLevels)):  # type: int
+			statsText += "  " + _GetLevelName(level) + ": " + str(keptLevels.get(level, 0) + rejectedLevels.get(level, 0)) + \
+						 " (" + str(keptLevels.get(level, 0)) + " / " + str(rejectedLevels.get(level, 0)) + ")\n"
+
+		keptGroups = metrics.KeptGroups  # type: typing.Counter[str]
+		rejectedGroups = metrics.RejectedGroups  # type: typing.Counter[str]
+
+		statsText += "Reports received by group (kept / rejected, game log calls rejected by level alone are not counted here):\n"
+
+		for group, groupCount in (keptGroups + rejectedGroups).most_common():  # type: str, int
+			statsText += "  " + str(group) + ": " + str(groupCount) + " (" + str(keptGroups.get(group, 0)) + " / " + str(rejectedGroups.get(group, 0)) + ")\n"
+
+		statsText += "Collapsed repeats: " + str(metrics.CollapsedCount) + "\n"
+		statsText += "Dropped on overflow: " + str(Logging.GetDroppedReportCount()) + "\n"
+		statsText += "Filtered while writing: " + str(metrics.FilteredCount) + "\n"
+		statsText += "Written: " + str(metrics.WrittenCount) + "\n"
+
+		statsText += "Bytes written by file:\n"
+
+		for filePath, writtenLength in sorted(metrics.WrittenLengths.items()):  # type: str, int
+			statsText += "  " + filePath + ": " + str(writtenLength) + "\n"
+
+		statsText += "Most written message templates:\n"
+
+		for template, templateCount in metrics.TemplateCounts.most_common(_printedTemplateCount):  # type: str, int
+			statsText += "  " + str(templateCount) + ": " + repr(template if len(template) <= _printedTemplateLength else template[:_printedTemplateLength] + "...") + "\n"
+
+		statsText += "Flushes: " + str(metrics.FlushCount) + ", reports per flush " + _FormatPercentiles(list(metrics.FlushSizes), "%d") + "\n"
+		statsText += "Writes: " + str(metrics.WriteCount) + ", duration " + _FormatPercentiles([duration * 1000 for duration in metrics.WriteDurations], "%.3f ms") + "\n"
+		statsText += "Pending reports: " + str(Logging.GetPendingReportCount()) + "\n"
+		statsText += "Consecutive write failures: " + str(Logging.GetWriteFailureCount()) + "\n"
+		statsText += "Effective flush interval: " + "%.3f" % Logging.GetEffectiveFlushInterval() + " s\n"
+
+		commands.cheat_output(statsText, _connection)
+	except Exception:
+		commands.cheat_output("Failed to print logger stats.\n", _connection)
+		Debug.Log("Failed to print logger stats.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+		return
+
+def _GetLevelName (level: int) -> str:
+	try:
+		return Debug.LogLevels(level).name
+	except ValueError:
+		return str(level)
+
+def _FormatPercentiles (samples: typing.List[float], valueFormat: str) -> str:
+	"""
+	Format the 50th, 90th and 99th percentiles and the maximum of the samples, using the nearest rank method.
+	"""
+
+	if len(samples) == 0:
+		return "(no samples)"
+
+	samples = sorted(samples)
+
+	percentileTexts = list()  # type: typing.List[str]
+
+	for percentile in (50, 90, 99):  # type: int
+		sampleIndex = max(0, -(-percentile * len(samples) // 100) - 1)  # type: int
+		percentileTexts.append("p" + str(percentile) + " " + valueFormat % samples[sampleIndex])
+
+	percentileTexts.append("max " + valueFormat % samples[-1])
+
+	return "(" + ", ".join(percentileTexts) + ", over the last " + str(len(samples)) + ")"
+
+def _BenchmarkSerialization (reportCount: int = 0, _connection: int = None) -> None:
+	try:
+		reportCount = int(reportCount)
+
+		if reportCount < 0:
+			commands.cheat_output("The report count must not be less than 0.\n", _connection)
+			return
+
+		if reportCount == 0:
+			reportCounts = [1000, 10000, 100000]  # type: typing.List[int]
+		else:
+			reportCounts = [reportCount]  # type: typing.List[int]
+
+		benchmarkReport = DebugShared.Report(None, 1, datetime.datetime.now().isoformat(), "Benchmark report message.",
+											 level = Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)  # type: DebugShared.Report
+
+		benchmarkReportBytes = benchmarkReport.GetBytes(writeTime = datetime.datetime.now().isoformat())  # type: bytes
+		benchmarkGroups = [This.Mod.Namespace + ".Benchmark" + str(groupIndex) for groupIndex in range(_serializationBenchmarkGroupCount)]  # type: typing.List[str]
+
+		benchmarkText = ""
+
+		for reportCount in reportCounts:  # type: int
+			if reportCount <= _serializationBenchmarkConcatenationLimit:
+				concatenationTime = _MeasureConcatenation(benchmarkReportBytes, benchmarkGroups, reportCount)  # type: typing.Optional[float]
+			else:
+				concatenationTime = None  # type: typing.Optional[float]
+
+			serializerTime = _MeasureSerializer(benchmarkReportBytes, benchmarkGroups, reportCount)  # type: float
+
+			benchmarkText += "Reports: " + str(reportCount) + "\n"
+
+			if concatenationTime is not None:
+				benchmarkText += "Concatenation: " + "%.3f" % (concatenationTime * 1000) + " ms\n"
+			else:
+				benchmarkText += "Concatenation: skipped, this would take too long with more than " + str(_serializationBenchmarkConcatenationLimit) + " reports\n"
+
+			benchmarkText += "Serializer: " + "%.3f" % (serializerTime * 1000) + " ms\n"
+
+		commands.cheat_output(benchmarkText, _connection)
+	except Exception:
+		commands.cheat_output("Failed to run the report serialization benchmark.\n", _connection)
+		Debug.Log("Failed to run the report serialization benchmark.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+		return
+
+def _MeasureReportMemory (createReports: typing.Callable[[int], typing.Any], reportCount: int) -> float:
+	"""
+	Measure the memory taken up by each report made by a report creation function, while the created reports are still held onto. Tracemalloc must
+	already be tracing.
+	"""
+
+	startLength = tracemalloc.get_traced_memory()[0]  # type: int
+	reports = createReports(reportCount)  # type: typing.Any
+	reportsLength = tracemalloc.get_traced_memory()[0] - startLength  # type: int
+
+	del reports
+
+	return reportsLength / reportCount
+
+def _CreateFullReports (reportCount: int) -> typing.List[DebugShared.Report]:
+	"""
+	Create reports the way the logger kept them before it had pending reports, as full report objects with their message and stack trace
+	already formatted.
+	"""
+
+	reports = list()  # type: typing.List[DebugShared.Report]
+
+	for reportIndex in range(reportCount):  # type: int
+		reports.append(DebugShared.Report(None, reportIndex + 1, datetime.datetime.now().isoformat(), "Benchmark report {}".format(reportIndex),
+										  level = Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__, logStack = True,
+										  stacktrace = str.join("", traceback.format_stack())))
+
+	return reports
+
+def _CreateUnslottedPendingReportType () -> type:
+	"""
+	Create a copy of the pending report class that keeps its attributes in an instance dictionary rather than in slots. A subclass would not do,
+	the attributes of a subclass instance would still be stored in the base class's slots.
+	"""
+
+	# noinspection PyProtectedMember
+	pendingReportType = Logging._PendingReport  # type: type
+	excludedNames = set(pendingReportType.__slots__) | {"__slots__", "__dict__", "__weakref__"}  # type: typing.Set[str]
+
+	reportTypeNamespace = {name: value for name, value in vars(pendingReportType).items() if name not in excludedNames}  # type: typing.Dict[str, typing.Any]
+	return type("_UnslottedPendingReport", (), reportTypeNamespace)
+
+def _CreateUnslottedPendingReports (reportCount: int) -> typing.Tuple[list, dict]:
+	"""
+	Create pending reports the same way as '_CreatePendingReports', except that their attributes are kept in an instance dictionary. This is the
+	baseline pending reports with slots are compared against.
+	"""
+
+	return _CreatePendingReports(reportCount, reportType = _unslottedPendingReportType)
+
+def _CreatePendingReports (reportCount: int, reportType: typing.Optional[type] = None) -> typing.Tuple[list, dict]:
+	"""
+	Create pending reports the way the logger keeps them in its buffer, along with their fingerprints.
+	:param reportType: The class of the created reports, the logger's pending report class if this is None.
+	:type reportType: type | None
+	"""
+
+	if reportType is None:
+		# noinspection PyProtectedMember
+		reportType = Logging._PendingReport
+
+	# noinspection PyProtectedMember
+	stackCache = Logging._StackCache(Logging._Logger.StackCacheCapacity)  # type: Logging._StackCache
+
+	reports = list()  # type: typing.List[Logging._PendingReport]
+	reportFingerprints = dict()  # type: typing.Dict[tuple, Logging._PendingReport]
+
+	for reportIndex in range(reportCount):  # type: int
+		# noinspection PyProtectedMember
+		stackFrames = Logging._StackCapture.CaptureFrames(sys._getframe())  # type: tuple
+		messageArgs = (reportIndex,)  # type: tuple
+		messageArgTypes = (int,)  # type: tuple
+
+		# noinspection PyProtectedMember
+		report = reportType(reportIndex + 1, time.time(), "Benchmark report {}", Debug.LogLevels.Warning, This.Mod.Namespace, __name__,
+							None, True, stackCache.Intern(stackFrames), messageArgs = messageArgs)  # type: Logging._PendingReport
+
+		report.Fingerprint = (int(report.Level), report.Group, report.Owner, report.Template, messageArgs, messageArgTypes, report.LogStack, None, report.Stack.Frames)
+
+		reports.append(report)
+		reportFingerprints[report.Fingerprint] = report
+
+	return reports, reportFingerprints
+
+def _MeasureConcatenation (reportTextBytes: bytes, groups: typing.List[str], reportCount: int) -> float:
+	"""
+	Measure how long it takes to collect reports the way the logger did before it had a serializer, by concatenating bytes objects.
+	"""
+
+	startTime = time.perf_counter()  # type: float
+
+	chronologicalTextBytes = bytes()  # type: bytes
+	groupsTextBytes = dict()  # type: typing.Dict[str, bytes]
+
+	for reportIndex in range(reportCount):  # type: int
+		group = groups[reportIndex % len(groups)]  # type: str
+
+		if len(chronologicalTextBytes) != 0:
+			chronologicalTextBytes += (os.linesep + os.linesep).encode("utf-8") + reportTextBytes
+		else:
+			chronologicalTextBytes = reportTextBytes
+
+		if group in groupsTextBytes:
+			groupsTextBytes[group] += (os.linesep + os.linesep).encode("utf-8") + reportTextBytes
+		else:
+			groupsTextBytes[group] = reportTextBytes
+
+	return time.perf_counter() - startTime
+
+def _MeasureSerializer (reportTextBytes: bytes, groups: typing.List[str], reportCount: int) -> float:
+	startTime = time.perf_counter()  # type: float
+
+	# noinspection PyProtectedMember
+	reportSerializer = Logging._ReportSerializer((os.linesep + os.linesep).encode("utf-8"))  # type: Logging._ReportSerializer
+
+	for reportIndex in range(reportCount):  # type: int
+		reportSerializer.AddReport(reportTextBytes, groups[reportIndex % len(groups)], True, True)
+
+	reportSerializer.GetChronologicalBytes()
+	reportSerializer.GetGroupsBytes()
+
+	return time.perf_counter() - startTime
+
+_Setup()
@@ -0,0 +1,109 @@
+"""
+Reading and writing of the index files kept next to chronological log files.
+
+An index file is a tab separated text file with one line per report, giving the report's number, level and group along with the byte offset and
+length of the report's text in the log file. This allows specific reports to be read without parsing the whole log file.
+
+This module only depends on the standard library, so that log indexes can also be used outside of the game.
+"""
+
+from __future__ import annotations
+
+import typing
+
+IndexFileHeader = "Number\tLevel\tGroup\tOffset\tLength\n"  # type: str
+
+class IndexEntry:
+	def __init__ (self, number: int, level: str, group: str, offset: int, length: int):
+		self.Number = number  # type: int
+		self.Level = level  # type: str
+		self.Group = group  # type: str
+		self.Offset = offset  # type: int
+		self.Length = length  # type: int
+
+def FormatEntry (number: int, level: str, group: str, offset: int, length: int) -> str:
+	return str(number) + "\t" + _EscapeField(level) + "\t" + _EscapeField(group) + "\t" + str(offset) + "\t" + str(length) + "\n"
+
+def ReadIndex (indexFilePath: str) -> typing.List[IndexEntry]:
+	"""
+	Read every entry from an index file. A partially written line at the end of the file is ignored.
+	"""
+
+	entries = list()  # type: typing.List[IndexEntry]
+
+	with open(indexFilePath, mode = "r", encoding = "utf-8", newline = "\n") as indexFile:
+		for line in indexFile:  # type: str
+			if not line.endswith("\n") or line == IndexFileHeader:
+				continue
+
+			fields = line[:-1].split("\t")  # type: typing.List[str]
+
+			if len(fields) != 5:
+				continue
+
+			try:
+				entries.append(IndexEntry(int(fields[0]), _UnescapeField(fields[1]), _UnescapeField(fields[2]), int(fields[3]), int(fields[4])))
+			except ValueError:
+				continue
+
+	return entries
+
+def FindEntries (entries: typing.Iterable[IndexEntry], number: typing.Optional[int] = None,
+				 level: typing.Optional[str] = None, group: typing.Optional[str] = None) -> typing.List[IndexEntry]:
+	"""
+	Get the entries matching all of the given values. Level and group names are compared without regard to case.
+	"""
+
+	if level is not None:
+		level = level.lower()
+
+	if group is not None:
+		group = group.lower()
+
+	matchingEntries = list()  # type: typing.List[IndexEntry]
+
+	for entry in entries:  # type: IndexEntry
+		if number is not None and entry.Number != number:
+			continue
+
+		if level is not None and entry.Level.lower() != level:
+			continue
+
+		if group is not None and entry.Group.lower() != group:
+			continue
+
+		matchingEntries.append(entry)
+
+	return matchingEntries
+
+def ReadReports (logFilePath: str, entries: typing.Iterable[IndexEntry]) -> typing.List[bytes]:
+	"""
+	Read the text of the indexed reports directly from a log file.
+	"""
+
+	reports = list()  # type: typing.List[bytes]
+
+	with open(logFilePath, mode = "rb") as logFile:
+		for entry in entries:  # type: IndexEntry
+			logFile.seek(entry.Offset)
+			reports.append(logFile.read(entry.Length))
+
+	return reports
+
+def _EscapeField (value: str) -> str:
+	return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def _UnescapeField (value: str) -> str:
+	unescapedCharacters = list()  # type: typing.List[str]
+	escaping = False  # type: bool
+
+	for character in value:  # type: str
+		if escaping:
+			unescapedCharacters.append({ "t": "\t", "n": "\n", "r": "\r" }.get(character, character))
+			escaping = False
+		elif character == "\\":
+			escaping = True
+		else:
+			unescapedCharacters.append(character)
+
+	return "".join(unescapedCharacters)
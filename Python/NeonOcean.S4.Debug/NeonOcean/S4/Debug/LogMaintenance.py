@@ -0,0 +1,415 @@
+"""
+Upkeep of the logging root directory, done in a background thread. Sessions that fall outside of the retention limits are deleted, then previous
+session directories, except for the few most recent, are packed into compressed zip archives. A zip archive's central directory acts as its table
+of contents, so single files can be read back out of an archive without unpacking the rest.
+
+The binary logs of the most recent previous sessions are also converted to readable logs here, in a conversions directory next to the logging root
+directory, so that report archives can include them without a binary log being converted while the report is made.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import shutil
+import threading
+import typing
+import zipfile
+
+from NeonOcean.S4.Debug import BinaryLog, This
+from NeonOcean.S4.Main import Debug
+
+SessionDirectoryNameFormat = "%Y-%m-%d %H.%M.%S.%f"  # type: str
+SessionArchiveExtension = ".zip"  # type: str
+
+UncompressedSessionCount = 5  # type: int
+ReportedSessionCount = 10  # type: int  # The number of the most recent sessions whose logs are included in report archives.
+
+ConversionsDirectoryName = "Log Conversions"  # type: str
+ConvertedLogFileName = "Log Converted.xml"  # type: str
+
+class Session:
+	def __init__ (self, name: str, path: str, archived: bool, time: datetime.datetime):
+		self.Name = name  # type: str
+		self.Path = path  # type: str
+		self.Archived = archived  # type: bool
+		self.Time = time  # type: datetime.datetime
+
+	def GetFileNames (self) -> typing.List[str]:
+		"""
+		Get the names of the files in this session, relative to the session's directory.
+		"""
+
+		if self.Archived:
+			with zipfile.ZipFile(self.Path, mode = "r") as sessionArchive:
+				return [archivedFileName for archivedFileName in sessionArchive.namelist() if not archivedFileName.endswith("/")]
+
+		sessionFileNames = list()  # type: typing.List[str]
+
+		for directoryRoot, directoryNames, fileNames in os.walk(self.Path):  # type: str, list, list
+			for fileName in fileNames:  # type: str
+				sessionFileNames.append(os.path.relpath(os.path.join(directoryRoot, fileName), self.Path).replace(os.sep, "/"))
+
+		return sessionFileNames
+
+	def GetSize (self) -> int:
+		"""
+		Get the number of bytes this session takes up on the disk.
+		"""
+
+		if self.Archived:
+			return os.path.getsize(self.Path)
+
+		sessionSize = 0  # type: int
+
+		for directoryRoot, directoryNames, fileNames in os.walk(self.Path):  # type: str, list, list
+			for fileName in fileNames:  # type: str
+				sessionSize += os.path.getsize(os.path.join(directoryRoot, fileName))
+
+		return sessionSize
+
+	def ExtractFile (self, fileName: str, targetDirectoryPath: str) -> typing.Optional[str]:
+		"""
+		Get a path to one of this session's files that can be read directly. Archived files are extracted on their own into the target directory.
+		:param fileName: The name of the file, relative to the session's directory.
+		:type fileName: str
+		:param targetDirectoryPath: The directory archived files should be extracted to.
+		:type targetDirectoryPath: str
+		:return: The path to the file, or None if the session does not contain this file.
+		:rtype: str | None
+		"""
+
+		if not self.Archived:
+			filePath = os.path.join(self.Path, fileName)  # type: str
+			return filePath if os.path.isfile(filePath) else None
+
+		with zipfile.ZipFile(self.Path, mode = "r") as sessionArchive:
+			try:
+				sessionArchive.getinfo(fileName)
+			except KeyError:
+				return None
+
+			extractedFilePath = os.path.join(targetDirectoryPath, self.Name, fileName)  # type: str
+			extractedDirectoryPath = os.path.dirname(extractedFilePath)  # type: str
+
+			if not os.path.exists(extractedDirectoryPath):
+				os.makedirs(extractedDirectoryPath)
+
+			with sessionArchive.open(fileName, mode = "r") as archivedFile, open(extractedFilePath, mode = "wb") as extractedFile:
+				shutil.copyfileobj(archivedFile, extractedFile)
+
+			return extractedFilePath
+
+class RetentionLimits:
+	def __init__ (self, maximumSize: int = -1, maximumAge: float = -1, maximumCount: int = -1):
+		"""
+		Limits on the sessions kept in a logging root directory. Negative values disable a limit.
+		:param maximumSize: The maximum number of bytes all sessions together may take up on the disk.
+		:type maximumSize: int
+		:param maximumAge: The maximum age of a session in seconds.
+		:type maximumAge: float
+		:param maximumCount: The maximum number of sessions, including the active session.
+		:type maximumCount: int
+		"""
+
+		self.MaximumSize = maximumSize  # type: int
+		self.MaximumAge = maximumAge  # type: float
+		self.MaximumCount = maximumCount  # type: int
+
+class _MaintenanceThread(threading.Thread):
+	ThreadName = This.Mod.Namespace + ".LogMaintenance"  # type: str
+
+	def __init__ (self, loggingRootPath: str, activeDirectoryName: str, retentionLimits: RetentionLimits, previousThreads: typing.List[threading.Thread]):
+		super().__init__(name = self.ThreadName, daemon = True)
+
+		self.LoggingRootPath = loggingRootPath  # type: str
+		self.ActiveDirectoryName = activeDirectoryName  # type: str
+		self.RetentionLimits = retentionLimits  # type: RetentionLimits
+
+		self.StopEvent = threading.Event()  # type: threading.Event
+
+		self._previousThreads = previousThreads  # type: typing.List[threading.Thread]
+
+	def run (self) -> None:
+		# A stopped thread may still be finishing the session it was working on, two threads must never work on the same sessions at once.
+		# Waiting for it here rather than when it was stopped keeps the thread stopping it from being held up.
+		for previousThread in self._previousThreads:  # type: threading.Thread
+			previousThread.join()
+
+		self._previousThreads = list()
+
+		if self.StopEvent.is_set():
+			return
+
+		try:
+			RetainSessions(self.LoggingRootPath, self.ActiveDirectoryName, self.RetentionLimits, stopEvent = self.StopEvent)
+		except Exception:
+			Debug.Log("Failed to remove old log sessions.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+		try:
+			ConvertSessions(self.LoggingRootPath, self.ActiveDirectoryName, stopEvent = self.StopEvent)
+		except Exception:
+			Debug.Log("Failed to convert previous binary log sessions.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+		try:
+			RotateSessions(self.LoggingRootPath, self.ActiveDirectoryName, stopEvent = self.StopEvent)
+		except Exception:
+			Debug.Log("Failed to rotate previous log sessions.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+def GetSessions (loggingRootPath: str) -> typing.List[Session]:
+	"""
+	Get every session in a logging root directory, whether archived or not, from the newest to the oldest.
+	"""
+
+	sessions = list()  # type: typing.List[Session]
+
+	if not os.path.isdir(loggingRootPath):
+		return sessions
+
+	for entryName in os.listdir(loggingRootPath):  # type: str
+		entryPath = os.path.join(loggingRootPath, entryName)  # type: str
+
+		if os.path.isdir(entryPath):
+			sessionName = entryName  # type: str
+			archived = False  # type: bool
+		elif entryName.endswith(SessionArchiveExtension) and os.path.isfile(entryPath):
+			sessionName = entryName[:-len(SessionArchiveExtension)]  # type: str
+			archived = True  # type: bool
+		else:
+			continue
+
+		try:
+			sessionTime = datetime.datetime.strptime(sessionName, SessionDirectoryNameFormat)  # type: datetime.datetime
+		except ValueError:
+			Debug.Log("Found a directory in a logging namespace that did not meet the naming convention of 'Year-Month-Day Hour.Minute.Second.Microsecond'.\nDirectory Name: %s" % entryName,
+					  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":GetSessions", lockThreshold = 1)
+			continue
+
+		sessions.append(Session(sessionName, entryPath, archived, sessionTime))
+
+	sessions.sort(key = lambda session: session.Time, reverse = True)
+	return sessions
+
+def RetainSessions (loggingRootPath: str, activeDirectoryName: str, retentionLimits: RetentionLimits, stopEvent: typing.Optional[threading.Event] = None) -> None:
+	"""
+	Delete every session that falls outside of the retention limits. Sessions are kept from the newest to the oldest until the age or count limit is
+	reached, then sessions are deleted from the oldest to the newest until the rest fit within the size limit. The active session counts towards the
+	limits but is never deleted.
+	:param loggingRootPath: The logging root directory containing the sessions.
+	:type loggingRootPath: str
+	:param activeDirectoryName: The name of the session directory currently being written to. This directory, and any newer one, will never be touched.
+	:type activeDirectoryName: str
+	:param retentionLimits: The limits to enforce.
+	:type retentionLimits: RetentionLimits
+	:param stopEvent: Deletion will stop between two sessions once this event is set.
+	:type stopEvent: threading.Event | None
+	"""
+
+	currentTime = datetime.datetime.now()  # type: datetime.datetime
+
+	keptSessions = list()  # type: typing.List[typing.Tuple[Session, int]]
+	keptSize = 0  # type: int
+
+	for session in GetSessions(loggingRootPath):  # type: Session
+		if stopEvent is not None and stopEvent.is_set():
+			return
+
+		if not _IsActiveSession(session, activeDirectoryName):
+			if retentionLimits.MaximumAge >= 0 and (currentTime - session.Time).total_seconds() > retentionLimits.MaximumAge:
+				_DeleteSession(session)
+				continue
+
+			if retentionLimits.MaximumCount >= 0 and len(keptSessions) >= retentionLimits.MaximumCount:
+				_DeleteSession(session)
+				continue
+
+		sessionSize = session.GetSize()  # type: int
+
+		keptSessions.append((session, sessionSize))
+		keptSize += sessionSize
+
+	if retentionLimits.MaximumSize < 0:
+		return
+
+	for session, sessionSize in reversed(keptSessions):  # type: Session, int
+		if keptSize <= retentionLimits.MaximumSize:
+			return
+
+		if stopEvent is not None and stopEvent.is_set():
+			return
+
+		if _IsActiveSession(session, activeDirectoryName):
+			continue
+
+		_DeleteSession(session)
+		keptSize -= sessionSize
+
+def RotateSessions (loggingRootPath: str, activeDirectoryName: str, stopEvent: typing.Optional[threading.Event] = None) -> None:
+	"""
+	Pack every session directory other than the active one and the most recent few into a zip archive, then remove the directory.
+	:param loggingRootPath: The logging root directory containing the sessions.
+	:type loggingRootPath: str
+	:param activeDirectoryName: The name of the session directory currently being written to. This directory, and any newer one, will never be touched.
+	:type activeDirectoryName: str
+	:param stopEvent: Rotation will stop between two sessions once this event is set.
+	:type stopEvent: threading.Event | None
+	"""
+
+	if not os.path.isdir(loggingRootPath):
+		return
+
+	for entryName in os.listdir(loggingRootPath):  # type: str
+		if entryName.endswith(SessionArchiveExtension + ".tmp"):
+			os.remove(os.path.join(loggingRootPath, entryName))
+
+	uncompressedCount = 0  # type: int
+
+	for session in GetSessions(loggingRootPath):  # type: Session
+		if stopEvent is not None and stopEvent.is_set():
+			return
+
+		if session.Archived or _IsActiveSession(session, activeDirectoryName):
+			continue
+
+		if uncompressedCount < UncompressedSessionCount:
+			uncompressedCount += 1
+			continue
+
+		_ArchiveSession(session)
+
+def ConvertSessions (loggingRootPath: str, activeDirectoryName: str, stopEvent: typing.Optional[threading.Event] = None) -> None:
+	"""
+	Convert the binary log of every session among the most recent reported sessions, other than the active one, to a readable log in the conversions
+	directory. Sessions that already have a converted log are skipped, and the converted logs of sessions no longer among the most recent are removed.
+	:param loggingRootPath: The logging root directory containing the sessions.
+	:type loggingRootPath: str
+	:param activeDirectoryName: The name of the session directory currently being written to. This directory, and any newer one, will never be touched.
+	:type activeDirectoryName: str
+	:param stopEvent: Conversion will stop between two sessions once this event is set.
+	:type stopEvent: threading.Event | None
+	"""
+
+	conversionsDirectoryPath = _GetConversionsDirectoryPath(loggingRootPath)  # type: str
+	reportedSessionNames = set()  # type: typing.Set[str]
+
+	for session in GetSessions(loggingRootPath)[:ReportedSessionCount]:  # type: Session
+		if stopEvent is not None and stopEvent.is_set():
+			return
+
+		if _IsActiveSession(session, activeDirectoryName):
+			continue
+
+		reportedSessionNames.add(session.Name)
+
+		if os.path.exists(GetConvertedLogFilePath(loggingRootPath, session.Name)):
+			continue
+
+		try:
+			_ConvertSession(session, conversionsDirectoryPath)
+		except Exception:
+			Debug.Log("Failed to convert a session's binary log.\nSession Path: %s" % session.Path,
+					  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":ConvertSession", lockThreshold = 1)
+
+	if not os.path.isdir(conversionsDirectoryPath):
+		return
+
+	for entryName in os.listdir(conversionsDirectoryPath):  # type: str
+		if entryName not in reportedSessionNames:
+			shutil.rmtree(os.path.join(conversionsDirectoryPath, entryName), ignore_errors = True)
+
+def GetConvertedLogFilePath (loggingRootPath: str, sessionName: str) -> str:
+	"""
+	Get the path a session's converted binary log is kept at. The file will only exist once the session has been converted.
+	"""
+
+	return os.path.join(_GetConversionsDirectoryPath(loggingRootPath), sessionName, ConvertedLogFileName)
+
+def StartMaintenance (loggingRootPath: str, activeDirectoryName: str, retentionLimits: RetentionLimits) -> None:
+	"""
+	Start removing old sessions and rotating previous sessions in the background. If maintenance is already running, it is stopped and
+	restarted with the new limits. The new maintenance thread waits for the stopped ones to exit before it starts working.
+	"""
+
+	previousThreads = StopMaintenance()  # type: typing.List[threading.Thread]
+
+	maintenanceThread = _MaintenanceThread(loggingRootPath, activeDirectoryName, retentionLimits, previousThreads)  # type: _MaintenanceThread
+	maintenanceThread.start()
+
+def StopMaintenance () -> typing.List[threading.Thread]:
+	"""
+	Signal maintenance to stop after the session currently being deleted or archived is done. This does not wait for the maintenance threads, they
+	exit on their own.
+
+	Maintenance threads are found by name rather than kept in a module variable, so threads started before this module was reloaded are stopped
+	as well.
+
+	:return: Every maintenance thread that was signaled, including ones that were already stopping.
+	:rtype: typing.List[threading.Thread]
+	"""
+
+	maintenanceThreads = _GetMaintenanceThreads()  # type: typing.List[threading.Thread]
+
+	for maintenanceThread in maintenanceThreads:  # type: threading.Thread
+		stopEvent = getattr(maintenanceThread, "StopEvent", None)  # type: typing.Optional[threading.Event]
+
+		if stopEvent is not None:
+			stopEvent.set()
+
+	return maintenanceThreads
+
+def _GetMaintenanceThreads () -> typing.List[threading.Thread]:
+	# Threads outlive a reload of this module, their class may be the one from before the reload, so only the name is relied on.
+	return [thread for thread in threading.enumerate() if thread.name == _MaintenanceThread.ThreadName and thread.is_alive()]
+
+def _IsActiveSession (session: Session, activeDirectoryName: str) -> bool:
+	# The logger may start a new session directory while maintenance is running, so sessions newer than the active one are treated as active too.
+	if session.Name == activeDirectoryName:
+		return True
+
+	try:
+		return session.Time >= datetime.datetime.strptime(activeDirectoryName, SessionDirectoryNameFormat)
+	except ValueError:
+		return False
+
+def _GetConversionsDirectoryPath (loggingRootPath: str) -> str:
+	# This directory cannot be inside the logging root directory, anything in there is taken to be a session.
+	return os.path.join(os.path.dirname(loggingRootPath), ConversionsDirectoryName)
+
+def _ConvertSession (session: Session, conversionsDirectoryPath: str) -> None:
+	binaryLogFilePath = session.ExtractFile("Log.bin", conversionsDirectoryPath)  # type: typing.Optional[str]
+
+	if binaryLogFilePath is None:
+		return
+
+	convertedLogFilePath = os.path.join(conversionsDirectoryPath, session.Name, ConvertedLogFileName)  # type: str
+	temporaryConvertedLogFilePath = convertedLogFilePath + ".tmp"  # type: str
+
+	try:
+		if not os.path.exists(os.path.dirname(convertedLogFilePath)):
+			os.makedirs(os.path.dirname(convertedLogFilePath))
+
+		BinaryLog.ConvertFile(binaryLogFilePath, temporaryConvertedLogFilePath)
+		os.replace(temporaryConvertedLogFilePath, convertedLogFilePath)
+	finally:
+		if os.path.exists(temporaryConvertedLogFilePath):
+			os.remove(temporaryConvertedLogFilePath)
+
+		if session.Archived:
+			os.remove(binaryLogFilePath)
+
+def _ArchiveSession (session: Session) -> None:
+	archivePath = session.Path + SessionArchiveExtension  # type: str
+	temporaryArchivePath = archivePath + ".tmp"  # type: str
+
+	with zipfile.ZipFile(temporaryArchivePath, mode = "w", compression = zipfile.ZIP_DEFLATED) as sessionArchive:
+		for sessionFileName in session.GetFileNames():  # type: str
+			sessionArchive.write(os.path.join(session.Path, sessionFileName), arcname = sessionFileName)
+
+	os.replace(temporaryArchivePath, archivePath)
+	shutil.rmtree(session.Path)
+
+def _DeleteSession (session: Session) -> None:
+	if session.Archived:
+		os.remove(session.Path)
+	else:
+		shutil.rmtree(session.Path)
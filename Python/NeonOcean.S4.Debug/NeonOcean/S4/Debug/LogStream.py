@@ -0,0 +1,240 @@
+"""
+Live streaming of written reports to log viewers over a local TCP socket.
+
+A viewer connects to the stream port on the loopback interface and receives a binary log, exactly as it would be written to a binary log file, for
+as long as it stays connected. Every viewer gets its own sending thread and its own bounded queue of report batches. When a viewer falls behind,
+its oldest queued batches are thrown away and it is sent a notice saying how many reports it missed, so a slow or stuck viewer can never hold up the
+logger.
+"""
+
+from __future__ import annotations
+
+import collections
+import socket
+import threading
+import time
+import typing
+
+from NeonOcean.S4.Debug import BinaryLog, This
+from NeonOcean.S4.Main import Debug
+
+StreamHost = "127.0.0.1"  # type: str
+
+ClientQueueLength = 64  # type: int
+ClientSendTimeout = 5  # type: float
+AcceptTimeout = 0.5  # type: float
+
+_server = None  # type: typing.Optional[_StreamServer]
+
+class _StreamClient(threading.Thread):
+	def __init__ (self, connection: socket.socket, address: typing.Tuple[str, int]):
+		super().__init__(name = This.Mod.Namespace + ".LogStream.Client " + str(address[1]), daemon = True)
+
+		self.Connection = connection  # type: socket.socket
+		self.Address = address  # type: typing.Tuple[str, int]
+
+		self.DroppedReportCount = 0  # type: int
+		self.Closed = False  # type: bool
+
+		self._queue = collections.deque()  # type: typing.Deque[typing.List[BinaryLog.BinaryReport]]
+		self._queueCondition = threading.Condition()  # type: threading.Condition
+		self._unnoticedDroppedCount = 0  # type: int
+
+		self._encoder = BinaryLog.BinaryLogEncoder()  # type: BinaryLog.BinaryLogEncoder
+
+	def Enqueue (self, reports: typing.List[BinaryLog.BinaryReport]) -> None:
+		"""
+		Queue a batch of reports to be sent. This never blocks, if the queue is full the oldest batch is dropped to make room.
+		"""
+
+		with self._queueCondition:
+			if self.Closed:
+				return
+
+			if len(self._queue) >= ClientQueueLength:
+				droppedBatch = self._queue.popleft()  # type: typing.List[BinaryLog.BinaryReport]
+				self.DroppedReportCount += len(droppedBatch)
+				self._unnoticedDroppedCount += len(droppedBatch)
+
+			self._queue.append(reports)
+			self._queueCondition.notify()
+
+	def Close (self) -> None:
+		with self._queueCondition:
+			self.Closed = True
+			self._queueCondition.notify()
+
+		try:
+			self.Connection.shutdown(socket.SHUT_RDWR)
+		except OSError:
+			pass
+
+	def run (self) -> None:
+		try:
+			self.Connection.settimeout(ClientSendTimeout)
+			self.Connection.sendall(BinaryLog.BinaryLogEncoder.GetFileHeader())
+
+			while True:
+				with self._queueCondition:
+					while not self.Closed and len(self._queue) == 0:
+						self._queueCondition.wait()
+
+					if self.Closed:
+						break
+
+					reports = self._queue.popleft()  # type: typing.List[BinaryLog.BinaryReport]
+					droppedCount = self._unnoticedDroppedCount  # type: int
+					self._unnoticedDroppedCount = 0
+
+				encodedBytes = bytearray()  # type: bytearray
+
+				if droppedCount != 0:
+					encodedBytes += self._EncodeDroppedReportsNotice(droppedCount)
+
+				for report in reports:  # type: BinaryLog.BinaryReport
+					encodedBytes += self._encoder.EncodeReport(report.Number, report.Time, report.Level, report.LevelName, report.Group, report.Owner,
+															   report.Message, report.LogStack, report.Exception, report.Stacktrace)
+
+				self.Connection.sendall(encodedBytes)
+		except OSError:
+			# Viewers disconnecting, or being too slow to take anything for the whole send timeout, is normal and not worth logging.
+			pass
+		finally:
+			with self._queueCondition:
+				self.Closed = True
+				self._queue.clear()
+
+			try:
+				self.Connection.close()
+			except OSError:
+				pass
+
+	def _EncodeDroppedReportsNotice (self, droppedCount: int) -> bytes:
+		# The notice was never logged, so it is numbered 0 to keep it from being mistaken for a real report.
+		noticeMessage = str(droppedCount) + " report(s) were not streamed because this viewer could not keep up. They can still be found in the log files."  # type: str
+
+		return self._encoder.EncodeReport(0, time.time(), int(Debug.LogLevels.Warning), Debug.LogLevels.Warning.name,
+										  This.Mod.Namespace, __name__, noticeMessage, False, None, None)
+
+class _StreamServer(threading.Thread):
+	def __init__ (self, port: int):
+		super().__init__(name = This.Mod.Namespace + ".LogStream", daemon = True)
+
+		self.Port = port  # type: int
+
+		self.StopEvent = threading.Event()  # type: threading.Event
+
+		self._clients = list()  # type: typing.List[_StreamClient]
+		self._clientsLock = threading.Lock()  # type: threading.Lock
+
+		self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # type: socket.socket
+
+		try:
+			# Allow the port to be bound again right after the game restarts, while connections from the last session are still winding down. On Windows
+			# the same option would let other programs take over the port, so exclusive use is asked for instead.
+			if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+				self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+			else:
+				self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+			self._listener.bind((StreamHost, port))
+			self._listener.listen()
+			self._listener.settimeout(AcceptTimeout)
+		except Exception:
+			# The server thread is never started if the port cannot be taken, so the listener would otherwise never be closed.
+			self._listener.close()
+			raise
+
+	def GetClients (self) -> typing.List[_StreamClient]:
+		with self._clientsLock:
+			self._clients = [client for client in self._clients if not client.Closed]
+			return list(self._clients)
+
+	def HasClients (self) -> bool:
+		# Read without the lock, this is checked before every write and a slightly stale answer only delays a new viewer's first batch.
+		return len(self._clients) != 0
+
+	def run (self) -> None:
+		try:
+			while not self.StopEvent.is_set():
+				try:
+					connection, address = self._listener.accept()  # type: socket.socket, typing.Tuple[str, int]
+				except socket.timeout:
+					continue
+
+				client = _StreamClient(connection, address)  # type: _StreamClient
+
+				with self._clientsLock:
+					self._clients = [client for client in self._clients if not client.Closed]
+					self._clients.append(client)
+
+				client.start()
+		except Exception:
+			if not self.StopEvent.is_set():
+				Debug.Log("Log stream server stopped unexpectedly.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+		finally:
+			self._listener.close()
+
+	def Stop (self) -> None:
+		self.StopEvent.set()
+		self.join()
+
+		with self._clientsLock:
+			clients = self._clients  # type: typing.List[_StreamClient]
+			self._clients = list()
+
+		for client in clients:  # type: _StreamClient
+			client.Close()
+
+def StartServer (port: int) -> None:
+	"""
+	Start accepting log viewers on a port of the loopback interface. If the server is already running, it is stopped and restarted on the new port.
+	"""
+
+	global _server
+
+	StopServer()
+
+	_server = _StreamServer(port)
+	_server.start()
+
+def StopServer () -> None:
+	"""
+	Stop accepting log viewers and disconnect every connected viewer. Reports still queued for a viewer are not sent.
+	"""
+
+	global _server
+
+	if _server is None:
+		return
+
+	_server.Stop()
+	_server = None
+
+def IsRunning () -> bool:
+	return _server is not None
+
+def HasClients () -> bool:
+	"""
+	Whether or not any log viewers are connected. Reports only need to be published when this is true.
+	"""
+
+	server = _server  # type: typing.Optional[_StreamServer]
+	return server is not None and server.HasClients()
+
+def GetClientCount () -> int:
+	server = _server  # type: typing.Optional[_StreamServer]
+	return len(server.GetClients()) if server is not None else 0
+
+def Publish (reports: typing.List[BinaryLog.BinaryReport]) -> None:
+	"""
+	Queue a batch of reports to be sent to every connected log viewer. This never waits on a viewer.
+	"""
+
+	server = _server  # type: typing.Optional[_StreamServer]
+
+	if server is None:
+		return
+
+	for client in server.GetClients():  # type: _StreamClient
+		client.Enqueue(reports)
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import collections
 import datetime
 import enum_lib
+import fnmatch
+import json
 import os
+import itertools
+import re
 import shutil
 import sys
+import threading
+import time
 import traceback
 import types
 import typing
 
 import singletons
-from NeonOcean.S4.Debug import Settings, This
+from NeonOcean.S4.Debug import BinaryLog, LogIndex, LogMaintenance, LogStream, Settings, This
 from NeonOcean.S4.Debug.Settings import Base as SettingsBase
 from NeonOcean.S4.Main import Debug, DebugShared, Language, LoadingShared, Paths, Reporting
-from NeonOcean.S4.Main.Tools import Exceptions, Parse, Patcher, Timer, Python
+from NeonOcean.S4.Main.Tools import Exceptions, Parse, Timer
 from sims4 import log
 
 _preload = True  # type: bool
@@ -22,31 +29,1179 @@ _exiting = False  # type: bool
 _loggingEnabled = None  # type: typing.Optional[bool]
 _writeChronological = None  # type: typing.Optional[bool]
 _writeGroups = None  # type: typing.Optional[bool]
+_writeBinary = None  # type: typing.Optional[bool]
 _logLevel = None  # type: typing.Optional[Debug.LogLevels]
+_logFlushLevel = None  # type: typing.Optional[Debug.LogLevels]
 _logInterval = None  # type: typing.Optional[float]
+_logFlushBudget = None  # type: typing.Optional[float]
 _logSizeLimit = None  # type: typing.Optional[float]
+_logStorageLimit = None  # type: typing.Optional[int]
+_logOverflowPolicy = None  # type: typing.Optional[str]
+_logRetentionSize = None  # type: typing.Optional[float]
+_logRetentionAge = None  # type: typing.Optional[float]
+_logRetentionCount = None  # type: typing.Optional[int]
+_logStreamEnabled = None  # type: typing.Optional[bool]
+_logStreamPort = None  # type: typing.Optional[int]
+_flightRecorderLength = None  # type: typing.Optional[int]
+_flightRecorderLevel = None  # type: typing.Optional[Debug.LogLevels]
+
+_preloadStorageLimit = 20000  # type: int
+
+_levelThreshold = sys.maxsize  # type: int  # Any report with a level above this threshold is rejected before anything else is done with it.
+_flushLevelThreshold = -sys.maxsize - 1  # type: int  # Any kept report with a level at or below this threshold is flushed immediately.
+_flightRecorderLevelThreshold = -sys.maxsize - 1  # type: int  # Any kept report with a level at or below this threshold takes the flight recorder's entries.
+
+_debugLevel = int(Debug.LogLevels.Debug)  # type: int
+_infoLevel = int(Debug.LogLevels.Info)  # type: int
+_warningLevel = int(Debug.LogLevels.Warning)  # type: int
+_errorLevel = int(Debug.LogLevels.Error)  # type: int
+_exceptionLevel = int(Debug.LogLevels.Exception)  # type: int
+
+# Calls turned away by the game's patched log functions are counted in plain integers, a counter lookup would cost more than the rest of the call.
+# These are moved into the logger's metrics whenever the metrics are asked for.
+_debugRejectedCount = 0  # type: int
+_infoRejectedCount = 0  # type: int
+_warningRejectedCount = 0  # type: int
+_errorRejectedCount = 0  # type: int
+_exceptionRejectedCount = 0  # type: int
+
+_levelRules = None  # type: typing.Optional[typing.List[_LevelRule]]
+_levelRulesFileStamp = None  # type: typing.Optional[typing.Tuple[float, int]]
+_levelRulesCheckInterval = 2  # type: float
+_ruleThresholds = dict()  # type: typing.Dict[typing.Tuple[typing.Optional[str], typing.Optional[str]], int]
+_ruleThresholdsCapacity = 4096  # type: int
+
+_flightRecorder = None  # type: typing.Optional[_FlightRecorder]
+
+_installedLogFunctions = dict()  # type: typing.Dict[typing.Tuple[typing.Any, str], typing.Callable]  # The function last set to each of the game's log functions.
+
+_templateArgTypes = frozenset(BinaryLog.TemplateArgumentTypes)  # type: typing.FrozenSet[type]
+_templateArgTypeTuples = dict()  # type: typing.Dict[typing.Tuple[type, ...], typing.Tuple[type, ...]]
+_templateArgTypeTuplesCapacity = 1024  # type: int
 
 _flushTicker = None  # type: typing.Optional[Timer.Timer]
+_levelRulesTicker = None  # type: typing.Optional[Timer.Timer]
 
 # noinspection PyTypeChecker
 _logger = None  # type: _Logger
 
+class LazyMessage:
+	"""
+	A log message that is only built if its report is kept. The template is formatted with the arguments through 'str.format' when the message
+	is first needed, rejected reports never format it.
+	"""
+
+	__slots__ = ("Template", "Args", "Kwargs")
+
+	def __init__ (self, template: str, *args, **kwargs):
+		self.Template = template  # type: str
+		self.Args = args  # type: tuple
+		self.Kwargs = kwargs  # type: dict
+
+	def __str__ (self) -> str:
+		return self.Template.format(*self.Args, **self.Kwargs)
+
+class RepeatedException(Exception):
+	"""
+	Written in place of an exception whose type, message and traceback have already been written in full for an earlier report in the same
+	chronological log. Only the exception's type and message are repeated, along with the number of the report holding the full text.
+	"""
+
+	def __init__ (self, exception: BaseException, writtenReportNumber: int):
+		super().__init__(_GetExceptionTitle(exception) + os.linesep + "The full traceback of this exception was written with report " + str(writtenReportNumber) + ".")
+
+		self.WrittenReportNumber = writtenReportNumber  # type: int
+
+class _FlightRecorder:
+	"""
+	A fixed size ring of the most recent reports of every level, including those rejected by the log level. When a severe enough report is kept, the
+	ring's entries are taken and written along with it, giving the context leading up to the report without writing every level to the log files.
+
+	Entries are plain tuples holding the unformatted message and its arguments. Nothing is formatted unless the entries end up being written, at
+	which point arguments are formatted as they are then, not as they were when the report was made.
+	"""
+
+	def __init__ (self, length: int):
+		self.Length = length  # type: int
+		self._entries = collections.deque(maxlen = length)  # type: typing.Deque[tuple]
+
+	def Record (self, level: int, group: typing.Optional[str], owner: typing.Optional[str], message: typing.Any, args: tuple) -> None:
+		self._entries.append((time.time(), level, group, owner, message, args))
+
+	def TakeEntries (self) -> typing.List[tuple]:
+		"""
+		Remove and return every entry, oldest first. Entries are popped one by one so that nothing recorded by another thread in the meantime is lost.
+		"""
+
+		takenEntries = list()  # type: typing.List[tuple]
+
+		try:
+			for _ in range(len(self._entries)):
+				takenEntries.append(self._entries.popleft())
+		except IndexError:
+			pass
+
+		return takenEntries
+
+	@staticmethod
+	def GetSectionHeader (entryCount: int) -> str:
+		return "[The " + str(entryCount) + " report(s) of any level leading up to this one]"
+
+	@staticmethod
+	def RenderEntries (entries: typing.List[tuple], renderObjects: bool = True) -> str:
+		"""
+		:param renderObjects: Whether messages and arguments other than strings and simple values may be rendered. Rendering those can run any code,
+		which must be avoided while the logger's locks are held.
+		:type renderObjects: bool
+		"""
+
+		entryLines = list()  # type: typing.List[str]
+
+		for entryTime, entryLevel, entryGroup, entryOwner, entryMessage, entryArgs in entries:  # type: float, int, typing.Optional[str], typing.Optional[str], typing.Any, tuple
+			if not renderObjects and type(entryMessage) is not str:
+				entryText = "<" + type(entryMessage).__name__ + " message, not rendered>"  # type: str
+			elif not renderObjects and not _templateArgTypes.issuperset(type(entryArg) for entryArg in entryArgs):
+				entryText = entryMessage + " <" + str(len(entryArgs)) + " argument(s), not rendered>"  # type: str
+			elif entryArgs:
+				entryText = _RenderMessage(LazyMessage(entryMessage, *entryArgs))  # type: str
+			else:
+				entryText = _RenderMessage(entryMessage)  # type: str
+
+			try:
+				entryLevelName = Debug.LogLevels(entryLevel).name  # type: str
+			except ValueError:
+				entryLevelName = str(entryLevel)  # type: str
+
+			entryLines.append(datetime.datetime.fromtimestamp(entryTime).isoformat() + " " + entryLevelName + " " + str(entryGroup) + " (" + str(entryOwner) + "): " + entryText)
+
+		return os.linesep.join(entryLines)
+
+class _ExceptionSummaryEntry:
+	__slots__ = ("ExceptionType", "Frames", "Count", "FirstNumber", "FirstTime", "FirstOwner", "LastNumber", "LastTime", "LastOwner")
+
+	def __init__ (self, exceptionType: type, frames: tuple, number: int, time: float, owner: typing.Optional[str]):
+		self.ExceptionType = exceptionType  # type: type
+		self.Frames = frames  # type: typing.Tuple[typing.Tuple[str, str, int], ...]
+		self.Count = 1  # type: int
+		self.FirstNumber = number  # type: int
+		self.FirstTime = time  # type: float
+		self.FirstOwner = owner  # type: typing.Optional[str]
+		self.LastNumber = number  # type: int
+		self.LastTime = time  # type: float
+		self.LastOwner = owner  # type: typing.Optional[str]
+
+class _ExceptionSummary:
+	"""
+	A running tally of the exceptions logged this session, grouped by signature. A signature is the exception's type along with the innermost few
+	frames of its traceback, so the same failure is grouped together no matter where it was caught or what its message says. Recording an exception
+	is a single dictionary lookup, the summary text is only built when it is written.
+	"""
+
+	SignatureFrameCount = 3  # type: int
+	Capacity = 2000  # type: int
+
+	def __init__ (self):
+		self.Changed = False  # type: bool
+
+		self._lock = threading.Lock()  # type: threading.Lock
+		self._entries = dict()  # type: typing.Dict[tuple, _ExceptionSummaryEntry]
+		self._uncountedCount = 0  # type: int
+
+	def Record (self, exception: BaseException, number: int, time: float, owner: typing.Optional[str]) -> None:
+		signatureFrames = collections.deque(maxlen = self.SignatureFrameCount)  # type: typing.Deque[typing.Tuple[str, str, int]]
+		tracebackEntry = exception.__traceback__  # type: typing.Optional[types.TracebackType]
+
+		while tracebackEntry is not None:
+			frameCode = tracebackEntry.tb_frame.f_code  # type: types.CodeType
+			signatureFrames.append((frameCode.co_filename, frameCode.co_name, tracebackEntry.tb_lineno))
+			tracebackEntry = tracebackEntry.tb_next
+
+		signature = (type(exception), tuple(signatureFrames))  # type: tuple
+
+		with self._lock:
+			entry = self._entries.get(signature, None)  # type: typing.Optional[_ExceptionSummaryEntry]
+
+			if entry is None:
+				if len(self._entries) >= self.Capacity:
+					self._uncountedCount += 1
+				else:
+					self._entries[signature] = _ExceptionSummaryEntry(signature[0], signature[1], number, time, owner)
+			else:
+				entry.Count += 1
+				entry.LastNumber = number
+				entry.LastTime = time
+				entry.LastOwner = owner
+
+			self.Changed = True
+
+	def Reset (self) -> None:
+		with self._lock:
+			self._entries = dict()
+			self._uncountedCount = 0
+			self.Changed = False
+
+	def GetText (self) -> str:
+		"""
+		Get the summary as text, with the most frequent exceptions first. This marks the summary as unchanged.
+		"""
+
+		with self._lock:
+			entries = [(entry.ExceptionType, entry.Frames, entry.Count, entry.FirstNumber, entry.FirstTime, entry.FirstOwner,
+						entry.LastNumber, entry.LastTime, entry.LastOwner) for entry in self._entries.values()]  # type: typing.List[tuple]
+
+			uncountedCount = self._uncountedCount  # type: int
+			self.Changed = False
+
+		entries.sort(key = lambda summaryEntry: summaryEntry[2], reverse = True)
+
+		summaryLines = [
+			"Exception signatures: " + str(len(entries)),
+			"Exception reports: " + str(sum(summaryEntry[2] for summaryEntry in entries) + uncountedCount)
+		]  # type: typing.List[str]
+
+		if uncountedCount != 0:
+			summaryLines.append("Reports not summarized because there were too many signatures: " + str(uncountedCount))
+
+		for exceptionType, frames, count, firstNumber, firstTime, firstOwner, lastNumber, lastTime, lastOwner in entries:  # type: type, tuple, int, int, float, typing.Optional[str], int, float, typing.Optional[str]
+			summaryLines.append("")
+			summaryLines.append(str(count) + " x " + exceptionType.__module__ + "." + exceptionType.__qualname__)
+			summaryLines.append("\tFirst: report " + str(firstNumber) + " at " + datetime.datetime.fromtimestamp(firstTime).isoformat() + ", owner " + str(firstOwner))
+			summaryLines.append("\tLast: report " + str(lastNumber) + " at " + datetime.datetime.fromtimestamp(lastTime).isoformat() + ", owner " + str(lastOwner))
+
+			if len(frames) != 0:
+				summaryLines.append("\tInnermost frames:")
+
+				for fileName, functionName, lineNumber in frames:  # type: str, str, int
+					summaryLines.append("\t\tFile \"" + fileName.replace("\\", "/") + "\", line " + str(lineNumber) + ", in " + functionName)
+			else:
+				summaryLines.append("\tThis exception was never raised, it has no traceback.")
+
+		return os.linesep.join(summaryLines) + os.linesep
+
+class _LevelRule:
+	"""
+	A log level for the reports with a matching group and owner. A pattern without wildcards matches only that exact name, a pattern ending with a
+	single '*' matches every name starting with the rest of it, and any other pattern is matched as a shell style wildcard pattern. The pattern '*'
+	matches everything, including reports without an owner.
+	"""
+
+	def __init__ (self, groupPattern: str, ownerPattern: str, level: Debug.LogLevels):
+		self.GroupPattern = groupPattern  # type: str
+		self.OwnerPattern = ownerPattern  # type: str
+		self.Level = level  # type: Debug.LogLevels
+
+		self._groupMatcher = self._CompilePattern(groupPattern)  # type: typing.Callable[[typing.Optional[str]], bool]
+		self._ownerMatcher = self._CompilePattern(ownerPattern)  # type: typing.Callable[[typing.Optional[str]], bool]
+
+	def Matches (self, group: typing.Optional[str], owner: typing.Optional[str]) -> bool:
+		return self._groupMatcher(group) and self._ownerMatcher(owner)
+
+	@staticmethod
+	def _CompilePattern (pattern: str) -> typing.Callable[[typing.Optional[str]], bool]:
+		if pattern == "*":
+			return lambda value: True
+
+		wildcardCharacters = ("*", "?", "[")  # type: typing.Tuple[str, ...]
+
+		if not any(wildcardCharacter in pattern for wildcardCharacter in wildcardCharacters):
+			return lambda value: value == pattern
+
+		if pattern.endswith("*") and not any(wildcardCharacter in pattern[:-1] for wildcardCharacter in wildcardCharacters):
+			prefix = pattern[:-1]  # type: str
+			return lambda value: value is not None and value.startswith(prefix)
+
+		compiledPattern = re.compile(fnmatch.translate(pattern))  # type: typing.Pattern
+		return lambda value: value is not None and compiledPattern.match(value) is not None
+
+class _StackCapture:
+	"""
+	A cheap snapshot of a call stack, consisting only of code objects and line numbers. The snapshot is formatted into text only once it is actually needed.
+	"""
+
+	__slots__ = ("_frames", "_text", "WrittenReportNumber", "WrittenDirectoryName")
+
+	def __init__ (self, frames: typing.Tuple[typing.Tuple[types.CodeType, int], ...]):
+		self._frames = frames  # type: typing.Tuple[typing.Tuple[types.CodeType, int], ...]
+		self._text = None  # type: typing.Optional[str]
+
+		self.WrittenReportNumber = None  # type: typing.Optional[int]
+		self.WrittenDirectoryName = None  # type: typing.Optional[str]
+
+	@staticmethod
+	def CaptureFrames (frame: types.FrameType) -> typing.Tuple[typing.Tuple[types.CodeType, int], ...]:
+		"""
+		Get the code objects and line numbers of a frame and all frames below it, from the outermost frame to the innermost frame.
+		"""
+
+		frames = list()  # type: typing.List[typing.Tuple[types.CodeType, int]]
+
+		while frame is not None:
+			frames.append((frame.f_code, frame.f_lineno))
+			frame = frame.f_back
+
+		frames.reverse()
+		return tuple(frames)
+
+	@property
+	def Frames (self) -> typing.Tuple[typing.Tuple[types.CodeType, int], ...]:
+		"""
+		The captured frames' code objects and line numbers, from the outermost frame to the innermost frame.
+		"""
+
+		return self._frames
+
+	def Format (self) -> str:
+		"""
+		Format the captured stack into the same text that 'traceback.format_stack' would have produced. The text is only created once.
+		"""
+
+		if self._text is None:
+			stackSummary = traceback.StackSummary.from_list([(frameCode.co_filename, frameLineNumber, frameCode.co_name, None) for frameCode, frameLineNumber in self._frames])  # type: traceback.StackSummary
+			self._text = str.join("", stackSummary.format())
+
+		return self._text
+
+class _StackCache:
+	"""
+	A least recently used cache of stack captures, keyed by their frames. Reports logged from the same call site share a single capture, along
+	with its formatted text.
+	"""
+
+	def __init__ (self, capacity: int):
+		self.Capacity = capacity  # type: int
+
+		self._stacks = collections.OrderedDict()  # type: typing.Dict[typing.Tuple[typing.Tuple[types.CodeType, int], ...], _StackCapture]
+
+	def Intern (self, frames: typing.Tuple[typing.Tuple[types.CodeType, int], ...]) -> _StackCapture:
+		stack = self._stacks.get(frames, None)  # type: typing.Optional[_StackCapture]
+
+		if stack is not None:
+			self._stacks.move_to_end(frames)
+			return stack
+
+		stack = _StackCapture(frames)
+		self._stacks[frames] = stack
+
+		if len(self._stacks) > self.Capacity:
+			self._stacks.popitem(last = False)
+
+		return stack
+
+class _PendingReport:
+	"""
+	A report that has been logged but not yet written. The real report object, along with its stack trace text, is created only when the report is about to be written.
+	If the report was given message arguments, its message is kept as a template and is only formatted the first time the message is needed.
+
+	Any number of these can be waiting in the buffer at once, so the class has slots instead of an instance dictionary, and the level, group, owner,
+	template and stack of a report are shared with every other report that has the same ones.
+	"""
+
+	__slots__ = ("LogNumber", "LogTime", "Template", "MessageArgs", "Level", "Group", "Owner", "Exception", "LogStack", "Stack", "RetryOnError",
+				 "RepeatCount", "LastLogNumber", "LastLogTime", "Fingerprint", "Dropped", "FlightRecord", "_flightRecordText", "ExceptionReference",
+				 "_message")
+
+	def __init__ (self, logNumber: int, logTime: float, message: str, level: Debug.LogLevels, group: str, owner: typing.Optional[str],
+				  exception: typing.Optional[BaseException], logStack: bool, stack: _StackCapture, messageArgs: typing.Optional[tuple] = None):
+		self.LogNumber = logNumber  # type: int
+		self.LogTime = logTime  # type: float
+		self.Template = message  # type: str  # The message, or the template it is formatted from if there are message arguments.
+		self.MessageArgs = messageArgs  # type: typing.Optional[tuple]
+		self.Level = level  # type: Debug.LogLevels
+		self.Group = group  # type: str
+		self.Owner = owner  # type: typing.Optional[str]
+		self.Exception = exception  # type: typing.Optional[BaseException]
+		self.LogStack = logStack  # type: bool
+		self.Stack = stack  # type: _StackCapture
+
+		self.RetryOnError = True  # type: bool
+
+		self.RepeatCount = 0  # type: int
+		self.LastLogNumber = logNumber  # type: int
+		self.LastLogTime = logTime  # type: float
+
+		self.Fingerprint = None  # type: typing.Optional[tuple]
+		self.Dropped = False  # type: bool
+
+		self.FlightRecord = None  # type: typing.Optional[typing.List[tuple]]
+		self._flightRecordText = None  # type: typing.Optional[str]
+
+		self.ExceptionReference = None  # type: typing.Optional[int]  # The number of an earlier report this report's exception was written in full with.
+
+		self._message = message if messageArgs is None else None  # type: typing.Optional[str]
+
+	@property
+	def Message (self) -> str:
+		if self._message is None:
+			self._message = BinaryLog.FormatTemplate(self.Template, self.MessageArgs)
+
+		return self._message
+
+	def GetMessage (self) -> str:
+		"""
+		Get this report's message, including a note on how many identical reports have been collapsed into this one and the flight recorder entries
+		leading up to it.
+		"""
+
+		message = self.Message  # type: str
+
+		if self.RepeatCount != 0:
+			message += os.linesep + os.linesep + \
+					   "[This report was repeated " + str(self.RepeatCount) + " more time(s), the last repeat was report " + str(self.LastLogNumber) + \
+					   " at " + datetime.datetime.fromtimestamp(self.LastLogTime).isoformat() + "]"
+
+		if self.FlightRecord:
+			if self._flightRecordText is None:
+				self._flightRecordText = _FlightRecorder.RenderEntries(self.FlightRecord)
+
+			message += os.linesep + os.linesep + _FlightRecorder.GetSectionHeader(len(self.FlightRecord)) + os.linesep + self._flightRecordText
+
+		return message
+
+	def GetExceptionText (self) -> typing.Optional[str]:
+		if self.Exception is None:
+			return None
+
+		return str.join("", traceback.format_exception(type(self.Exception), self.Exception, self.Exception.__traceback__))
+
+	def GetWrittenException (self) -> typing.Optional[BaseException]:
+		"""
+		Get the exception to be written with this report, this is a short reference if the same exception has already been written in full.
+		"""
+
+		if self.Exception is None or self.ExceptionReference is None:
+			return self.Exception
+
+		return RepeatedException(self.Exception, self.ExceptionReference)
+
+	def GetWrittenExceptionText (self) -> typing.Optional[str]:
+		writtenException = self.GetWrittenException()  # type: typing.Optional[BaseException]
+
+		if isinstance(writtenException, RepeatedException):
+			return type(writtenException).__name__ + ": " + str(writtenException) + os.linesep
+
+		return self.GetExceptionText()
+
+	def EncodeBinary (self, binaryLogEncoder: BinaryLog.BinaryLogEncoder, stacktrace: str) -> bytes:
+		if self.MessageArgs is not None and self.RepeatCount == 0 and not self.FlightRecord:
+			# Nothing is added to the message, so the template and its arguments can be written as they are and formatted by whatever reads the log.
+			return binaryLogEncoder.EncodeReport(self.LogNumber, self.LogTime, int(self.Level), self.Level.name, self.Group, self.Owner,
+												 self.Template, self.LogStack, self.GetWrittenExceptionText(), stacktrace if self.LogStack else None,
+												 templateArgs = self.MessageArgs)
+
+		return binaryLogEncoder.EncodeReport(self.LogNumber, self.LogTime, int(self.Level), self.Level.name, self.Group, self.Owner,
+											 self.GetMessage(), self.LogStack, self.GetWrittenExceptionText(), stacktrace if self.LogStack else None)
+
+	def CreateBinaryReport (self) -> BinaryLog.BinaryReport:
+		# Streamed reports always carry their full stack trace, a viewer may have connected after the report with the same stack was sent.
+		return BinaryLog.BinaryReport(self.LogNumber, self.LogTime, int(self.Level), self.Level.name, self.Group, self.Owner,
+									  self.GetMessage(), self.LogStack, self.GetExceptionText(), self.Stack.Format() if self.LogStack else None)
+
+	def CreateReport (self, stacktrace: str) -> DebugShared.Report:
+		return DebugShared.Report(None, self.LogNumber, datetime.datetime.fromtimestamp(self.LogTime).isoformat(),
+								  self.GetMessage(), level = self.Level, group = self.Group,
+								  owner = self.Owner, exception = self.GetWrittenException(), logStack = self.LogStack,
+								  stacktrace = stacktrace)
+
+class _FlushedReport:
+	"""
+	Stands in for a report in the logger's fingerprints once the report has been flushed, so that later repeats of it are still collapsed. Only what
+	is needed to write a notice of the repeats is kept, the exception, stack and flight record of the report are left to be freed once it is written.
+	"""
+
+	__slots__ = ("LogNumber", "Template", "MessageArgs", "Level", "Group", "Owner", "RepeatCount", "LastLogNumber", "LastLogTime")
+
+	def __init__ (self, report: _PendingReport):
+		self.LogNumber = report.LogNumber  # type: int
+		self.Template = report.Template  # type: str
+		self.MessageArgs = report.MessageArgs  # type: typing.Optional[tuple]
+		self.Level = report.Level  # type: Debug.LogLevels
+		self.Group = report.Group  # type: str
+		self.Owner = report.Owner  # type: typing.Optional[str]
+
+		self.RepeatCount = 0  # type: int  # Repeats since the last notice of them was flushed.
+		self.LastLogNumber = report.LogNumber  # type: int
+		self.LastLogTime = report.LogTime  # type: float
+
+class _ReportSerializer:
+	"""
+	Collects serialized reports for each log file they will be written to. The collected bytes are kept as lists of chunks and are only joined
+	together once per file, rather than being concatenated for every report.
+	"""
+
+	def __init__ (self, separatorBytes: bytes):
+		self._separatorBytes = separatorBytes  # type: bytes
+
+		self._chronologicalChunks = list()  # type: typing.List[bytes]
+		self._chronologicalKeys = list()  # type: typing.List[typing.Tuple[int, str, str]]
+		self._groupsChunks = dict()  # type: typing.Dict[str, typing.List[bytes]]
+
+	def AddReport (self, reportTextBytes: bytes, group: str, writeChronological: bool, writeGroups: bool,
+				   number: int = 0, levelName: str = "") -> None:
+		if writeChronological:
+			self._chronologicalChunks.append(reportTextBytes)
+			self._chronologicalKeys.append((number, levelName, group))
+
+		if writeGroups:
+			groupChunks = self._groupsChunks.get(group, None)  # type: typing.Optional[typing.List[bytes]]
+
+			if groupChunks is None:
+				self._groupsChunks[group] = [reportTextBytes]
+			else:
+				groupChunks.append(reportTextBytes)
+
+	def GetChronologicalBytes (self) -> bytes:
+		return self._separatorBytes.join(self._chronologicalChunks)
+
+	def GetChronologicalIndexText (self, textOffset: int) -> str:
+		"""
+		Get the index lines for the chronological reports, given the offset in the log file that the chronological bytes were written to.
+		"""
+
+		indexLines = list()  # type: typing.List[str]
+		reportOffset = textOffset  # type: int
+
+		for (reportNumber, reportLevelName, reportGroup), reportChunk in zip(self._chronologicalKeys, self._chronologicalChunks):  # type: typing.Tuple[int, str, str], bytes
+			indexLines.append(LogIndex.FormatEntry(reportNumber, reportLevelName, reportGroup, reportOffset, len(reportChunk)))
+			reportOffset += len(reportChunk) + len(self._separatorBytes)
+
+		return str.join("", indexLines)
+
+	def GetGroupsBytes (self) -> typing.Dict[str, bytes]:
+		groupsBytes = dict()  # type: typing.Dict[str, bytes]
+
+		for group, groupChunks in self._groupsChunks.items():  # type: str, typing.List[bytes]
+			groupsBytes[group] = self._separatorBytes.join(groupChunks)
+
+		return groupsBytes
+
+class _ReportReferences:
+	"""
+	Decides which stack traces and exceptions in a buffer of reports are written as a reference to an earlier report of the chronological log, rather
+	than in full. A report only becomes the target of references once it has been serialized, and only stays one past the buffer once the
+	chronological log has actually been written. Group logs are always written in full, as the referenced reports are not in them.
+
+	Reports are prepared then serialized one at a time, in the order they are written.
+	"""
+
+	def __init__ (self, writtenExceptions: typing.Dict[tuple, int], writtenExceptionsCapacity: int, directoryName: str):
+		self.PreparedReference = False  # type: bool  # Whether the last prepared report refers to another report for its stack trace or exception.
+
+		self._writtenExceptions = writtenExceptions  # type: typing.Dict[tuple, int]
+		self._writtenExceptionsCapacity = writtenExceptionsCapacity  # type: int
+		self._directoryName = directoryName  # type: str
+
+		self._pendingStacks = dict()  # type: typing.Dict[_StackCapture, int]
+		self._pendingExceptions = dict()  # type: typing.Dict[tuple, int]
+
+		self._preparedNumber = None  # type: typing.Optional[int]
+		self._preparedStack = None  # type: typing.Optional[_StackCapture]
+		self._preparedExceptionKey = None  # type: typing.Optional[tuple]
+
+	def Prepare (self, report: _PendingReport) -> str:
+		"""
+		Set the exception reference of a report for the chronological log, and get the stack trace text to write with it there.
+		"""
+
+		self.PreparedReference = False
+		self._preparedNumber = report.LogNumber
+		self._preparedStack = None
+		self._preparedExceptionKey = None
+
+		report.ExceptionReference = None
+
+		if report.Exception is not None:
+			exceptionKey = _GetExceptionKey(report.Exception)  # type: tuple
+			writtenReportNumber = self._writtenExceptions.get(exceptionKey, None) or self._pendingExceptions.get(exceptionKey, None)  # type: typing.Optional[int]
+
+			if writtenReportNumber is not None and writtenReportNumber != report.LogNumber:
+				report.ExceptionReference = writtenReportNumber
+				self.PreparedReference = True
+			else:
+				self._preparedExceptionKey = exceptionKey
+
+		if not report.LogStack:
+			return ""
+
+		stack = report.Stack  # type: _StackCapture
+
+		if stack.WrittenReportNumber is not None and stack.WrittenDirectoryName == self._directoryName:
+			writtenReportNumber = stack.WrittenReportNumber  # type: typing.Optional[int]
+		else:
+			writtenReportNumber = self._pendingStacks.get(stack, None)  # type: typing.Optional[int]
+
+		if writtenReportNumber is not None and writtenReportNumber != report.LogNumber:
+			self.PreparedReference = True
+			return "Same stack trace as report " + str(writtenReportNumber) + "." + os.linesep
+
+		self._preparedStack = stack
+		return stack.Format()
+
+	def Serialized (self) -> None:
+		"""
+		Let later reports in the buffer refer to the last prepared report, now that it has been serialized for the chronological log.
+		"""
+
+		if self._preparedStack is not None:
+			self._pendingStacks.setdefault(self._preparedStack, self._preparedNumber)
+
+		if self._preparedExceptionKey is not None:
+			self._pendingExceptions.setdefault(self._preparedExceptionKey, self._preparedNumber)
+
+	def Commit (self) -> None:
+		"""
+		Let reports in later buffers refer to the serialized reports of this buffer. This should only be done once the chronological log is written.
+		"""
+
+		for stack, reportNumber in self._pendingStacks.items():  # type: _StackCapture, int
+			stack.WrittenReportNumber = reportNumber
+			stack.WrittenDirectoryName = self._directoryName
+
+		for exceptionKey, reportNumber in self._pendingExceptions.items():  # type: tuple, int
+			if len(self._writtenExceptions) >= self._writtenExceptionsCapacity:
+				break
+
+			self._writtenExceptions.setdefault(exceptionKey, reportNumber)
+
+class LoggerMetrics:
+	"""
+	Running counts of what the logger has been doing. Counters outside of the logger's locks are updated without locking, under heavy contention a
+	few increments may be lost, which is an acceptable price for keeping them on permanently.
+	"""
+
+	RecentSampleCount = 256  # type: int
+	TemplateCountsCapacity = 1000  # type: int
+
+	def __init__ (self, loggingRootPath: str):
+		self.LoggingRootPath = loggingRootPath  # type: str
+
+		self.KeptLevels = collections.Counter()  # type: typing.Counter[int]
+		self.KeptGroups = collections.Counter()  # type: typing.Counter[str]
+		self.RejectedLevels = collections.Counter()  # type: typing.Counter[int]
+		self.RejectedGroups = collections.Counter()  # type: typing.Counter[str]  # Calls turned away by the game's patched log functions before a rule is checked are only counted by level.
+		self.CollapsedCount = 0  # type: int
+
+		self.FlushCount = 0  # type: int
+		self.FlushSizes = collections.deque(maxlen = self.RecentSampleCount)  # type: typing.Deque[int]
+
+		self.WriteCount = 0  # type: int
+		self.WriteDurations = collections.deque(maxlen = self.RecentSampleCount)  # type: typing.Deque[float]
+		self.WrittenCount = 0  # type: int
+		self.FilteredCount = 0  # type: int
+		self.WrittenLengths = collections.Counter()  # type: typing.Counter[str]
+		self.TemplateCounts = collections.Counter()  # type: typing.Counter[str]
+
+	def RecordFileWrite (self, filePath: str, writtenLength: int) -> None:
+		"""
+		Count bytes written to a file. Files are told apart by their path relative to the logging root, many files in different session directories
+		share the same name.
+		"""
+
+		try:
+			fileKey = os.path.relpath(filePath, self.LoggingRootPath)  # type: str
+		except ValueError:
+			# The file is on a different drive than the logging root.
+			fileKey = filePath  # type: str
+
+		self.WrittenLengths[fileKey] += writtenLength
+
+	def RecordTemplate (self, template: str, reportCount: int) -> None:
+		"""
+		Count written reports by their message template. Once the capacity is reached only templates already being counted are counted further.
+		"""
+
+		if template in self.TemplateCounts or len(self.TemplateCounts) < self.TemplateCountsCapacity:
+			self.TemplateCounts[template] += reportCount
+
+class _PooledLogFile:
+	"""
+	A log file kept open for appending. The offset of the file's end tag is tracked in memory, so nothing needs to be read from the disk before writing.
+	"""
+
+	def __init__ (self, file: typing.BinaryIO, endOffset: int):
+		self.File = file  # type: typing.BinaryIO
+		self.EndOffset = endOffset  # type: int
+
+	def Write (self, textParts: typing.Sequence[bytes], endBytes: bytes) -> int:
+		"""
+		Write text over the end of the file, starting at the tracked end tag offset, then write the new end tag after it.
+		:return: The number of bytes the file grew by.
+		:rtype: int
+		"""
+
+		self.File.seek(self.EndOffset)
+
+		startOffset = self.EndOffset  # type: int
+
+		for textPart in textParts:  # type: bytes
+			self.File.write(textPart)
+			self.EndOffset += len(textPart)
+
+		self.File.write(endBytes)
+		self.File.flush()
+
+		return self.EndOffset - startOffset
+
+	def Close (self) -> None:
+		self.File.close()
+
+class _LogFilePool:
+	"""
+	A least recently used pool of open log files. When the pool is full, the least recently written file is closed to make room.
+	"""
+
+	def __init__ (self, capacity: int):
+		self.Capacity = capacity  # type: int
+
+		self._files = collections.OrderedDict()  # type: typing.Dict[str, _PooledLogFile]
+
+	def Get (self, filePath: str) -> typing.Optional[_PooledLogFile]:
+		pooledFile = self._files.get(filePath, None)  # type: typing.Optional[_PooledLogFile]
+
+		if pooledFile is not None:
+			self._files.move_to_end(filePath)
+
+		return pooledFile
+
+	def Open (self, filePath: str, create: bool = False, endLength: int = 0) -> _PooledLogFile:
+		"""
+		Open a file and add it to the pool.
+		:param filePath: The path of the file to be opened.
+		:type filePath: str
+		:param create: Whether the file should be created, or replaced if it already exists.
+		:type create: bool
+		:param endLength: The length of the end tag at the end of an existing file.
+		:type endLength: int
+		"""
+
+		self.Close(filePath)
+
+		if create:
+			file = open(filePath, mode = "wb+")
+			endOffset = 0  # type: int
+		else:
+			file = open(filePath, mode = "r+b")
+			endOffset = file.seek(0, os.SEEK_END) - endLength  # type: int
+
+		pooledFile = _PooledLogFile(file, endOffset)  # type: _PooledLogFile
+		self._files[filePath] = pooledFile
+
+		while len(self._files) > self.Capacity:
+			_, evictedFile = self._files.popitem(last = False)  # type: str, _PooledLogFile
+			evictedFile.Close()
+
+		return pooledFile
+
+	def Close (self, filePath: str) -> None:
+		pooledFile = self._files.pop(filePath, None)  # type: typing.Optional[_PooledLogFile]
+
+		if pooledFile is not None:
+			pooledFile.Close()
+
+	def CloseAll (self) -> None:
+		for pooledFile in self._files.values():  # type: _PooledLogFile
+			try:
+				pooledFile.Close()
+			except Exception:
+				pass
+
+		self._files.clear()
+
+class _CrashJournal:
+	"""
+	An append only file receiving a raw record of every report as soon as it is logged, followed by checkpoints once reports have been written to the
+	real log files. Records are written straight to the operating system, so they survive the game crashing. The journal is deleted when the game
+	closes normally. If one is left over at the next start, the reports after its last checkpoint are recovered from it.
+
+	Once the journal grows past its rotation length, it is replaced at the next checkpoint by a new journal holding only the reports not yet written,
+	so that it does not keep growing for the whole session.
+	"""
+
+	RotationLength = 4000000  # type: int
+
+	def __init__ (self, filePath: str):
+		self.FilePath = filePath  # type: str
+		self.SkippedCount = 0  # type: int
+
+		self._lock = threading.Lock()  # type: threading.Lock
+		self._encoder = BinaryLog.BinaryLogEncoder()  # type: BinaryLog.BinaryLogEncoder
+		self._unwrittenReports = collections.deque()  # type: typing.Deque[_PendingReport]
+		self._reportedSkippedCount = 0  # type: int
+		self._file = open(filePath, mode = "wb", buffering = 0)  # type: typing.Optional[typing.BinaryIO]
+		self._length = self._file.write(BinaryLog.BinaryLogEncoder.GetFileHeader())  # type: int
+
+	def Append (self, report: _PendingReport) -> None:
+		"""
+		Add a report to the journal. Reports must be appended in the order of their numbers. This is called while the logger's storage lock is held, so
+		nothing here may log.
+		"""
+
+		with self._lock:
+			if self._file is None:
+				return
+
+			try:
+				recordBytes = self._EncodeReport(self._encoder, report)  # type: bytes
+			except Exception:
+				# A report that cannot be encoded is only left out of the journal, the encoder is unaffected and the journal stays usable.
+				self.SkippedCount += 1
+				return
+
+			try:
+				self._length += self._file.write(recordBytes)
+			except Exception:
+				self._Abandon()
+				return
+
+			self._unwrittenReports.append(report)
+
+	def Checkpoint (self, number: int) -> int:
+		"""
+		Mark every report up to and including a number as written. This may be called while the logger's storage lock is held, so nothing here may
+		log.
+
+		:return: The number of reports that could not be added to the journal since the last checkpoint. The caller should warn about these once it
+		no longer holds any of the logger's locks that logging would need.
+		:rtype: int
+		"""
+
+		with self._lock:
+			if self._file is None:
+				return 0
+
+			while len(self._unwrittenReports) != 0 and self._unwrittenReports[0].LogNumber <= number:
+				self._unwrittenReports.popleft()
+
+			try:
+				if self._length >= self.RotationLength:
+					self._Rotate()
+				else:
+					self._length += self._file.write(BinaryLog.BinaryLogEncoder.EncodeCheckpoint(number))
+			except Exception:
+				self._Abandon()
+
+			skippedCount = self.SkippedCount - self._reportedSkippedCount  # type: int
+			self._reportedSkippedCount = self.SkippedCount
+
+		return skippedCount
+
+	def Close (self) -> None:
+		"""
+		Close and delete the journal. This should only be done once every report in it has been written.
+		"""
+
+		with self._lock:
+			if self._file is None:
+				return
+
+			self._file.close()
+			self._file = None
+			self._unwrittenReports.clear()
+
+		os.remove(self.FilePath)
+
+	def _Rotate (self) -> None:
+		"""
+		Replace the journal with a new one holding only the reports that have not been written yet. The new journal is written next to the old one,
+		then moved over it, so a complete journal exists at all times.
+		"""
+
+		rotatingFilePath = self.FilePath + ".tmp"  # type: str
+		rotatingEncoder = BinaryLog.BinaryLogEncoder()  # type: BinaryLog.BinaryLogEncoder
+
+		with open(rotatingFilePath, mode = "wb") as rotatingFile:
+			rotatingLength = rotatingFile.write(BinaryLog.BinaryLogEncoder.GetFileHeader())  # type: int
+
+			for unwrittenReport in self._unwrittenReports:  # type: _PendingReport
+				try:
+					recordBytes = self._EncodeReport(rotatingEncoder, unwrittenReport)  # type: bytes
+				except Exception:
+					self.SkippedCount += 1
+					continue
+
+				rotatingLength += rotatingFile.write(recordBytes)
+
+		self._file.close()
+
+		try:
+			os.replace(rotatingFilePath, self.FilePath)
+		except Exception:
+			# The old journal is still complete, it is kept on with if the new one cannot take its place.
+			self._file = open(self.FilePath, mode = "ab", buffering = 0)
+			os.remove(rotatingFilePath)
+			return
+
+		self._file = open(self.FilePath, mode = "ab", buffering = 0)
+		self._encoder = rotatingEncoder
+		self._length = rotatingLength
+
+	def _Abandon (self) -> None:
+		# Reports are logged from anywhere, a journal that cannot be written to is given up on silently rather than raising to the caller.
+		try:
+			self._file.close()
+		except Exception:
+			pass
+
+		self._file = None
+		self._unwrittenReports.clear()
+
+	@staticmethod
+	def _EncodeReport (encoder: BinaryLog.BinaryLogEncoder, report: _PendingReport) -> bytes:
+		if report.Exception is not None:
+			exceptionText = _GetExceptionTitle(report.Exception)  # type: typing.Optional[str]
+		else:
+			exceptionText = None  # type: typing.Optional[str]
+
+		if report.FlightRecord:
+			# The journal is written to while the storage lock is held, so only the flight record entries that can be rendered without running other
+			# code are rendered here.
+			message = report.Message + os.linesep + os.linesep + _FlightRecorder.GetSectionHeader(len(report.FlightRecord)) + os.linesep + \
+					  _FlightRecorder.RenderEntries(report.FlightRecord, renderObjects = False)  # type: str
+
+			return encoder.EncodeReport(report.LogNumber, report.LogTime, int(report.Level), report.Level.name, report.Group, report.Owner,
+										message, False, exceptionText, None)
+
+		return encoder.EncodeReport(report.LogNumber, report.LogTime, int(report.Level), report.Level.name, report.Group, report.Owner,
+									report.Template, False, exceptionText, None, templateArgs = report.MessageArgs)
+
+class _FlushScheduler:
+	"""
+	Decides how long the flush ticker waits between flushes. The interval starts out as the log interval setting, backs off while there is nothing
+	to flush, and shrinks when writing a flushed buffer takes longer than the flush budget, so that buffers stay small enough to be written in time.
+	Backing off never takes the interval past a fixed limit, or past the log interval if that is longer, because a report stored while the ticker
+	waits is not written until the wait ends.
+	"""
+
+	MinimumIntervalFactor = 0.125  # type: float
+	MaximumIntervalFactor = 4  # type: float
+	MinimumInterval = 0.05  # type: float
+	MaximumBackoffInterval = 60  # type: float
+
+	def __init__ (self):
+		self.BaseInterval = 0  # type: float
+		self.Budget = 0  # type: float
+		self.EffectiveInterval = 0  # type: float
+		self.LastWriteDuration = 0  # type: float
+
+		self._lock = threading.Lock()  # type: threading.Lock
+
+	def Reset (self, baseInterval: float, budget: float) -> None:
+		with self._lock:
+			self.BaseInterval = baseInterval
+			self.Budget = budget
+			self.EffectiveInterval = baseInterval
+
+	def RecordIdleTick (self) -> None:
+		with self._lock:
+			backoffLimit = max(self.BaseInterval, min(self.BaseInterval * self.MaximumIntervalFactor, self.MaximumBackoffInterval))  # type: float
+			self.EffectiveInterval = min(self.EffectiveInterval * 2, backoffLimit)
+
+	def RecordActivity (self) -> None:
+		"""
+		Drop any idle backoff once a report is stored into an empty buffer, so the ticker's next wait is no longer than the log interval. This is
+		called while the logger's storage lock is held.
+		"""
+
+		with self._lock:
+			self.EffectiveInterval = min(self.EffectiveInterval, self.BaseInterval)
+
+	def RecordActiveTick (self) -> None:
+		with self._lock:
+			self.EffectiveInterval = min(self.EffectiveInterval, self.BaseInterval)
+
+	def RecordWriteDuration (self, duration: float) -> None:
+		with self._lock:
+			self.LastWriteDuration = duration
+
+			if self.BaseInterval == 0:
+				return
+
+			if duration > self.Budget:
+				self.EffectiveInterval = max(self.EffectiveInterval / 2, self.BaseInterval * self.MinimumIntervalFactor, self.MinimumInterval)
+			elif duration < self.Budget / 4 and self.EffectiveInterval < self.BaseInterval:
+				self.EffectiveInterval = min(self.EffectiveInterval * 2, self.BaseInterval)
+
+class _LogWriter(threading.Thread):
+	"""
+	A thread dedicated to writing reports to the log files. Flushing only hands a filled report buffer over to this thread, so file operations
+	never hold up the thread that logged the reports.
+	"""
+
+	def __init__ (self, logger: _Logger):
+		super().__init__(name = This.Mod.Namespace + ".LogWriter", daemon = True)
+
+		self._logger = logger  # type: _Logger
+
+		self._condition = threading.Condition()  # type: threading.Condition
+		self._pendingBuffers = list()  # type: typing.List[typing.List[_PendingReport]]
+		self._writing = False  # type: bool
+		self._flushRequested = False  # type: bool
+		self._stopping = False  # type: bool
+
+	def Submit (self, reports: typing.List[_PendingReport]) -> None:
+		"""
+		Queue a buffer of reports to be written. The buffer must no longer be modified by the caller.
+		"""
+
+		with self._condition:
+			self._pendingBuffers.append(reports)
+			self._condition.notify_all()
+
+	def RequestFlush (self) -> bool:
+		"""
+		Ask for the logger to be flushed once the buffer being written is done. Reports that need to be written right away are flushed by this thread
+		while it is busy, so that a burst of them is written as one buffer rather than a buffer each.
+
+		:return: Whether the request was taken. If false, this thread is idle and the caller should flush the logger itself.
+		:rtype: bool
+		"""
+
+		with self._condition:
+			if not self._writing and len(self._pendingBuffers) == 0:
+				return False
+
+			self._flushRequested = True
+			return True
+
+	def Drain (self) -> None:
+		"""
+		Wait until every report submitted to this writer has been written.
+		"""
+
+		with self._condition:
+			while len(self._pendingBuffers) != 0 or self._writing:
+				self._condition.wait()
+
+	def Stop (self) -> None:
+		"""
+		Write all remaining reports, then stop this thread.
+		"""
+
+		with self._condition:
+			self._stopping = True
+			self._condition.notify_all()
+
+		self.join()
+
+	def run (self) -> None:
+		while True:
+			with self._condition:
+				while len(self._pendingBuffers) == 0 and not self._stopping:
+					self._condition.wait()
+
+				if len(self._pendingBuffers) == 0:
+					return
+
+				pendingBuffers = self._pendingBuffers  # type: typing.List[typing.List[_PendingReport]]
+				self._pendingBuffers = list()
+				self._writing = True
+
+			try:
+				self._logger._WriteReports(list(itertools.chain.from_iterable(pendingBuffers)))
+			except Exception:
+				Debug.Log("Failed to write a buffer of reports.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+			finally:
+				self._FinishWriting()
+
+	def _FinishWriting (self) -> None:
+		# The writing flag is only cleared once no flush has been requested, a request made in the meantime is then either seen here or refused.
+		while True:
+			with self._condition:
+				if not self._flushRequested:
+					self._writing = False
+					self._condition.notify_all()
+					return
+
+				self._flushRequested = False
+
+			try:
+				self._logger.Flush()
+			except Exception:
+				Debug.Log("Failed to flush requested reports.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
 class _Logger(DebugShared.Logger):
 	WriteFailureNotificationTitle = Language.String(This.Mod.Namespace + ".Write_Failure_Notification.Title")
 	WriteFailureNotificationText = Language.String(This.Mod.Namespace + ".Write_Failure_Notification.Text")
 
+	LogFilePoolCapacity = 32  # type: int
+	StackCacheCapacity = 512  # type: int
+
+	JournalFileExtension = ".journal"  # type: str
+	WrittenExceptionsCapacity = 20000  # type: int
+
+	ReportFingerprintsCapacity = 20000  # type: int
+
+	FlushHighWaterCount = 5000  # type: int
+	FlushHighWaterLength = 2000000  # type: int
+
+	StorageCompactionFraction = 0.125  # type: float
+	StorageCompactionMinimum = 8  # type: int
+
 	def __init__ (self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 
 		self.LogCount = 0
+		self.DroppedReportCount = 0  # type: int
+		self.Metrics = LoggerMetrics(self.GetLoggingRootPath())  # type: LoggerMetrics
+		self.ExceptionSummary = _ExceptionSummary()  # type: _ExceptionSummary
+
+		self._storageLock = threading.Lock()  # type: threading.Lock
+		self._reportFingerprints = collections.OrderedDict()  # type: typing.OrderedDict[tuple, typing.Union[_PendingReport, _FlushedReport]]  # Kept across flushes, the least recently logged are forgotten first.
+		self._flushedRepeats = list()  # type: typing.List[_FlushedReport]  # Flushed reports that have been repeated since, in the order of their first new repeat.
+		self._storedReportCount = 0  # type: int
+		self._storedMessageLength = 0  # type: int
+		self._droppedStoredCount = 0  # type: int
+		self._oldestStoredIndex = 0  # type: int
+		self._levelStorage = dict()  # type: typing.Dict[int, typing.Deque[_PendingReport]]
+		self._bufferDroppedCount = 0  # type: int
+		self._bufferDroppedLevel = None  # type: typing.Optional[Debug.LogLevels]
+		self._flushScheduler = _FlushScheduler()  # type: _FlushScheduler
+		self._stackCache = _StackCache(self.StackCacheCapacity)  # type: _StackCache
+		self._writeLock = threading.RLock()  # type: threading.RLock
+		self._writer = None  # type: typing.Optional[_LogWriter]
+
+		self._filePool = _LogFilePool(self.LogFilePoolCapacity)  # type: _LogFilePool
+		self._preparedLoggingDirectory = None  # type: typing.Optional[str]
+		self._preparedGroupsDirectory = None  # type: typing.Optional[str]
+
+		self._binaryLogEncoder = None  # type: typing.Optional[BinaryLog.BinaryLogEncoder]
+		self._binaryLogFilePath = None  # type: typing.Optional[str]
+
+		self._writtenExceptions = dict()  # type: typing.Dict[tuple, int]
+		self._writtenExceptionsDirectoryName = None  # type: typing.Optional[str]
+
+		self._journal = None  # type: typing.Optional[_CrashJournal]
 
 	def Log (self, message, level: Debug.LogLevels, group: str = None,
 			 owner: str = None, logStack: bool = False, exception: BaseException = None,
-			 frame: types.FrameType = None) -> None:
+			 frame: types.FrameType = None, messageArgs: tuple = None) -> None:
+		"""
+		:param messageArgs: Arguments the message is to be formatted with through 'str.format'. If every argument is a simple value, such as a number or
+		a string, the message is kept as a template and is only formatted once it is written. Otherwise, the message is formatted immediately, as the
+		arguments could change before the report is written.
+		:type messageArgs: tuple | None
+		"""
+
+		try:
+			rejected = level > _levelThreshold  # type: bool
+		except TypeError:
+			raise Exceptions.IncorrectTypeException(level, "level", (int,))
+
+		if rejected:
+			self.Metrics.RejectedLevels[level] += 1
+			self.Metrics.RejectedGroups[group] += 1
+
+			if _flightRecorder is not None:
+				_flightRecorder.Record(level, group, owner, message, messageArgs or ())
+
+			return
 
 		if not isinstance(level, int):
 			raise Exceptions.IncorrectTypeException(level, "level", (int,))
 
+		if type(level) is not Debug.LogLevels:
+			# Everything after this point, including writing, relies on the level being a member of the log levels enum.
+			level = _GetLogLevel(level)
+
 		if not isinstance(group, str) and group is not None:
 			raise Exceptions.IncorrectTypeException(group, "group", (str,))
 
@@ -65,6 +1220,9 @@ class _Logger(DebugShared.Logger):
 		if not isinstance(frame, types.FrameType) and frame is not None:
 			raise Exceptions.IncorrectTypeException(frame, "frame", (types.FrameType,))
 
+		if _levelRules is not None and _IsRejectedByRules(level, group, owner, message, messageArgs or ()):
+			return
+
 		if self._writeFailureCount >= self._writeFailureLimit:
 			return
 
@@ -77,81 +1235,738 @@ class _Logger(DebugShared.Logger):
 		if exception is None:
 			exception = sys.exc_info()[1]
 
-		logCount = self.LogCount  # type: int
-		self.LogCount += 1
+		if frame is None:
+			frame = sys._getframe()
+
+		logTime = time.time()  # type: float
+
+		if not messageArgs and type(message) is LazyMessage and message.Args and not message.Kwargs and type(message.Template) is str:
+			messageArgs = message.Args
+			message = message.Template
+
+		if messageArgs and type(message) is str:
+			messageArgTypes = tuple(type(messageArg) for messageArg in messageArgs)  # type: typing.Tuple[type, ...]
+
+			if not _templateArgTypes.issuperset(messageArgTypes):
+				message = BinaryLog.FormatTemplate(message, messageArgs)  # type: str
+				messageArgs = None
+				messageArgTypes = None
+			elif messageArgTypes in _templateArgTypeTuples:
+				# Every report with the same argument types shares one tuple of them in its fingerprint.
+				messageArgTypes = _templateArgTypeTuples[messageArgTypes]
+			elif len(_templateArgTypeTuples) < _templateArgTypeTuplesCapacity:
+				_templateArgTypeTuples[messageArgTypes] = messageArgTypes
+		else:
+			message = _RenderMessage(message)  # type: str
+			messageArgs = None
+			messageArgTypes = None  # type: typing.Optional[typing.Tuple[type, ...]]
+
+		# Group and owner names built at runtime would otherwise be kept as a separate copy by every report that uses them.
+		group = sys.intern(str(group))  # type: str
+		owner = sys.intern(str(owner)) if owner is not None else None  # type: typing.Optional[str]
+		stackFrames = _StackCapture.CaptureFrames(frame)  # type: typing.Tuple[typing.Tuple[types.CodeType, int], ...]
+
+		if exception is not None:
+			# Exceptions with the same message raised from different places must not be collapsed together, so the traceback is part of the key.
+			exceptionKey = _GetExceptionKey(exception)  # type: typing.Optional[tuple]
+		else:
+			exceptionKey = None  # type: typing.Optional[tuple]
+
+		# The argument types are part of the fingerprint, as arguments such as 1, 1.0 and True are equal to each other but are formatted differently.
+		reportFingerprint = (int(level), group, owner, message, messageArgs, messageArgTypes, logStack, exceptionKey, stackFrames)  # type: tuple
+
+		flightRecorder = _flightRecorder  # type: typing.Optional[_FlightRecorder]
+		flushStorage = False  # type: bool
 
-		if _logLevel is not None:
-			if level > _logLevel:
-				return
+		try:
+			with self._storageLock:
+				# Report numbers are given out under the storage lock, so that reports are stored and journaled in the order of their numbers.
+				logCount = self.LogCount  # type: int
+				self.LogCount += 1
+
+				if exception is not None:
+					self.ExceptionSummary.Record(exception, logCount + 1, logTime, owner)
+
+				self.Metrics.KeptLevels[int(level)] += 1
+				self.Metrics.KeptGroups[group] += 1
+
+				repeatedReport = self._reportFingerprints.get(reportFingerprint, None)  # type: typing.Union[_PendingReport, _FlushedReport, None]
+
+				if repeatedReport is not None:
+					# Repeats are collapsed for as long as the fingerprint is remembered, not only until the next flush. Repeats of a report that has
+					# already been flushed are written as a short notice with the next flush.
+					self._reportFingerprints.move_to_end(reportFingerprint)
+					self.Metrics.CollapsedCount += 1
+					repeatedReport.RepeatCount += 1
+					repeatedReport.LastLogNumber = logCount + 1
+					repeatedReport.LastLogTime = logTime
+
+					if repeatedReport.RepeatCount == 1 and type(repeatedReport) is _FlushedReport:
+						if self._storedReportCount == 0 and len(self._flushedRepeats) == 0:
+							self._flushScheduler.RecordActivity()
+
+						self._flushedRepeats.append(repeatedReport)
+
+					return
+
+				stack = self._stackCache.Intern(stackFrames)  # type: _StackCapture
+
+				if stack.Frames is not stackFrames:
+					# The fingerprint is kept for as long as the report is, it should hold the shared frames rather than this call's own copy of them.
+					reportFingerprint = reportFingerprint[:-1] + (stack.Frames,)
+
+				report = _PendingReport(logCount + 1, logTime, message, level, group, owner, exception, logStack, stack, messageArgs = messageArgs)  # type: _PendingReport
+				report.Fingerprint = reportFingerprint
 
-		report = DebugShared.Report(None, logCount + 1, datetime.datetime.now().isoformat(),
-									str(message), level = level, group = str(group),
-									owner = owner, exception = exception, logStack = logStack,
-									stacktrace = str.join("", traceback.format_stack(f = frame)))  # type: DebugShared.Report
+				storageLimit = _logStorageLimit if _logStorageLimit is not None else _preloadStorageLimit  # type: int
 
-		self._reportStorage.append(report)
+				if self._storedReportCount >= storageLimit:
+					# Reports are not written before the settings are loaded, so reports are always dropped by level during that time.
+					if _logOverflowPolicy == "Flush" and not _preload:
+						flushStorage = True
+					elif not self._DropStoredReport(report):
+						return
 
-		if _logInterval == 0:
+				# The flight recorder's entries are only taken by a report that is kept, a collapsed or dropped report leaves them for the next one.
+				if flightRecorder is not None and level <= _flightRecorderLevelThreshold:
+					report.FlightRecord = flightRecorder.TakeEntries()
+
+				if self._storedReportCount == 0 and len(self._flushedRepeats) == 0:
+					self._flushScheduler.RecordActivity()
+
+				self._reportStorage.append(report)
+				self._reportFingerprints[reportFingerprint] = report
+				self._storedReportCount += 1
+
+				if len(self._reportFingerprints) > self.ReportFingerprintsCapacity:
+					self._reportFingerprints.popitem(last = False)
+				self._storedMessageLength += len(message)
+
+				if messageArgs is not None:
+					self._storedMessageLength += sum(len(messageArg) for messageArg in messageArgs if type(messageArg) is str)
+
+				if not _preload and (self._storedReportCount >= self.FlushHighWaterCount or self._storedMessageLength >= self.FlushHighWaterLength):
+					flushStorage = True
+
+				levelStorage = self._levelStorage.get(int(level), None)  # type: typing.Optional[typing.Deque[_PendingReport]]
+
+				if levelStorage is None:
+					levelStorage = collections.deque()
+					self._levelStorage[int(level)] = levelStorage
+
+				levelStorage.append(report)
+
+				if self._journal is not None:
+					self._journal.Append(report)
+		finally:
+			# This report is recorded only after it has had the chance to take the flight recorder's entries, so it is never part of its own context.
+			if flightRecorder is not None:
+				flightRecorder.Record(int(level), group, owner, message, messageArgs or ())
+
+		if flushStorage:
 			self.Flush()
+		elif _logInterval == 0 or level <= _flushLevelThreshold:
+			self._RequestFlush()
+
+	def Flush (self) -> None:
+		"""
+		Hand all stored reports over to be written. The storage buffer is swapped for an empty one, the actual writing is done by the writer thread
+		if it is running, or immediately otherwise.
+		"""
+
+		with self._storageLock:
+			reports = self._reportStorage  # type: typing.List[_PendingReport]
+
+			if len(reports) == 0 and self._bufferDroppedCount == 0 and len(self._flushedRepeats) == 0:
+				return
+
+			if self._bufferDroppedCount != 0:
+				reports = [report for report in reports if not report.Dropped]
+				reports.append(self._CreateDroppedReportsNotice())
+
+			reportFingerprints = self._reportFingerprints  # type: typing.OrderedDict[tuple, typing.Union[_PendingReport, _FlushedReport]]
+
+			for report in reports:  # type: _PendingReport
+				if report.Fingerprint is not None and reportFingerprints.get(report.Fingerprint, None) is report:
+					reportFingerprints[report.Fingerprint] = _FlushedReport(report)
+
+			for flushedReport in self._flushedRepeats:  # type: _FlushedReport
+				reports.append(self._CreateRepeatsNotice(flushedReport))
+
+			self._ResetStorage()
+
+			self.Metrics.FlushCount += 1
+			self.Metrics.FlushSizes.append(len(reports))
+
+		writer = self._writer  # type: typing.Optional[_LogWriter]
+
+		if writer is not None:
+			writer.Submit(reports)
+		else:
+			self._WriteReports(reports)
+
+	def ScheduledFlush (self) -> None:
+		"""
+		Flush for the flush ticker. Ticks that find nothing to flush make the flush scheduler back off.
+		"""
+
+		with self._storageLock:
+			idle = len(self._reportStorage) == 0 and self._bufferDroppedCount == 0 and len(self._flushedRepeats) == 0  # type: bool
+
+		if idle:
+			self._flushScheduler.RecordIdleTick()
+			return
+
+		self._flushScheduler.RecordActiveTick()
+		self.Flush()
+
+	def ResetFlushSchedule (self, baseInterval: float, budget: float) -> None:
+		self._flushScheduler.Reset(baseInterval, budget)
+
+	def GetPendingReportCount (self) -> int:
+		return self._storedReportCount
+
+	def GetWriteFailureCount (self) -> int:
+		return self._writeFailureCount
+
+	def GetFlushInterval (self) -> float:
+		"""
+		Get the time in seconds the flush ticker currently waits between flushes.
+		"""
+
+		return self._flushScheduler.EffectiveInterval
+
+	def DiscardReports (self) -> None:
+		"""
+		Throw away all stored reports without writing them.
+		"""
+
+		skippedCount = 0  # type: int
+
+		with self._storageLock:
+			self._ResetStorage()
+			self._reportFingerprints = collections.OrderedDict()
+
+			if self._journal is not None:
+				skippedCount = self._journal.Checkpoint(self.LogCount)
+
+		self._WarnJournalSkipped(skippedCount)
+
+	def ChangeLogFile (self) -> None:
+		with self._writeLock:
+			self._filePool.CloseAll()
+			super().ChangeLogFile()
+			self.ExceptionSummary.Reset()
+
+	def CloseLogFiles (self) -> None:
+		"""
+		Close every log file that is being kept open. Files will be reopened as needed if more reports are written afterwards.
+		"""
+
+		with self._writeLock:
+			self._filePool.CloseAll()
+
+	def StartJournal (self) -> None:
+		"""
+		Recover the reports left in any crash journal from a previous session, then start a journal for this session.
+		"""
+
+		loggingRootPath = self.GetLoggingRootPath()  # type: str
+
+		if not os.path.exists(loggingRootPath):
+			os.makedirs(loggingRootPath)
+
+		for entryName in os.listdir(loggingRootPath):  # type: str
+			if entryName.endswith(self.JournalFileExtension + ".tmp"):
+				# A journal that was being rotated when the game crashed, the journal it was to replace is still complete.
+				try:
+					os.remove(os.path.join(loggingRootPath, entryName))
+				except Exception:
+					pass
+
+				continue
+
+			if not entryName.endswith(self.JournalFileExtension):
+				continue
+
+			journalFilePath = os.path.join(loggingRootPath, entryName)  # type: str
+
+			if self._journal is not None and self._journal.FilePath == journalFilePath:
+				continue
+
+			try:
+				self._RecoverJournal(journalFilePath, entryName[:-len(self.JournalFileExtension)])
+			except Exception:
+				# The journal is kept under another name, so that its reports are not lost but recovery is not attempted again at every start.
+				failedJournalFilePath = journalFilePath + ".failed"  # type: str
+
+				Debug.Log("Failed to recover reports from a crash journal, the journal has been kept.\nFile Path: %s" % failedJournalFilePath,
+						  This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+				os.replace(journalFilePath, failedJournalFilePath)
+				continue
+
+			os.remove(journalFilePath)
+
+		if self._journal is None:
+			self._journal = _CrashJournal(os.path.join(loggingRootPath, self.GetLoggingDirectoryName() + self.JournalFileExtension))
+
+	def StopJournal (self) -> None:
+		"""
+		Close and delete this session's crash journal. Every report should have been written before this is called.
+		"""
+
+		journal = self._journal  # type: typing.Optional[_CrashJournal]
+
+		if journal is None:
+			return
+
+		self._journal = None
+		journal.Close()
+
+	def StartWriter (self) -> None:
+		"""
+		Start the writer thread, after this all flushed reports will be written in the background.
+		"""
+
+		if self._writer is not None:
+			return
+
+		self._writer = _LogWriter(self)
+		self._writer.start()
+
+	def StopWriter (self) -> None:
+		"""
+		Wait for the writer thread to write all flushed reports, then stop it. Reports flushed afterwards will be written immediately by the flushing thread.
+		"""
+
+		writer = self._writer  # type: typing.Optional[_LogWriter]
+
+		if writer is None:
+			return
+
+		self._writer = None
+		writer.Stop()
 
 	def GetLogSizeLimit (self) -> int:
 		return int(_logSizeLimit * 1000000)
 
 	def GetLogFilesToBeReported (self) -> typing.List[str]:
 		"""
-		Get the logs to be included in a report archive file. This should be limited to only some of the more recent logs.
+		Get the logs to be included in a report archive file. This should be limited to only some of the more recent logs. Binary logs are included as
+		they are, along with the converted logs log maintenance made of previous sessions in the background. Nothing is converted here, as a binary
+		log can be converted outside of the game if needed.
+		"""
+
+		reportingLogFiles = list()  # type: typing.List[str]
+
+		loggingRootPath = self.GetLoggingRootPath()  # type: str
+
+		latestLogFilePath = os.path.join(loggingRootPath, "Latest.xml")  # type: str
+
+		if os.path.exists(latestLogFilePath):
+			reportingLogFiles.append(latestLogFilePath)
+
+		extractsDirectoryPath = os.path.join(os.path.dirname(loggingRootPath), "Log Extracts")  # type: str
+
+		if os.path.exists(extractsDirectoryPath):
+			shutil.rmtree(extractsDirectoryPath, ignore_errors = True)
+
+		for reportingSession in LogMaintenance.GetSessions(loggingRootPath)[:LogMaintenance.ReportedSessionCount]:  # type: LogMaintenance.Session
+			try:
+				reportingLogFilePath = reportingSession.ExtractFile("Log.xml", extractsDirectoryPath)  # type: typing.Optional[str]
+
+				if reportingLogFilePath is not None:
+					reportingLogFiles.append(reportingLogFilePath)
+
+				reportingBinaryLogFilePath = reportingSession.ExtractFile("Log.bin", extractsDirectoryPath)  # type: typing.Optional[str]
+
+				if reportingBinaryLogFilePath is not None:
+					reportingLogFiles.append(reportingBinaryLogFilePath)
+
+				reportingConvertedLogFilePath = LogMaintenance.GetConvertedLogFilePath(loggingRootPath, reportingSession.Name)  # type: str
+
+				if os.path.isfile(reportingConvertedLogFilePath):
+					reportingLogFiles.append(reportingConvertedLogFilePath)
+
+				reportingExceptionSummaryFilePath = reportingSession.ExtractFile("Exceptions Summary.txt", extractsDirectoryPath)  # type: typing.Optional[str]
+
+				if reportingExceptionSummaryFilePath is not None:
+					reportingLogFiles.append(reportingExceptionSummaryFilePath)
+
+				reportingSessionFilePath = reportingSession.ExtractFile("Session.json", extractsDirectoryPath)  # type: typing.Optional[str]
+
+				if reportingSessionFilePath is not None:
+					reportingLogFiles.append(reportingSessionFilePath)
+
+				reportingModFilePath = reportingSession.ExtractFile("Mods.txt", extractsDirectoryPath)  # type: typing.Optional[str]
+
+				if reportingModFilePath is not None:
+					reportingLogFiles.append(reportingModFilePath)
+			except Exception:
+				Debug.Log("Failed to collect a log session for reporting.\nSession Path: %s" % reportingSession.Path,
+						  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+		return reportingLogFiles
+
+	def _RequestFlush (self) -> None:
+		"""
+		Flush for a report that should be written right away. If the writer thread is busy, the flush is left to it, reports logged while it writes are
+		then handed over together.
+		"""
+
+		writer = self._writer  # type: typing.Optional[_LogWriter]
+
+		if writer is None or not writer.RequestFlush():
+			self.Flush()
+
+	def _ResetStorage (self) -> None:
+		# The fingerprints are not reset with the storage, repeats of reports that were already flushed are still collapsed.
+		self._reportStorage = list()
+		self._flushedRepeats = list()
+		self._storedReportCount = 0
+		self._storedMessageLength = 0
+		self._droppedStoredCount = 0
+		self._oldestStoredIndex = 0
+		self._levelStorage = dict()
+		self._bufferDroppedCount = 0
+		self._bufferDroppedLevel = None
+
+	def _DropStoredReport (self, incomingReport: _PendingReport) -> bool:
+		"""
+		Drop a stored report to make room for an incoming one, according to the overflow policy. Dropped reports are marked, then removed from the
+		storage list and the level storages together once they pass a small part of what is stored, so that the storage limit also bounds memory.
+		:return: Whether room was made. If false, the incoming report should be dropped instead.
+		:rtype: bool
+		"""
+
+		if _logOverflowPolicy == "Drop_Oldest":
+			while self._oldestStoredIndex < len(self._reportStorage):
+				droppingReport = self._reportStorage[self._oldestStoredIndex]  # type: _PendingReport
+				self._oldestStoredIndex += 1
+
+				if not droppingReport.Dropped:
+					self._MarkReportDropped(droppingReport)
+					return True
+
+			self._RecordDroppedReport(incomingReport)
+			return False
+
+		# The least severe reports have the highest level values, so the storage for the highest level with any reports left is where the dropped report comes from.
+		for levelValue in sorted(self._levelStorage, reverse = True):  # type: int
+			if levelValue < int(incomingReport.Level):
+				break
+
+			levelStorage = self._levelStorage[levelValue]  # type: typing.Deque[_PendingReport]
+
+			while len(levelStorage) != 0:
+				droppingReport = levelStorage.popleft()  # type: _PendingReport
+
+				if not droppingReport.Dropped:
+					self._MarkReportDropped(droppingReport)
+					return True
+
+		self._RecordDroppedReport(incomingReport)
+		return False
+
+	def _MarkReportDropped (self, report: _PendingReport) -> None:
+		report.Dropped = True
+
+		if self._reportFingerprints.get(report.Fingerprint, None) is report:
+			del self._reportFingerprints[report.Fingerprint]
+		self._storedReportCount -= 1
+		self._droppedStoredCount += 1
+		self._RecordDroppedReport(report)
+
+		if self._droppedStoredCount > max(self.StorageCompactionMinimum, self._storedReportCount * self.StorageCompactionFraction):
+			self._CompactStorage()
+
+	def _CompactStorage (self) -> None:
+		"""
+		Remove every dropped report from the storage list and the level storages. This is only done once dropped reports pass a fixed fraction of
+		kept ones, so the lists never grow much past the storage limit and each drop still costs a constant amount of work on average.
+		"""
+
+		self._reportStorage = [report for report in self._reportStorage if not report.Dropped]
+		self._oldestStoredIndex = 0
+
+		for levelValue, levelStorage in list(self._levelStorage.items()):  # type: int, typing.Deque[_PendingReport]
+			self._levelStorage[levelValue] = collections.deque(report for report in levelStorage if not report.Dropped)
+
+		self._droppedStoredCount = 0
+
+	def _RecordDroppedReport (self, report: _PendingReport) -> None:
+		self.DroppedReportCount += 1
+		self._bufferDroppedCount += 1
+
+		if self._bufferDroppedLevel is None or report.Level < self._bufferDroppedLevel:
+			self._bufferDroppedLevel = report.Level
+
+	def _CreateDroppedReportsNotice (self) -> _PendingReport:
+		"""
+		Create a report stating how many reports have been dropped from the current buffer. The notice has the level of the most severe dropped report,
+		so that it is written whenever any of the dropped reports would have been.
+		"""
+
+		self.LogCount += 1
+
+		noticeMessage = str(self._bufferDroppedCount) + " report(s) were dropped because too many reports were waiting to be written.\n" + \
+						"Reports dropped this session: " + str(self.DroppedReportCount)  # type: str
+
+		return _PendingReport(self.LogCount, time.time(), noticeMessage, self._bufferDroppedLevel, This.Mod.Namespace, __name__,
+							  None, False, self._stackCache.Intern(tuple()))
+
+	def _CreateRepeatsNotice (self, flushedReport: _FlushedReport) -> _PendingReport:
+		"""
+		Create a report stating how many times an already flushed report has been repeated since. The notice has the level, group and owner of the
+		repeated report and its message, but not its exception or stack. The repeat count starts over once the notice is made.
+		"""
+
+		self.LogCount += 1
+
+		if flushedReport.MessageArgs is not None:
+			repeatedMessage = BinaryLog.FormatTemplate(flushedReport.Template, flushedReport.MessageArgs)  # type: str
+		else:
+			repeatedMessage = flushedReport.Template  # type: str
+
+		noticeMessage = "[Report " + str(flushedReport.LogNumber) + " was repeated " + str(flushedReport.RepeatCount) + " more time(s) after it was written, " + \
+						"the last repeat was report " + str(flushedReport.LastLogNumber) + " at " + datetime.datetime.fromtimestamp(flushedReport.LastLogTime).isoformat() + "]" + \
+						os.linesep + os.linesep + repeatedMessage  # type: str
+
+		flushedReport.RepeatCount = 0
+
+		return _PendingReport(self.LogCount, time.time(), noticeMessage, flushedReport.Level, flushedReport.Group, flushedReport.Owner,
+							  None, False, self._stackCache.Intern(tuple()))
+
+	def _WriteReports (self, reports: typing.List[_PendingReport]) -> None:
+		with self._writeLock:
+			checkpointNumber = max(report.LogNumber for report in reports) if len(reports) != 0 else 0  # type: int
+			unfilteredCount = len(reports)  # type: int
+			reports = self._FilterReports(reports)
+
+			self.Metrics.FilteredCount += unfilteredCount - len(reports)
+
+			if len(reports) != 0:
+				writeStartTime = time.perf_counter()  # type: float
+				self._LogAllReports(reports)
+				writeDuration = time.perf_counter() - writeStartTime  # type: float
+
+				self._flushScheduler.RecordWriteDuration(writeDuration)
+
+				self.Metrics.WriteCount += 1
+				self.Metrics.WriteDurations.append(writeDuration)
+				self.Metrics.WrittenCount += len(reports)
+
+				for report in reports:  # type: _PendingReport
+					if report.MessageArgs is not None:
+						self.Metrics.RecordTemplate(report.Template, report.RepeatCount + 1)
+
+				if LogStream.HasClients():
+					self._StreamReports(reports)
+
+			if self._journal is not None and checkpointNumber != 0:
+				self._WarnJournalSkipped(self._journal.Checkpoint(checkpointNumber))
+
+	def _WarnJournalSkipped (self, skippedCount: int) -> None:
+		# Must never be called while the storage lock is held, logging this report would need the lock again.
+		if skippedCount != 0:
+			Debug.Log(str(skippedCount) + " report(s) could not be added to the crash journal, they would not be recovered after a crash.",
+					  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":JournalSkipped", lockThreshold = 1)
+
+	def _StreamReports (self, reports: typing.List[_PendingReport]) -> None:
+		try:
+			LogStream.Publish([report.CreateBinaryReport() for report in reports])
+		except Exception:
+			Debug.Log("Failed to stream reports to log viewers.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":StreamReports", lockThreshold = 1)
+
+	def _RecoverJournal (self, journalFilePath: str, journalDirectoryName: str) -> None:
+		"""
+		Write the unwritten reports from a previous session's crash journal to the chronological log of that session. If the session changed log
+		directories before it ended, the newest of its directories is used.
+		"""
+
+		with open(journalFilePath, mode = "rb") as journalFile:
+			recoveredReports = BinaryLog.ReadUnwrittenReports(journalFile)  # type: typing.List[BinaryLog.BinaryReport]
+
+		if len(recoveredReports) == 0:
+			return
+
+		loggingRootPath = self.GetLoggingRootPath()  # type: str
+		recoveringDirectoryName = journalDirectoryName  # type: str
+
+		try:
+			journalTime = datetime.datetime.strptime(journalDirectoryName, LogMaintenance.SessionDirectoryNameFormat)  # type: datetime.datetime
+		except ValueError:
+			journalTime = None  # type: typing.Optional[datetime.datetime]
+
+		if journalTime is not None:
+			for session in LogMaintenance.GetSessions(loggingRootPath):  # type: LogMaintenance.Session
+				if session.Archived or session.Name == self.GetLoggingDirectoryName():
+					continue
+
+				if session.Time >= journalTime:
+					recoveringDirectoryName = session.Name
+
+				break
+
+		recoveringDirectoryPath = os.path.join(loggingRootPath, recoveringDirectoryName)  # type: str
+
+		if not os.path.exists(recoveringDirectoryPath):
+			os.makedirs(recoveringDirectoryPath)
+
+		lineSeparatorBytes = (os.linesep + os.linesep).encode("utf-8")  # type: bytes
+		writeTime = datetime.datetime.now().isoformat()  # type: str
+
+		recoveredTextBytes = list()  # type: typing.List[bytes]
+
+		for recoveredReport in recoveredReports:  # type: BinaryLog.BinaryReport
+			recoveredMessage = recoveredReport.Message  # type: str
+
+			if recoveredReport.Exception is not None:
+				recoveredMessage += os.linesep + os.linesep + "Exception: " + recoveredReport.Exception
+
+			recoveredMessage += os.linesep + os.linesep + "[This report was recovered from the crash journal, its stack trace was not kept]"
+
+			report = DebugShared.Report(None, recoveredReport.Number, datetime.datetime.fromtimestamp(recoveredReport.Time).isoformat(), recoveredMessage,
+										level = _GetLogLevel(recoveredReport.Level), group = recoveredReport.Group, owner = recoveredReport.Owner)  # type: DebugShared.Report
+
+			recoveredTextBytes.append(report.GetBytes(writeTime = writeTime))
+
+		recoveringFilePath = os.path.join(recoveringDirectoryPath, "Log.xml")  # type: str
+
+		with self._writeLock:
+			self._WriteLogFile(recoveringFilePath, lineSeparatorBytes.join(recoveredTextBytes), self.GetLogStartBytes(), self.GetLogEndBytes(), lineSeparatorBytes)
+			self._filePool.Close(recoveringFilePath)
+
+		Debug.Log("Recovered " + str(len(recoveredReports)) + " unwritten report(s) from a crash journal.\nLog File Path: %s" % recoveringFilePath,
+				  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+	def _PrepareLoggingDirectory (self, loggingDirectory: str) -> None:
+		"""
+		Create the logging directory and its session information files, if this has not already been done for this directory.
+		"""
+
+		if self._preparedLoggingDirectory == loggingDirectory:
+			return
+
+		sessionFilePath = os.path.join(loggingDirectory, "Session.txt")  # type: str
+		modsDirectoryFilePath = os.path.join(loggingDirectory, "Mods Directory.txt")  # type: str
+
+		if not os.path.exists(loggingDirectory):
+			os.makedirs(loggingDirectory)
+
+		if not os.path.exists(sessionFilePath):
+			with open(sessionFilePath, mode = "w+") as sessionFile:
+				sessionFile.write(self._sessionInformation)
+
+		if not os.path.exists(modsDirectoryFilePath):
+			with open(modsDirectoryFilePath, mode = "w+") as modsFile:
+				modsFile.write(self._modsDirectoryInformation)
+
+		self._preparedLoggingDirectory = loggingDirectory
+
+	def _WriteLogFile (self, filePath: str, textBytes: bytes, logStartBytes: bytes, logEndBytes: bytes, separatorBytes: bytes) -> typing.Tuple[bool, typing.Optional[int]]:
+		"""
+		Append text to a log file through the file pool. The file is only checked on the disk when it is not already open in the pool, after that its
+		size is tracked in memory.
+		:return: Whether or not the file had to be created by this write, and the offset in the file the text was written at. The offset will be None
+		if the text was not written because the file has reached its size limit.
+		:rtype: typing.Tuple[bool, typing.Optional[int]]
 		"""
 
-		reportingLogFiles = list()  # type: typing.List[str]
+		logSizeLimit = self.GetLogSizeLimit()  # type: int
+		logSizeLimitReachedBytes = "<!--Log file size limit reached-->".encode("utf-8")  # type: bytes
+
+		pooledFile = self._filePool.Get(filePath)  # type: typing.Optional[_PooledLogFile]
+
+		if pooledFile is None:
+			if not os.path.exists(filePath):
+				if len(logStartBytes) + len(textBytes) + len(logEndBytes) >= logSizeLimit >= 0:
+					textBytes += logSizeLimitReachedBytes
+
+				pooledFile = self._filePool.Open(filePath, create = True)
+				self.Metrics.RecordFileWrite(filePath, pooledFile.Write((logStartBytes, textBytes), logEndBytes))
+				return True, len(logStartBytes)
+
+			self._VerifyLogFile(filePath)
+			pooledFile = self._filePool.Open(filePath, endLength = len(logEndBytes))
+
+		logSize = pooledFile.EndOffset + len(logEndBytes)  # type: int
+
+		if logSizeLimit < 0 or logSize < logSizeLimit:
+			if logSize + len(separatorBytes) + len(textBytes) + len(logEndBytes) >= logSizeLimit >= 0:
+				textBytes += logSizeLimitReachedBytes
 
-		loggingRootPath = self.GetLoggingRootPath()  # type: str
+			textOffset = pooledFile.EndOffset + len(separatorBytes)  # type: int
+			self.Metrics.RecordFileWrite(filePath, pooledFile.Write((separatorBytes, textBytes), logEndBytes))
+			return False, textOffset
 
-		reportingLogDirectories = list()  # type: typing.List[str]
+		return False, None
 
-		latestLogFilePath = os.path.join(loggingRootPath, "Latest.xml")  # type: str
+	def _WriteIndexFile (self, filePath: str, indexText: str) -> None:
+		pooledFile = self._filePool.Get(filePath)  # type: typing.Optional[_PooledLogFile]
 
-		if os.path.exists(latestLogFilePath):
-			reportingLogFiles.append(latestLogFilePath)
+		if pooledFile is None:
+			if not os.path.exists(filePath):
+				pooledFile = self._filePool.Open(filePath, create = True)
+				self.Metrics.RecordFileWrite(filePath, pooledFile.Write((LogIndex.IndexFileHeader.encode("utf-8"),), bytes()))
+			else:
+				pooledFile = self._filePool.Open(filePath)
 
-		for logDirectoryName in reversed(os.listdir(loggingRootPath)):  # type: str
-			if len(reportingLogDirectories) >= 10:
-				break
+		self.Metrics.RecordFileWrite(filePath, pooledFile.Write((indexText.encode("utf-8"),), bytes()))
+
+	def _WriteBinaryLogFile (self, filePath: str, reports: typing.List[_PendingReport], reportReferences: _ReportReferences) -> bool:
+		"""
+		Append reports to a binary log file through the file pool. One encoder is kept for the binary log file currently being written to, as
+		the encoder tracks what has already been written to it.
+		:return: Whether the reports were written. They will not be if the file has reached its size limit.
+		:rtype: bool
+		"""
 
-			logDirectoryPath = os.path.join(loggingRootPath, logDirectoryName)  # type: str
+		logSizeLimit = self.GetLogSizeLimit()  # type: int
 
-			if not os.path.isdir(logDirectoryPath):
-				continue
+		pooledFile = self._filePool.Get(filePath)  # type: typing.Optional[_PooledLogFile]
 
-			try:
-				datetime.datetime.strptime(logDirectoryName, "%Y-%m-%d %H.%M.%S.%f").timestamp()  # type: float
-			except ValueError:
-				Debug.Log("Found a directory in a logging namespace that did not meet the naming convention of 'Year-Month-Day Hour.Minute.Second.Microsecond'.\nDirectory Name: %s" % logDirectoryName,
-						  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":" + str(Python.GetLineNumber()), lockThreshold = 1)
-				continue
+		if pooledFile is None:
+			if not os.path.exists(filePath):
+				pooledFile = self._filePool.Open(filePath, create = True)
+				self.Metrics.RecordFileWrite(filePath, pooledFile.Write((BinaryLog.BinaryLogEncoder.GetFileHeader(),), bytes()))
+			else:
+				pooledFile = self._filePool.Open(filePath)
 
-			reportingLogDirectories.append(logDirectoryPath)
+			self._binaryLogEncoder = None
 
-		for reportingLogDirectory in reportingLogDirectories:  # type: str
-			reportingLogFilePath = os.path.join(reportingLogDirectory, "Log.xml")  # type: str
+		if self._binaryLogEncoder is None or self._binaryLogFilePath != filePath:
+			self._binaryLogEncoder = BinaryLog.BinaryLogEncoder()
+			self._binaryLogFilePath = filePath
 
-			if os.path.exists(reportingLogFilePath):
-				reportingLogFiles.append(reportingLogFilePath)
+		if 0 <= logSizeLimit <= pooledFile.EndOffset:
+			return False
 
-			reportingSessionFilePath = os.path.join(reportingLogDirectory, "Session.json")  # type: str
+		binaryLogEncoder = self._binaryLogEncoder  # type: BinaryLog.BinaryLogEncoder
+		encodedReports = list()  # type: typing.List[bytes]
 
-			if os.path.exists(reportingSessionFilePath):
-				reportingLogFiles.append(reportingSessionFilePath)
+		for report in reports:  # type: _PendingReport
+			try:
+				encodedReports.append(report.EncodeBinary(binaryLogEncoder, reportReferences.Prepare(report)))
+			except Exception:
+				# The encoder undoes a failed encoding, so a report that cannot be encoded can be skipped without affecting the rest of the file.
+				Debug.Log("Failed to encode a report, it will not be written.\nReport Number: %s" % report.LogNumber,
+						  This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":EncodeReport", lockThreshold = 1)
 
-			reportingModFilePath = os.path.join(reportingLogDirectory, "Mods.txt")  # type: str
+				continue
 
-			if os.path.exists(reportingModFilePath):
-				reportingLogFiles.append(reportingModFilePath)
+			reportReferences.Serialized()
 
-		return reportingLogFiles
+		self.Metrics.RecordFileWrite(filePath, pooledFile.Write(encodedReports, bytes()))
+		return True
 
-	def _FilterReports (self, reports: typing.List[DebugShared.Report]) -> typing.List[DebugShared.Report]:
-		def Filter (report: DebugShared.Report) -> bool:
-			if _logLevel is not None:
+	def _FilterReports (self, reports: typing.List[_PendingReport]) -> typing.List[_PendingReport]:
+		def Filter (report: _PendingReport) -> bool:
+			if _levelRules is not None:
+				if report.Level > _GetLevelThreshold(report.Group, report.Owner):
+					return False
+			elif _logLevel is not None:
 				if report.Level > _logLevel:
 					return False
 
@@ -159,145 +1974,115 @@ class _Logger(DebugShared.Logger):
 
 		return list(filter(Filter, reports))
 
-	def _LogAllReports (self, reports: typing.List[DebugShared.Report]) -> None:
+	def _LogAllReports (self, reports: typing.List[_PendingReport]) -> None:
 		if not _writeChronological and not _writeGroups:
 			return
 
 		if len(reports) == 0:
 			return
 
-		chronologicalTextBytes = bytes()  # type: bytes
-		groupsTextBytes = dict()  # type: typing.Dict[str, bytes]
+		writeBinary = _writeChronological and _writeBinary  # type: bool
+		writeChronological = _writeChronological and not _writeBinary  # type: bool
+
+		lineSeparatorBytes = (os.linesep + os.linesep).encode("utf-8")  # type: bytes
 
 		writeTime = datetime.datetime.now().isoformat()  # type: str
+		reportSerializer = _ReportSerializer(lineSeparatorBytes)  # type: _ReportSerializer
 
-		for report in reports:  # type: DebugShared.Report
-			group = str(report.Group)  # type: str
-			reportTextBytes = report.GetBytes(writeTime = writeTime)  # type: bytes
+		loggingDirectoryName = self.GetLoggingDirectoryName()  # type: str
 
-			if _writeChronological:
-				if len(chronologicalTextBytes) != 0:
-					chronologicalTextBytes += (os.linesep + os.linesep).encode("utf-8") + reportTextBytes
-				else:
-					chronologicalTextBytes = reportTextBytes
+		if self._writtenExceptionsDirectoryName != loggingDirectoryName:
+			self._writtenExceptions = dict()
+			self._writtenExceptionsDirectoryName = loggingDirectoryName
 
-			if _writeGroups:
-				if group in groupsTextBytes:
-					groupsTextBytes[group] += (os.linesep + os.linesep).encode("utf-8") + reportTextBytes
-				else:
-					groupsTextBytes[group] = reportTextBytes
+		reportReferences = _ReportReferences(self._writtenExceptions, self.WrittenExceptionsCapacity, loggingDirectoryName)  # type: _ReportReferences
+
+		if writeChronological or _writeGroups:
+			for report in reports:  # type: _PendingReport
+				if writeChronological:
+					try:
+						reportTextBytes = report.CreateReport(reportReferences.Prepare(report)).GetBytes(writeTime = writeTime)  # type: bytes
+					except Exception:
+						# A single report that cannot be formatted should not keep the rest of the buffer from being written.
+						Debug.Log("Failed to format a report, it will not be written.\nReport Number: %s" % report.LogNumber,
+								  This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":FormatReport", lockThreshold = 1)
+						continue
+
+					reportReferences.Serialized()
+
+					reportSerializer.AddReport(reportTextBytes, report.Group, True, _writeGroups and not reportReferences.PreparedReference,
+											   number = report.LogNumber, levelName = report.Level.name)
+
+					if not reportReferences.PreparedReference:
+						continue
+
+				if _writeGroups:
+					report.ExceptionReference = None
+
+					try:
+						reportTextBytes = report.CreateReport(report.Stack.Format() if report.LogStack else "").GetBytes(writeTime = writeTime)  # type: bytes
+					except Exception:
+						Debug.Log("Failed to format a report, it will not be written.\nReport Number: %s" % report.LogNumber,
+								  This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":FormatReport", lockThreshold = 1)
+						continue
+
+					reportSerializer.AddReport(reportTextBytes, report.Group, False, True)
+
+		chronologicalTextBytes = reportSerializer.GetChronologicalBytes()  # type: bytes
+		groupsTextBytes = reportSerializer.GetGroupsBytes()  # type: typing.Dict[str, bytes]
 
 		loggingRoot = self.GetLoggingRootPath()  # type: str
 
-		loggingDirectory = os.path.join(loggingRoot, self.GetLoggingDirectoryName())  # type: str
+		loggingDirectory = os.path.join(loggingRoot, loggingDirectoryName)  # type: str
 		chronologicalFilePath = os.path.join(loggingDirectory, "Log.xml")  # type: str
-		chronologicalFirstWrite = False  # type: bool
+		binaryFilePath = os.path.join(loggingDirectory, "Log.bin")  # type: str
+		indexFilePath = os.path.join(loggingDirectory, "Log Index.txt")  # type: str
 		latestChronologicalFilePath = os.path.join(loggingRoot, "Latest.xml")  # type: str
 
 		groupsLoggingDirectory = os.path.join(loggingDirectory, "Groups")  # type: str
 
-		sessionFilePath = os.path.join(loggingDirectory, "Session.txt")  # type: str
-		modsDirectoryFilePath = os.path.join(loggingDirectory, "Mods Directory.txt")  # type: str
-
-		logSizeLimit = self.GetLogSizeLimit()  # type: int
-		logSizeLimitReachedBytes = "<!--Log file size limit reached-->".encode("utf-8")  # type: bytes
-
 		logStartBytes = self.GetLogStartBytes()  # type: bytes
 		logEndBytes = self.GetLogEndBytes()  # type: bytes
 
-		lineSeparatorBytes = (os.linesep + os.linesep).encode("utf-8")  # type: bytes
-
 		try:
-			if not os.path.exists(loggingDirectory):
-				os.makedirs(loggingDirectory)
+			self._PrepareLoggingDirectory(loggingDirectory)
 
 			if _writeGroups:
-				if not os.path.exists(groupsLoggingDirectory):
-					os.makedirs(groupsLoggingDirectory)
+				if self._preparedGroupsDirectory != groupsLoggingDirectory:
+					if not os.path.exists(groupsLoggingDirectory):
+						os.makedirs(groupsLoggingDirectory)
 
-			if not os.path.exists(sessionFilePath):
-				with open(sessionFilePath, mode = "w+") as sessionFile:
-					sessionFile.write(self._sessionInformation)
+					self._preparedGroupsDirectory = groupsLoggingDirectory
 
-			if not os.path.exists(modsDirectoryFilePath):
-				with open(modsDirectoryFilePath, mode = "w+") as modsFile:
-					modsFile.write(self._modsDirectoryInformation)
+			if writeBinary:
+				if self._WriteBinaryLogFile(binaryFilePath, reports, reportReferences):
+					reportReferences.Commit()
 
-			if _writeChronological:
-				if not os.path.exists(chronologicalFilePath):
-					chronologicalFirstWrite = True
-				else:
-					self._VerifyLogFile(chronologicalFilePath)
+			if writeChronological:
+				chronologicalFirstWrite, chronologicalTextOffset = self._WriteLogFile(chronologicalFilePath, chronologicalTextBytes, logStartBytes, logEndBytes, lineSeparatorBytes)  # type: bool, typing.Optional[int]
 
-				if chronologicalFirstWrite:
-					if len(logStartBytes) + len(chronologicalTextBytes) + len(logEndBytes) >= logSizeLimit >= 0:
-						chronologicalTextBytes += logSizeLimitReachedBytes
+				if chronologicalTextOffset is not None:
+					reportReferences.Commit()
+					self._WriteIndexFile(indexFilePath, reportSerializer.GetChronologicalIndexText(chronologicalTextOffset))
 
-					with open(chronologicalFilePath, mode = "wb+") as chronologicalFile:
-						chronologicalFile.write(logStartBytes)
-						chronologicalFile.write(chronologicalTextBytes)
-						chronologicalFile.write(logEndBytes)
+				if chronologicalFirstWrite:
+					self._filePool.Close(latestChronologicalFilePath)
 
 					if os.path.exists(latestChronologicalFilePath):
 						os.remove(latestChronologicalFilePath)
 
-					with open(latestChronologicalFilePath, mode = "wb+") as latestChronologicalFile:
-						latestChronologicalFile.write(logStartBytes)
-						latestChronologicalFile.write(chronologicalTextBytes)
-						latestChronologicalFile.write(logEndBytes)
-				else:
-					logSize = os.path.getsize(chronologicalFilePath)  # type: int
-
-					if logSizeLimit < 0 or logSize < logSizeLimit:
-						if logSize + len(lineSeparatorBytes) + len(chronologicalTextBytes) + len(logEndBytes) >= logSizeLimit >= 0:
-							chronologicalTextBytes += logSizeLimitReachedBytes
-
-						with open(chronologicalFilePath, "r+b") as chronologicalFile:
-							chronologicalFile.seek(-len(logEndBytes), os.SEEK_END)
-							chronologicalFile.write(lineSeparatorBytes)
-							chronologicalFile.write(chronologicalTextBytes)
-							chronologicalFile.write(logEndBytes)
+					self._WriteLogFile(latestChronologicalFilePath, chronologicalTextBytes, logStartBytes, logEndBytes, lineSeparatorBytes)
+				elif chronologicalTextOffset is not None:
+					try:
+						self._WriteLogFile(latestChronologicalFilePath, chronologicalTextBytes, logStartBytes, logEndBytes, lineSeparatorBytes)
+					except:
+						self._filePool.Close(latestChronologicalFilePath)
+						shutil.copy(chronologicalFilePath, latestChronologicalFilePath)
 
-						try:
-							self._VerifyLogFile(latestChronologicalFilePath)
-
-							with open(latestChronologicalFilePath, "r+b") as latestChronologicalFile:
-								latestChronologicalFile.seek(-len(logEndBytes), os.SEEK_END)
-								latestChronologicalFile.write(lineSeparatorBytes)
-								latestChronologicalFile.write(chronologicalTextBytes)
-								latestChronologicalFile.write(logEndBytes)
-						except:
-							shutil.copy(chronologicalFilePath, latestChronologicalFilePath)
-
-			for groupName, groupTextBytes in groupsTextBytes.items():  # type: str, bytes
-				groupFilePath = os.path.join(groupsLoggingDirectory, groupName + ".xml")  # type: str
-				groupFirstWrite = False  # type: bool
-
-				if _writeGroups:
-					if not os.path.exists(groupFilePath):
-						groupFirstWrite = True
-					else:
-						self._VerifyLogFile(groupFilePath)
-
-					if groupFirstWrite:
-						if len(logStartBytes) + len(groupsTextBytes) + len(logEndBytes) >= logSizeLimit >= 0:
-							groupsTextBytes += logSizeLimitReachedBytes
-
-						with open(groupFilePath, mode = "wb+") as groupFile:
-							groupFile.write(logStartBytes)
-							groupFile.write(groupTextBytes)
-							groupFile.write(logEndBytes)
-					else:
-						logSize = os.path.getsize(chronologicalFilePath)  # type: int
-
-						if logSizeLimit < 0 or logSize < logSizeLimit:
-							if logSize + len(lineSeparatorBytes) + len(groupsTextBytes) + len(logEndBytes) >= logSizeLimit >= 0:
-								groupsTextBytes += logSizeLimitReachedBytes
-
-							with open(groupFilePath, "r+b") as groupFile:
-								groupFile.seek(-len(logEndBytes), os.SEEK_END)
-								groupFile.write((os.linesep + os.linesep).encode("utf-8") + groupTextBytes)
-								groupFile.write(logEndBytes)
+			if _writeGroups:
+				for groupName, groupTextBytes in groupsTextBytes.items():  # type: str, bytes
+					groupFilePath = os.path.join(groupsLoggingDirectory, groupName + ".xml")  # type: str
+					self._WriteLogFile(groupFilePath, groupTextBytes, logStartBytes, logEndBytes, lineSeparatorBytes)
 		except Exception as e:
 			self._writeFailureCount += 1
 
@@ -321,6 +2106,159 @@ class _Logger(DebugShared.Logger):
 
 			return
 
+		if self.ExceptionSummary.Changed:
+			try:
+				self._WriteExceptionSummaryFile(os.path.join(loggingDirectory, "Exceptions Summary.txt"))
+			except Exception:
+				Debug.Log("Failed to write the exceptions summary file.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, lockIdentifier = __name__ + ":ExceptionSummary", lockThreshold = 1)
+
+	def _WriteExceptionSummaryFile (self, filePath: str) -> None:
+		"""
+		Replace the exceptions summary file with the current summary. The file is written next to its final path then moved over it, so a crash while
+		writing never leaves a partial summary behind.
+		"""
+
+		summaryText = self.ExceptionSummary.GetText()  # type: str
+		temporaryFilePath = filePath + ".tmp"  # type: str
+
+		with open(temporaryFilePath, mode = "w", encoding = "utf-8") as summaryFile:
+			summaryFile.write(summaryText)
+
+		os.replace(temporaryFilePath, filePath)
+		self.Metrics.RecordFileWrite(filePath, len(summaryText))
+
+def IsEnabled (level: Debug.LogLevels, group: str = None, owner: str = None) -> bool:
+	"""
+	Get whether a report with this level, group and owner would currently be kept. This is meant to let expensive messages be skipped entirely,
+	it uses the same thresholds as the logger and costs about as much as a rejected log call.
+	"""
+
+	if level > _levelThreshold:
+		return False
+
+	if _levelRules is not None and level > _GetLevelThreshold(group, owner):
+		return False
+
+	return True
+
+def GetMetrics () -> LoggerMetrics:
+	"""
+	Get the running counts of what the logger has been doing this session.
+	"""
+
+	_CollectRejectedCounts()
+	return _logger.Metrics
+
+def GetPendingReportCount () -> int:
+	"""
+	Get the number of reports currently waiting to be flushed.
+	"""
+
+	return _logger.GetPendingReportCount()
+
+def GetDroppedReportCount () -> int:
+	"""
+	Get the number of reports dropped this session because the report storage limit was reached.
+	"""
+
+	return _logger.DroppedReportCount
+
+def GetWriteFailureCount () -> int:
+	"""
+	Get the number of consecutive times the logger has failed to write reports.
+	"""
+
+	return _logger.GetWriteFailureCount()
+
+def GetEffectiveFlushInterval () -> float:
+	"""
+	Get the time in seconds currently waited between flushes. This follows the log interval setting, but is adjusted to how busy the logger is.
+	"""
+
+	return _logger.GetFlushInterval()
+
+def GetSessionDirectoryPath () -> str:
+	"""
+	Get the path of the directory that the current session's log files are written to.
+	"""
+
+	return os.path.join(_logger.GetLoggingRootPath(), _logger.GetLoggingDirectoryName())
+
+def _GetExceptionKey (exception: BaseException) -> tuple:
+	"""
+	Get a key identifying an exception's formatted text without formatting it. The key holds the type, message and traceback frames of the exception
+	and of every exception chained to it, which is everything 'traceback.format_exception' builds its text from.
+	"""
+
+	keyParts = list()  # type: typing.List[tuple]
+	seenExceptions = set()  # type: typing.Set[int]
+
+	while exception is not None and id(exception) not in seenExceptions:
+		seenExceptions.add(id(exception))
+
+		tracebackFrames = list()  # type: typing.List[typing.Tuple[str, str, int]]
+		tracebackEntry = exception.__traceback__  # type: typing.Optional[types.TracebackType]
+
+		while tracebackEntry is not None:
+			frameCode = tracebackEntry.tb_frame.f_code  # type: types.CodeType
+			tracebackFrames.append((frameCode.co_filename, frameCode.co_name, tracebackEntry.tb_lineno))
+			tracebackEntry = tracebackEntry.tb_next
+
+		keyParts.append((type(exception), _GetExceptionTitle(exception), tuple(tracebackFrames)))
+
+		if exception.__cause__ is not None:
+			exception = exception.__cause__
+		elif exception.__context__ is not None and not exception.__suppress_context__:
+			exception = exception.__context__
+		else:
+			break
+
+	return tuple(keyParts)
+
+def _GetExceptionTitle (exception: BaseException) -> str:
+	try:
+		exceptionMessage = str(exception)  # type: str
+	except Exception:
+		exceptionMessage = "<exception str() failed>"
+
+	return type(exception).__name__ + ": " + exceptionMessage if exceptionMessage else type(exception).__name__
+
+def _GetLogLevel (level: int) -> Debug.LogLevels:
+	"""
+	Get the log level member for a level value. A value that matches no member is given the least severe member that is still at least as severe as
+	the value, or the most severe member if there is no such member.
+	"""
+
+	try:
+		return Debug.LogLevels(level)
+	except ValueError:
+		pass
+
+	logLevels = sorted(Debug.LogLevels, key = int)  # type: typing.List[Debug.LogLevels]
+	matchingLevel = logLevels[0]  # type: Debug.LogLevels
+
+	for logLevel in logLevels:  # type: Debug.LogLevels
+		if int(logLevel) > level:
+			break
+
+		matchingLevel = logLevel
+
+	return matchingLevel
+
+def _RenderMessage (message: typing.Any) -> str:
+	"""
+	Turn a log message into its text. Callables, such as lambdas, are called for their message, and any other object is converted with 'str',
+	which is how lazy messages are rendered.
+	"""
+
+	try:
+		if callable(message):
+			message = message()
+
+		return str(message)
+	except Exception as e:
+		return "Failed to render a lazy log message.\n" + type(e).__name__ + ": " + str(e)
+
 def _Setup () -> None:
 	global _logger
 
@@ -332,27 +2270,26 @@ def _DebugLogCollector () -> typing.List[str]:
 def _OnStart (cause: LoadingShared.LoadingCauses) -> None:
 	global _preload, _loggingEnabled, _writeChronological, _writeGroups, _logLevel, _logInterval
 
-	if cause != LoadingShared.LoadingCauses.Reloading:
-		Patcher.Patch(log, "debug", _Debug)
-		Patcher.Patch(log.Logger, "debug", _LoggerDebug)
-
-		Patcher.Patch(log, "info", _Info)
-		Patcher.Patch(log.Logger, "info", _LoggerInfo)
-
-		Patcher.Patch(log, "warn", _Warning)
-		Patcher.Patch(log.Logger, "warn", _LoggerWarning)
-
-		Patcher.Patch(log, "error", _Error)
-		Patcher.Patch(log.Logger, "error", _LoggerError)
-
-		Patcher.Patch(log, "exception", _Exception)
+	if cause:
+		pass
 
 	_UpdateSettings()
 	Settings.RegisterOnUpdateCallback(_UpdateSettingsCallback)
 
 	_preload = False
+
+	try:
+		_logger.StartJournal()
+	except Exception:
+		Debug.Log("Failed to start the crash journal.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+	_logger.StartWriter()
 	_logger.Flush()
 
+	_StartLogMaintenance()
+	_StartLevelRulesTicker()
+	_UpdateLogStream()
+
 	Reporting.RegisterReportFileCollector(_DebugLogCollector)
 
 def _OnStop (cause: LoadingShared.UnloadingCauses) -> None:
@@ -360,7 +2297,15 @@ def _OnStop (cause: LoadingShared.UnloadingCauses) -> None:
 
 	Settings.UnregisterOnUpdateCallback(_UpdateSettingsCallback)
 
+	_StopLevelRulesTicker()
+	LogMaintenance.StopMaintenance()
+
 	_logger.Flush()
+	_logger.StopWriter()
+	_logger.StopJournal()
+	_logger.CloseLogFiles()
+
+	LogStream.StopServer()
 
 	if cause == LoadingShared.UnloadingCauses.Exiting:
 		_exiting = True
@@ -368,22 +2313,49 @@ def _OnStop (cause: LoadingShared.UnloadingCauses) -> None:
 	Reporting.UnregisterReportFileCollector(_DebugLogCollector)
 
 def _UpdateSettings () -> None:
-	global _loggingEnabled, _writeChronological, _writeGroups, _logLevel, _logInterval, _logSizeLimit
+	global _loggingEnabled, _writeChronological, _writeGroups, _writeBinary, _logLevel, _logFlushLevel, _logInterval, _logFlushBudget, _logSizeLimit, _logStorageLimit, _logOverflowPolicy, \
+		_logRetentionSize, _logRetentionAge, _logRetentionCount, _logStreamEnabled, _logStreamPort, _flightRecorderLength, _flightRecorderLevel, _flightRecorder
 
 	loggingEnabledChange = Settings.LoggingEnabled.Get()  # type: bool
 	writeChronologicalChange = Settings.WriteChronological.Get()  # type: bool
 	writeGroupsChange = Settings.WriteGroups.Get()  # type: bool
+	writeBinaryChange = Settings.WriteBinary.Get()  # type: bool
 	logLevelChange = Settings.LogLevel.Get()  # type: str
 	logLevelChange = Parse.ParsePythonEnum(logLevelChange, Debug.LogLevels)  # type: Debug.LogLevels
+	logFlushLevelChange = Settings.LogFlushLevel.Get()  # type: str
+	logFlushLevelChange = Parse.ParsePythonEnum(logFlushLevelChange, Debug.LogLevels)  # type: Debug.LogLevels
 	logIntervalChange = Settings.LogInterval.Get()  # type: float
+	logFlushBudgetChange = Settings.LogFlushBudget.Get()  # type: float
 	logSizeLimitChange = Settings.LogSizeLimit.Get()  # type: float
+	logStorageLimitChange = Settings.LogStorageLimit.Get()  # type: int
+	logOverflowPolicyChange = Settings.LogOverflowPolicy.Get()  # type: str
+	logRetentionSizeChange = Settings.LogRetentionSize.Get()  # type: float
+	logRetentionAgeChange = Settings.LogRetentionAge.Get()  # type: float
+	logRetentionCountChange = Settings.LogRetentionCount.Get()  # type: int
+	logStreamEnabledChange = Settings.LogStreamEnabled.Get()  # type: bool
+	logStreamPortChange = Settings.LogStreamPort.Get()  # type: int
+	flightRecorderLengthChange = Settings.FlightRecorderLength.Get()  # type: int
+	flightRecorderLevelChange = Settings.FlightRecorderLevel.Get()  # type: str
+	flightRecorderLevelChange = Parse.ParsePythonEnum(flightRecorderLevelChange, Debug.LogLevels)  # type: Debug.LogLevels
 
 	loggingEnabledLast = _loggingEnabled  # type: bool
 	writeChronologicalLast = _writeChronological  # type: bool
 	writeGroupsLast = _writeGroups  # type: bool
+	writeBinaryLast = _writeBinary  # type: bool
 	logLevelLast = _logLevel  # type: enum_lib.Enum
+	logFlushLevelLast = _logFlushLevel  # type: enum_lib.Enum
 	logIntervalLast = _logInterval  # type: float
+	logFlushBudgetLast = _logFlushBudget  # type: float
 	logSizeLimitLast = _logSizeLimit  # type: float
+	logStorageLimitLast = _logStorageLimit  # type: int
+	logOverflowPolicyLast = _logOverflowPolicy  # type: str
+	logRetentionSizeLast = _logRetentionSize  # type: float
+	logRetentionAgeLast = _logRetentionAge  # type: float
+	logRetentionCountLast = _logRetentionCount  # type: int
+	logStreamEnabledLast = _logStreamEnabled  # type: bool
+	logStreamPortLast = _logStreamPort  # type: int
+	flightRecorderLengthLast = _flightRecorderLength  # type: int
+	flightRecorderLevelLast = _flightRecorderLevel  # type: enum_lib.Enum
 
 	if loggingEnabledLast != loggingEnabledChange:
 		if loggingEnabledLast is not None:
@@ -403,24 +2375,102 @@ def _UpdateSettings () -> None:
 
 		_writeGroups = writeGroupsChange
 
+	if writeBinaryLast != writeBinaryChange:
+		if writeBinaryLast is not None:
+			Debug.Log("Updating setting '" + Settings.WriteBinary.Key + "' to '" + str(writeBinaryChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_writeBinary = writeBinaryChange
+
 	if logLevelLast != logLevelChange:
 		if logLevelLast is not None:
 			Debug.Log("Updating setting '" + Settings.LogLevel.Key + "' to '" + str(logLevelChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
 		_logLevel = logLevelChange
 
+	if logFlushLevelLast != logFlushLevelChange:
+		if logFlushLevelLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogFlushLevel.Key + "' to '" + str(logFlushLevelChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logFlushLevel = logFlushLevelChange
+
 	if logIntervalLast != logIntervalChange:
 		if logIntervalLast is not None:
 			Debug.Log("Updating setting '" + Settings.LogInterval.Key + "' to '" + str(logIntervalChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
 		_logInterval = logIntervalChange
 
+	if logFlushBudgetLast != logFlushBudgetChange:
+		if logFlushBudgetLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogFlushBudget.Key + "' to '" + str(logFlushBudgetChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logFlushBudget = logFlushBudgetChange
+
+	if logIntervalLast != logIntervalChange or logFlushBudgetLast != logFlushBudgetChange:
+		_logger.ResetFlushSchedule(_logInterval, _logFlushBudget)
+
 	if logSizeLimitLast != logSizeLimitChange:
 		if logSizeLimitLast is not None:
 			Debug.Log("Updating setting '" + Settings.LogSizeLimit.Key + "' to '" + str(logSizeLimitChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
 		_logSizeLimit = logSizeLimitChange
 
+	if logStorageLimitLast != logStorageLimitChange:
+		if logStorageLimitLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogStorageLimit.Key + "' to '" + str(logStorageLimitChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logStorageLimit = logStorageLimitChange
+
+	if logOverflowPolicyLast != logOverflowPolicyChange:
+		if logOverflowPolicyLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogOverflowPolicy.Key + "' to '" + str(logOverflowPolicyChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logOverflowPolicy = logOverflowPolicyChange
+
+	if logRetentionSizeLast != logRetentionSizeChange:
+		if logRetentionSizeLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogRetentionSize.Key + "' to '" + str(logRetentionSizeChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logRetentionSize = logRetentionSizeChange
+
+	if logRetentionAgeLast != logRetentionAgeChange:
+		if logRetentionAgeLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogRetentionAge.Key + "' to '" + str(logRetentionAgeChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logRetentionAge = logRetentionAgeChange
+
+	if logRetentionCountLast != logRetentionCountChange:
+		if logRetentionCountLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogRetentionCount.Key + "' to '" + str(logRetentionCountChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logRetentionCount = logRetentionCountChange
+
+	if logStreamEnabledLast != logStreamEnabledChange:
+		if logStreamEnabledLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogStreamEnabled.Key + "' to '" + str(logStreamEnabledChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logStreamEnabled = logStreamEnabledChange
+
+	if logStreamPortLast != logStreamPortChange:
+		if logStreamPortLast is not None:
+			Debug.Log("Updating setting '" + Settings.LogStreamPort.Key + "' to '" + str(logStreamPortChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_logStreamPort = logStreamPortChange
+
+	if flightRecorderLengthLast != flightRecorderLengthChange:
+		if flightRecorderLengthLast is not None:
+			Debug.Log("Updating setting '" + Settings.FlightRecorderLength.Key + "' to '" + str(flightRecorderLengthChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_flightRecorderLength = flightRecorderLengthChange
+		_flightRecorder = _FlightRecorder(flightRecorderLengthChange) if flightRecorderLengthChange > 0 else None
+
+	if flightRecorderLevelLast != flightRecorderLevelChange:
+		if flightRecorderLevelLast is not None:
+			Debug.Log("Updating setting '" + Settings.FlightRecorderLevel.Key + "' to '" + str(flightRecorderLevelChange) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+		_flightRecorderLevel = flightRecorderLevelChange
+
+	_UpdateLevelThreshold()
+
 	global _flushTicker
 
 	if not loggingEnabledLast and loggingEnabledChange:
@@ -432,7 +2482,7 @@ def _UpdateSettings () -> None:
 			_flushTicker = None
 
 		if _logInterval != 0:
-			_flushTicker = Timer.Timer(_logInterval, _logger.Flush, repeat = True)
+			_flushTicker = Timer.Timer(_logInterval, _FlushTick, repeat = True)
 			_flushTicker.start()
 
 	elif loggingEnabledLast and not loggingEnabledChange:
@@ -447,7 +2497,7 @@ def _UpdateSettings () -> None:
 			_flushTicker.Stop()
 			_flushTicker = None
 
-		_flushTicker = Timer.Timer(_logInterval, _logger.Flush, repeat = True)
+		_flushTicker = Timer.Timer(_logInterval, _FlushTick, repeat = True)
 		_flushTicker.start()
 
 	elif logIntervalLast != 0 and logIntervalChange == 0:
@@ -460,85 +2510,541 @@ def _UpdateSettings () -> None:
 	elif logIntervalLast != logIntervalChange:
 		if logIntervalChange != 0:
 			if _flushTicker is None:
-				_flushTicker = Timer.Timer(_logInterval, _logger.Flush, repeat = True)
+				_flushTicker = Timer.Timer(_logInterval, _FlushTick, repeat = True)
 				_flushTicker.start()
 			else:
-				_flushTicker.Interval = _logInterval
+				_flushTicker.Interval = _logger.GetFlushInterval()
 
 	if loggingEnabledLast is None and not loggingEnabledChange:
-		_logger._reportStorage = list()
+		_logger.DiscardReports()
 
 	if logIntervalLast != 0 and ((writeChronologicalLast and not writeChronologicalChange) or (writeGroupsLast and not writeGroupsChange)):
 		_logger.Flush()
 
+	if not _preload:
+		if logRetentionSizeLast != logRetentionSizeChange or logRetentionAgeLast != logRetentionAgeChange or logRetentionCountLast != logRetentionCountChange:
+			_StartLogMaintenance()
+
+		if logStreamEnabledLast != logStreamEnabledChange or logStreamPortLast != logStreamPortChange:
+			_UpdateLogStream()
+
+def _StartLogMaintenance () -> None:
+	retentionLimits = LogMaintenance.RetentionLimits(
+		maximumSize = int(_logRetentionSize * 1000000) if _logRetentionSize >= 0 else -1,
+		maximumAge = _logRetentionAge * 86400 if _logRetentionAge >= 0 else -1,
+		maximumCount = _logRetentionCount
+	)  # type: LogMaintenance.RetentionLimits
+
+	LogMaintenance.StartMaintenance(_logger.GetLoggingRootPath(), _logger.GetLoggingDirectoryName(), retentionLimits)
+
+def _UpdateLogStream () -> None:
+	if not _logStreamEnabled:
+		LogStream.StopServer()
+		return
+
+	try:
+		LogStream.StartServer(_logStreamPort)
+	except Exception:
+		Debug.Log("Failed to start the log stream on port '" + str(_logStreamPort) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+def _FlushTick () -> None:
+	_logger.ScheduledFlush()
+
+	flushTicker = _flushTicker  # type: typing.Optional[Timer.Timer]
+
+	if flushTicker is not None:
+		flushTicker.Interval = _logger.GetFlushInterval()
+
+def _UpdateLevelThreshold () -> None:
+	global _levelThreshold, _flushLevelThreshold, _flightRecorderLevelThreshold, _ruleThresholds
+
+	_ruleThresholds = dict()
+
+	if _logFlushLevel is None:
+		_flushLevelThreshold = -sys.maxsize - 1
+	else:
+		_flushLevelThreshold = int(_logFlushLevel)
+
+	if _flightRecorderLevel is None:
+		_flightRecorderLevelThreshold = -sys.maxsize - 1
+	else:
+		_flightRecorderLevelThreshold = int(_flightRecorderLevel)
+
+	if _loggingEnabled is None:
+		_levelThreshold = sys.maxsize
+	elif not _loggingEnabled:
+		_levelThreshold = -sys.maxsize - 1
+	elif _logLevel is None:
+		_levelThreshold = sys.maxsize
+	elif _levelRules is not None:
+		# Level rules can only be checked once the group and owner are known, so this threshold has to let through anything a rule might accept.
+		_levelThreshold = max(int(_logLevel), max(int(levelRule.Level) for levelRule in _levelRules))
+	else:
+		_levelThreshold = int(_logLevel)
+
+	_PatchLogFunctions()
+
+def _PatchLogFunctions () -> None:
+	"""
+	Replace the game's log functions with the versions fitting the current level threshold. Levels that will be rejected get a function that only
+	counts the call, so that a disabled log call costs a single function call. Whether a level is rejected is decided only here, the rejecting
+	functions never check again, so while the flight recorder is on every level gets the full function. This is redone every time the threshold
+	changes, which is why the functions are set directly instead of through the patcher, a patcher wrapper cannot be swapped out afterwards and
+	adds a call of its own.
+	"""
+
+	# The flight recorder takes in reports of every level, so while it is on no level can be rejected outright.
+	recordingAll = _flightRecorder is not None and bool(_loggingEnabled)  # type: bool
+
+	debugEnabled = recordingAll or _debugLevel <= _levelThreshold  # type: bool
+	infoEnabled = recordingAll or _infoLevel <= _levelThreshold  # type: bool
+	warningEnabled = recordingAll or _warningLevel <= _levelThreshold  # type: bool
+	errorEnabled = recordingAll or _errorLevel <= _levelThreshold  # type: bool
+	exceptionEnabled = recordingAll or _exceptionLevel <= _levelThreshold  # type: bool
+
+	_SetLogFunction(log, "debug", _Debug if debugEnabled else _RejectDebug)
+	_SetLogFunction(log.Logger, "debug", _LoggerDebug if debugEnabled else _LoggerRejectDebug)
+
+	_SetLogFunction(log, "info", _Info if infoEnabled else _RejectInfo)
+	_SetLogFunction(log.Logger, "info", _LoggerInfo if infoEnabled else _LoggerRejectInfo)
+
+	_SetLogFunction(log, "warn", _Warning if warningEnabled else _RejectWarning)
+	_SetLogFunction(log.Logger, "warn", _LoggerWarning if warningEnabled else _LoggerRejectWarning)
+
+	_SetLogFunction(log, "error", _Error if errorEnabled else _RejectError)
+	_SetLogFunction(log.Logger, "error", _LoggerError if errorEnabled else _LoggerRejectError)
+
+	# The level of an exception call is one of its arguments, so the exception function can only be rejected outright when every level is.
+	_SetLogFunction(log, "exception", _Exception if exceptionEnabled else _RejectException)
+
+def _SetLogFunction (target: typing.Any, functionName: str, function: typing.Callable) -> None:
+	"""
+	Set one of the game's log functions, unless something else replaced it after this module last set it. Other mods may wrap these functions too,
+	such a wrapper is left in place and the function is no longer swapped. The wrapper will keep calling whichever function it wrapped, so if that
+	was a rejecting function, that level stays disabled for calls made through the wrapper.
+	"""
+
+	installKey = (target, functionName)  # type: typing.Tuple[typing.Any, str]
+	currentFunction = getattr(target, functionName, None)  # type: typing.Optional[typing.Callable]
+	installedFunction = _installedLogFunctions.get(installKey, None)  # type: typing.Optional[typing.Callable]
+
+	if installedFunction is not None and currentFunction is not installedFunction:
+		Debug.Log("The game's '" + functionName + "' log function was replaced by something other than this mod, it will be left as it is.",
+				  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__,
+				  lockIdentifier = __name__ + ":ReplacedLogFunction:" + functionName, lockThreshold = 1)
+
+		return
+
+	if currentFunction is not function:
+		setattr(target, functionName, function)
+
+	_installedLogFunctions[installKey] = function
+
+def _CollectRejectedCounts () -> None:
+	global _debugRejectedCount, _infoRejectedCount, _warningRejectedCount, _errorRejectedCount, _exceptionRejectedCount
+
+	# Counts are taken away rather than reset, so that calls counted while this runs are not lost.
+	debugRejectedCount = _debugRejectedCount  # type: int
+	infoRejectedCount = _infoRejectedCount  # type: int
+	warningRejectedCount = _warningRejectedCount  # type: int
+	errorRejectedCount = _errorRejectedCount  # type: int
+	exceptionRejectedCount = _exceptionRejectedCount  # type: int
+
+	_debugRejectedCount -= debugRejectedCount
+	_infoRejectedCount -= infoRejectedCount
+	_warningRejectedCount -= warningRejectedCount
+	_errorRejectedCount -= errorRejectedCount
+	_exceptionRejectedCount -= exceptionRejectedCount
+
+	rejectedCounts = ((_debugLevel, debugRejectedCount), (_infoLevel, infoRejectedCount), (_warningLevel, warningRejectedCount),
+					  (_errorLevel, errorRejectedCount), (_exceptionLevel, exceptionRejectedCount))  # type: typing.Tuple[typing.Tuple[int, int], ...]
+
+	for level, rejectedCount in rejectedCounts:  # type: int, int
+		if rejectedCount != 0:
+			_logger.Metrics.RejectedLevels[level] += rejectedCount
+
+def _GetLevelThreshold (group: typing.Optional[str], owner: typing.Optional[str]) -> int:
+	"""
+	Get the level threshold for reports with this group and owner. Thresholds are resolved once per group and owner pair then remembered until the
+	rules or settings change.
+	"""
+
+	ruleThresholds = _ruleThresholds  # type: typing.Dict[typing.Tuple[typing.Optional[str], typing.Optional[str]], int]
+
+	ruleThresholdKey = (group, owner)  # type: typing.Tuple[typing.Optional[str], typing.Optional[str]]
+	ruleThreshold = ruleThresholds.get(ruleThresholdKey, None)  # type: typing.Optional[int]
+
+	if ruleThreshold is not None:
+		return ruleThreshold
+
+	ruleThreshold = _ResolveLevelThreshold(group, owner)
+
+	# The cache is replaced rather than modified when the rules change, a threshold resolved against old rules can only end up in the old cache.
+	if len(ruleThresholds) < _ruleThresholdsCapacity:
+		ruleThresholds[ruleThresholdKey] = ruleThreshold
+
+	return ruleThreshold
+
+def _IsRejectedByRules (level: int, group: typing.Optional[str], owner: typing.Optional[str], message: typing.Any, args: tuple) -> bool:
+	if level > _GetLevelThreshold(group, owner):
+		_logger.Metrics.RejectedLevels[level] += 1
+		_logger.Metrics.RejectedGroups[group] += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(level, group, owner, message, args)
+
+		return True
+
+	return False
+
+def _ResolveLevelThreshold (group: typing.Optional[str], owner: typing.Optional[str]) -> int:
+	levelRules = _levelRules  # type: typing.Optional[typing.List[_LevelRule]]
+
+	if levelRules is not None:
+		groupText = str(group)  # type: str
+
+		for levelRule in levelRules:  # type: _LevelRule
+			if levelRule.Matches(groupText, owner):
+				return int(levelRule.Level)
+
+	if _logLevel is None:
+		return sys.maxsize
+
+	return int(_logLevel)
+
+def GetLevelRulesFilePath () -> str:
+	"""
+	Get the path of the level rules file. This file is a json list of rules, the first rule matching a report's group and owner decides the
+	report's log level, reports matching no rules use the 'Log_Level' setting. For example:
+	[ { "Group": "Sims4.Pathing*", "Owner": "*", "Level": "Debug" }, { "Group": "*", "Owner": "SomeOwner", "Level": "Info" } ]
+	A missing group or owner pattern matches everything.
+	"""
+
+	return os.path.join(This.Mod.PersistentPath, "Log Level Rules.json")
+
+def _LoadLevelRules () -> None:
+	global _levelRules
+
+	levelRulesFilePath = GetLevelRulesFilePath()  # type: str
+
+	if not os.path.exists(levelRulesFilePath):
+		levelRules = None  # type: typing.Optional[typing.List[_LevelRule]]
+	else:
+		with open(levelRulesFilePath, mode = "r", encoding = "utf-8") as levelRulesFile:
+			levelRulesData = json.load(levelRulesFile)
+
+		if not isinstance(levelRulesData, list):
+			raise Exceptions.IncorrectTypeException(levelRulesData, "Root", (list,))
+
+		levelRules = list()  # type: typing.Optional[typing.List[_LevelRule]]
+
+		for levelRuleIndex in range(len(levelRulesData)):  # type: int
+			levelRuleData = levelRulesData[levelRuleIndex]  # type: dict
+
+			if not isinstance(levelRuleData, dict):
+				raise Exceptions.IncorrectTypeException(levelRuleData, "Root[%d]" % levelRuleIndex, (dict,))
+
+			groupPattern = levelRuleData.get("Group", "*")  # type: str
+			ownerPattern = levelRuleData.get("Owner", "*")  # type: str
+			levelName = levelRuleData.get("Level", None)  # type: str
+
+			if not isinstance(groupPattern, str):
+				raise Exceptions.IncorrectTypeException(groupPattern, "Root[%d].Group" % levelRuleIndex, (str,))
+
+			if not isinstance(ownerPattern, str):
+				raise Exceptions.IncorrectTypeException(ownerPattern, "Root[%d].Owner" % levelRuleIndex, (str,))
+
+			if not isinstance(levelName, str):
+				raise Exceptions.IncorrectTypeException(levelName, "Root[%d].Level" % levelRuleIndex, (str,))
+
+			levelRules.append(_LevelRule(groupPattern, ownerPattern, Parse.ParsePythonEnum(levelName, Debug.LogLevels)))
+
+		if len(levelRules) == 0:
+			levelRules = None
+
+	_levelRules = levelRules
+	_UpdateLevelThreshold()
+
+def _CheckLevelRulesFile () -> None:
+	"""
+	Reload the level rules if the rules file has been created, changed or removed since it was last checked.
+	"""
+
+	global _levelRulesFileStamp
+
+	try:
+		levelRulesFileStatus = os.stat(GetLevelRulesFilePath())  # type: typing.Optional[os.stat_result]
+		levelRulesFileStamp = (levelRulesFileStatus.st_mtime, levelRulesFileStatus.st_size)  # type: typing.Optional[typing.Tuple[float, int]]
+	except FileNotFoundError:
+		levelRulesFileStamp = None  # type: typing.Optional[typing.Tuple[float, int]]
+
+	if levelRulesFileStamp == _levelRulesFileStamp:
+		return
+
+	_levelRulesFileStamp = levelRulesFileStamp
+
+	try:
+		_LoadLevelRules()
+	except Exception:
+		Debug.Log("Failed to load the log level rules, the previous rules will remain in use.\nFile Path: %s" % GetLevelRulesFilePath(),
+				  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+def _StartLevelRulesTicker () -> None:
+	global _levelRulesTicker
+
+	_CheckLevelRulesFile()
+
+	if _levelRulesTicker is None:
+		_levelRulesTicker = Timer.Timer(_levelRulesCheckInterval, _CheckLevelRulesFile, repeat = True)
+		_levelRulesTicker.start()
+
+def _StopLevelRulesTicker () -> None:
+	global _levelRulesTicker
+
+	if _levelRulesTicker is not None:
+		_levelRulesTicker.Stop()
+		_levelRulesTicker = None
+
 # noinspection PyUnusedLocal
 def _UpdateSettingsCallback (owner: types.ModuleType, eventArguments: SettingsBase.UpdateEventArguments) -> None:
 	_UpdateSettings()
 
 def _Debug (group: str, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
-	if args:
-		message = message.format(*args)
+	global _debugRejectedCount
+
+	if _debugLevel > _levelThreshold:
+		_debugRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_debugLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_debugLevel, group, owner, message, args):
+		return
 
 	if trigger_breakpoint:
 		pass
 
-	_logger.Log(message, Debug.LogLevels.Debug, group = group, owner = owner)
+	_logger.Log(message, Debug.LogLevels.Debug, group = group, owner = owner, messageArgs = args)
 
 def _LoggerDebug (self: log.Logger, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
+	global _debugRejectedCount
+
+	group = self.group  # type: str
 	owner = owner or self.default_owner
-	_Debug(self.group, message, *args, owner = owner, trigger_breakpoint = trigger_breakpoint)
+
+	if _debugLevel > _levelThreshold:
+		_debugRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_debugLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_debugLevel, group, owner, message, args):
+		return
+
+	if trigger_breakpoint:
+		pass
+
+	_logger.Log(message, Debug.LogLevels.Debug, group = group, owner = owner, messageArgs = args)
 
 def _Info (group: str, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
-	if args:
-		message = message.format(*args)
+	global _infoRejectedCount
+
+	if _infoLevel > _levelThreshold:
+		_infoRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_infoLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_infoLevel, group, owner, message, args):
+		return
 
 	if trigger_breakpoint:
 		pass
 
-	_logger.Log(message, Debug.LogLevels.Info, group = group, owner = owner)
+	_logger.Log(message, Debug.LogLevels.Info, group = group, owner = owner, messageArgs = args)
 
 def _LoggerInfo (self: log.Logger, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
+	global _infoRejectedCount
+
+	group = self.group  # type: str
 	owner = owner or self.default_owner
-	_Info(self.group, message, *args, owner = owner, trigger_breakpoint = trigger_breakpoint)
+
+	if _infoLevel > _levelThreshold:
+		_infoRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_infoLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_infoLevel, group, owner, message, args):
+		return
+
+	if trigger_breakpoint:
+		pass
+
+	_logger.Log(message, Debug.LogLevels.Info, group = group, owner = owner, messageArgs = args)
 
 def _Warning (group: str, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
-	if args:
-		message = message.format(*args)
+	global _warningRejectedCount
+
+	if _warningLevel > _levelThreshold:
+		_warningRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_warningLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_warningLevel, group, owner, message, args):
+		return
 
 	if trigger_breakpoint:
 		pass
 
-	_logger.Log(message, Debug.LogLevels.Warning, group = group, owner = owner)
+	_logger.Log(message, Debug.LogLevels.Warning, group = group, owner = owner, messageArgs = args)
 
 def _LoggerWarning (self: log.Logger, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
+	global _warningRejectedCount
+
+	group = self.group  # type: str
 	owner = owner or self.default_owner
-	_Warning(self.group, message, *args, owner = owner, trigger_breakpoint = trigger_breakpoint)
+
+	if _warningLevel > _levelThreshold:
+		_warningRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_warningLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_warningLevel, group, owner, message, args):
+		return
+
+	if trigger_breakpoint:
+		pass
+
+	_logger.Log(message, Debug.LogLevels.Warning, group = group, owner = owner, messageArgs = args)
 
 def _Error (group: str, message: str, *args, owner: str = None, trigger_breakpoint: bool = False) -> None:
-	if args:
-		message = message.format(*args)
+	global _errorRejectedCount
+
+	if _errorLevel > _levelThreshold:
+		_errorRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_errorLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_errorLevel, group, owner, message, args):
+		return
 
 	if trigger_breakpoint:
 		pass
 
-	_logger.Log(message, Debug.LogLevels.Error, group = group, owner = owner)
+	_logger.Log(message, Debug.LogLevels.Error, group = group, owner = owner, messageArgs = args)
 
 def _LoggerError (self: log.Logger, message: str, *args, owner: str = None, trigger_breakpoint: bool = False, trigger_callback_on_error_or_exception: bool = True) -> None:
+	global _errorRejectedCount
+
+	group = self.group  # type: str
 	owner = owner or self.default_owner
 
+	if _errorLevel > _levelThreshold:
+		_errorRejectedCount += 1
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(_errorLevel, group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(_errorLevel, group, owner, message, args):
+		return
+
+	if trigger_breakpoint:
+		pass
+
 	if trigger_callback_on_error_or_exception:
 		pass
 
-	_Error(self.group, message, *args, owner = owner, trigger_breakpoint = trigger_breakpoint)
+	_logger.Log(message, Debug.LogLevels.Error, group = group, owner = owner, messageArgs = args)
 
 # noinspection SpellCheckingInspection
 def _Exception (group: str, message: str, *args, exc: BaseException = None, log_current_callstack: bool = True, frame: types.FrameType = log.DEFAULT, use_format_stack: bool = False, level: int = log.LEVEL_EXCEPTION, owner: str = None):
-	if args:
-		message = message.format(*args)
+	logLevel = DebugShared.ConvertEALevelToLogLevel(level)  # type: Debug.LogLevels
+
+	if logLevel > _levelThreshold:
+		_CountRejectedLevel(logLevel)
+
+		if _flightRecorder is not None:
+			_flightRecorder.Record(int(logLevel), group, owner, message, args)
+
+		return
+
+	if _levelRules is not None and _IsRejectedByRules(logLevel, group, owner, message, args):
+		return
 
 	if use_format_stack:
 		pass
 
-	_logger.Log(message, DebugShared.ConvertEALevelToLogLevel(level), group = group, owner = owner, exception = exc, logStack = log_current_callstack, frame = frame)
+	_logger.Log(message, logLevel, group = group, owner = owner, exception = exc, logStack = log_current_callstack, frame = frame, messageArgs = args)
+
+def _CountRejectedLevel (level: int) -> None:
+	global _debugRejectedCount, _infoRejectedCount, _warningRejectedCount, _errorRejectedCount, _exceptionRejectedCount
+
+	if level == _debugLevel:
+		_debugRejectedCount += 1
+	elif level == _infoLevel:
+		_infoRejectedCount += 1
+	elif level == _warningLevel:
+		_warningRejectedCount += 1
+	elif level == _errorLevel:
+		_errorRejectedCount += 1
+	else:
+		_exceptionRejectedCount += 1
+
+def _RejectDebug (*args, **kwargs) -> None:
+	global _debugRejectedCount
+	_debugRejectedCount += 1
+
+def _LoggerRejectDebug (*args, **kwargs) -> None:
+	global _debugRejectedCount
+	_debugRejectedCount += 1
+
+def _RejectInfo (*args, **kwargs) -> None:
+	global _infoRejectedCount
+	_infoRejectedCount += 1
+
+def _LoggerRejectInfo (*args, **kwargs) -> None:
+	global _infoRejectedCount
+	_infoRejectedCount += 1
+
+def _RejectWarning (*args, **kwargs) -> None:
+	global _warningRejectedCount
+	_warningRejectedCount += 1
+
+def _LoggerRejectWarning (*args, **kwargs) -> None:
+	global _warningRejectedCount
+	_warningRejectedCount += 1
+
+def _RejectError (*args, **kwargs) -> None:
+	global _errorRejectedCount
+	_errorRejectedCount += 1
+
+def _LoggerRejectError (*args, **kwargs) -> None:
+	global _errorRejectedCount
+	_errorRejectedCount += 1
+
+def _RejectException (*args, **kwargs) -> None:
+	# This is only set once every level is rejected, the call's own level is not looked at and it is always counted as an exception.
+	global _exceptionRejectedCount
+	_exceptionRejectedCount += 1
 
 _Setup()
@@ -130,3 +130,36 @@ class LogLevelsDialogSetting(LogLevelsSetting):
 
 			for logLevel in Debug.LogLevels:  # type: Debug.LogLevels
 				cls.Values.append(logLevel.name)
+
+class StorageOverflowPoliciesSetting(SettingsBase.Setting):
+	Type = str
+
+	Values = ("Flush", "Drop_Oldest", "Drop_Lowest_Level")  # type: typing.Tuple[str, ...]
+
+	@classmethod
+	def Verify (cls, value: str, lastChangeVersion: Version.Version = None) -> str:
+		cls._TypeCheckValue(value)
+
+		if not isinstance(lastChangeVersion, Version.Version) and lastChangeVersion is not None:
+			raise Exceptions.IncorrectTypeException(lastChangeVersion, "lastChangeVersion", (Version.Version, "None"))
+
+		return value
+
+	@classmethod
+	def GetValueText (cls, value: str) -> localization.LocalizedString:
+		cls._TypeCheckValue(value)
+
+		return Language.GetLocalizationStringByIdentifier(This.Mod.Namespace + ".Settings.Types.Storage_Overflow_Policies." + value, fallbackText = "Storage_Overflow_Policies." + value)
+
+	@classmethod
+	def _TypeCheckValue (cls, value: str) -> None:
+		if not isinstance(value, str):
+			raise Exceptions.IncorrectTypeException(value, "value", (str,))
+
+		if not value in cls.Values:
+			raise ValueError("'" + value + "' is not a storage overflow policy.")
+
+class StorageOverflowPoliciesDialogSetting(StorageOverflowPoliciesSetting):
+	class Dialog(SettingsDialogs.EnumDialog):
+		EnumName = "Storage_Overflow_Policies"  # type: str
+		Values = list(StorageOverflowPoliciesSetting.Values)  # type: typing.List[str]
@@ -22,12 +22,48 @@ class WriteGroups(SettingsTypes.BooleanYesNoDialogSetting):
 	Key = "Write_Groups"  # type: str
 	Default = False  # type: bool
 
+class WriteBinary(SettingsTypes.BooleanYesNoDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Write_Binary"  # type: str
+	Default = False  # type: bool
+
 class LogLevel(SettingsTypes.LogLevelsDialogSetting):
 	IsSetting = True  # type: bool
 
 	Key = "Log_Level"  # type: str
 	Default = "Warning"  # type: str
 
+class LogFlushLevel(SettingsTypes.LogLevelsDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Flush_Level"  # type: str
+	Default = "Exception"  # type: str
+
+class FlightRecorderLevel(SettingsTypes.LogLevelsDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Flight_Recorder_Level"  # type: str
+	Default = "Exception"  # type: str
+
+class FlightRecorderLength(SettingsTypes.RealNumberDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Flight_Recorder_Length"  # type: str
+	Default = 0  # type: int
+
+	Minimum = 0  # type: int
+	Maximum = 100000  # type: int
+
+	@classmethod
+	def Verify (cls, value: typing.Union[float, int], lastChangeVersion: Version.Version = None) -> int:
+		value = super().Verify(value, lastChangeVersion = lastChangeVersion)
+
+		if not (cls.Minimum <= value <= cls.Maximum):
+			raise ValueError("Value must be greater than '" + str(cls.Minimum) + "' and less than '" + str(cls.Maximum) + "'.")
+
+		return int(value)
+
 class LogInterval(SettingsTypes.TimeSecondsDialogSetting):
 	IsSetting = True  # type: bool
 
@@ -50,12 +86,105 @@ class LogInterval(SettingsTypes.TimeSecondsDialogSetting):
 
 		return value
 
+class LogFlushBudget(SettingsTypes.TimeSecondsDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Flush_Budget"  # type: str
+	Default = 0.05  # type: float
+
+	Minimum = 0.001  # type: float
+	Maximum = 10  # type: float
+
+	@classmethod
+	def Verify (cls, value: float, lastChangeVersion: Version.Version = None) -> float:
+		value = super().Verify(value, lastChangeVersion = lastChangeVersion)
+
+		if not (cls.Minimum <= value <= cls.Maximum):
+			raise ValueError("Value must be greater than '" + str(cls.Minimum) + "' and less than '" + str(cls.Maximum) + "'.")
+
+		return value
+
 class LogSizeLimit(SettingsTypes.LogSizeLimitDialogSetting):
 	IsSetting = True  # type: bool
 
 	Key = "Log_Size_Limit"  # type: str
 	Default = 5  # type: float
 
+class LogStorageLimit(SettingsTypes.RealNumberDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Storage_Limit"  # type: str
+	Default = 20000  # type: int
+
+	Minimum = 100  # type: int
+	Maximum = 1000000  # type: int
+
+	@classmethod
+	def Verify (cls, value: typing.Union[float, int], lastChangeVersion: Version.Version = None) -> int:
+		value = super().Verify(value, lastChangeVersion = lastChangeVersion)
+
+		if not (cls.Minimum <= value <= cls.Maximum):
+			raise ValueError("Value must be greater than '" + str(cls.Minimum) + "' and less than '" + str(cls.Maximum) + "'.")
+
+		return int(value)
+
+class LogOverflowPolicy(SettingsTypes.StorageOverflowPoliciesDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Overflow_Policy"  # type: str
+	Default = "Flush"  # type: str
+
+class LogRetentionSize(SettingsTypes.LogSizeLimitDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Retention_Size"  # type: str
+	Default = 500  # type: float
+
+class LogRetentionAge(SettingsTypes.RealNumberDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Retention_Age"  # type: str
+	Default = 30  # type: float
+
+class LogRetentionCount(SettingsTypes.RealNumberDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Retention_Count"  # type: str
+	Default = 100  # type: int
+
+	@classmethod
+	def Verify (cls, value: typing.Union[float, int], lastChangeVersion: Version.Version = None) -> int:
+		value = super().Verify(value, lastChangeVersion = lastChangeVersion)
+
+		if 0 <= value < 1:
+			raise ValueError("Value must be at least '1', or negative to disable the limit.")
+
+		return int(value)
+
+class LogStreamEnabled(SettingsTypes.BooleanYesNoDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Stream_Enabled"  # type: str
+	Default = False  # type: bool
+
+class LogStreamPort(SettingsTypes.RealNumberDialogSetting):
+	IsSetting = True  # type: bool
+
+	Key = "Log_Stream_Port"  # type: str
+	Default = 47310  # type: int
+
+	Minimum = 1024  # type: int
+	Maximum = 65535  # type: int
+
+	@classmethod
+	def Verify (cls, value: typing.Union[float, int], lastChangeVersion: Version.Version = None) -> int:
+		value = super().Verify(value, lastChangeVersion = lastChangeVersion)
+
+		if not (cls.Minimum <= value <= cls.Maximum):
+			raise ValueError("Value must be greater than '" + str(cls.Minimum) + "' and less than '" + str(cls.Maximum) + "'.")
+
+		return int(value)
+
 def GetSettingsFilePath () -> str:
 	return SettingsBase.SettingsFilePath
 